@@ -0,0 +1,160 @@
+"""
+Correctness oracle: compare the live report endpoints with the NumPy engine.
+
+For every report, range and department, fetches the API report, re-computes it
+from a snapshot with snapshot_reports.py over the exact period the API used,
+and prints the differences. Export the snapshot right before running this and
+keep the database quiet in between. Data loaded straight into the database
+(not through the API) does not invalidate the cached company overview, so
+wait five minutes after such loads or restart the API.
+
+Orderings the API leaves to the database (dailyTrend, months that only have
+leavers, ties in topUsers) are compared as sets; everything else field by field.
+Exits with status 1 when any report differs.
+
+    pip install -r analytics/requirements.txt
+    python analytics/compare_reports.py SNAPSHOT --api http://localhost:4000 --ranges year,quarter
+"""
+import argparse
+import json
+import math
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+
+from snapshot_reports import REPORTS, Snapshot, run_report
+
+TIMEOUT = 120
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+RANGES = ["current-month", "last-month", "quarter", "year"]
+
+
+def request(api, path, token=None, body=None):
+    headers = {"Accept": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = None
+    if body is not None:
+        headers["Content-Type"] = "application/json"
+        data = json.dumps(body).encode()
+    for _ in range(5):
+        try:
+            with urllib.request.urlopen(urllib.request.Request(api + path, data=data, headers=headers), timeout=TIMEOUT) as resp:
+                return json.load(resp)
+        except urllib.error.HTTPError as err:
+            # Report lane shed the request; come back when asked to
+            if err.code == 503 and err.headers.get("Retry-After"):
+                time.sleep(float(err.headers["Retry-After"]))
+                continue
+            raise
+    raise RuntimeError(f"{path}: still shed after retries")
+
+
+def to_ms(value):
+    # Integer arithmetic: timestamp() * 1000 can land a millisecond short.
+    delta = datetime.fromisoformat(value.replace("Z", "+00:00")) - EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+
+
+def normalize(report, data):
+    """Replace database-ordered lists with order-free forms"""
+    data = json.loads(json.dumps(data))
+    if report == "attendance-analytics":
+        data["dailyTrend"] = {d["date"]: {"present": d["present"], "absent": d["absent"]} for d in data["dailyTrend"]}
+    elif report == "employee-growth":
+        months = data.pop("monthlyGrowth")
+        data["monthlyGrowth"] = {m["month"]: {"joined": m["joined"], "left": m["left"]} for m in months}
+        data["finalTotal"] = months[-1]["total"] if months else 0
+    elif report == "leave-utilization":
+        top = data.pop("topUsers")
+        data["topUserDays"] = sorted((u["days"] for u in top), reverse=True)
+        data["topUsers"] = {u["userId"]: u for u in top}
+    return data
+
+
+def same_number(a, b):
+    try:
+        x, y = float(a), float(b)
+    except (TypeError, ValueError):
+        return False
+    return math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-6)
+
+
+def diff(path, api, engine, out, loose_keys=False):
+    if isinstance(api, dict) and isinstance(engine, dict):
+        keys = set(api) & set(engine) if loose_keys else set(api) | set(engine)
+        for key in sorted(keys):
+            if key not in api or key not in engine:
+                out.append(f"{path}.{key}: api={api.get(key)!r} engine={engine.get(key)!r}")
+            else:
+                diff(f"{path}.{key}", api[key], engine[key], out)
+    elif isinstance(api, list) and isinstance(engine, list):
+        if len(api) != len(engine):
+            out.append(f"{path}: api has {len(api)} items, engine {len(engine)}")
+        for i, (a, e) in enumerate(zip(api, engine)):
+            diff(f"{path}[{i}]", a, e, out)
+    elif api != engine and not same_number(api, engine):
+        out.append(f"{path}: api={api!r} engine={engine!r}")
+
+
+def compare(report, api, engine):
+    api, engine = normalize(report, api), normalize(report, engine)
+    out = []
+    if report == "leave-utilization":
+        # Users tied on days may differ; the ones both picked must agree
+        diff(f"{report}.topUsers", api.pop("topUsers"), engine.pop("topUsers"), out, loose_keys=True)
+    diff(report, api, engine, out)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("snapshot")
+    parser.add_argument("--api", default="http://localhost:4000")
+    parser.add_argument("--email", default="admin@workzen.com")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--ranges", default=",".join(RANGES))
+    parser.add_argument("--departments", help="comma-separated (default: all, then each department in the snapshot)")
+    parser.add_argument("--reports", default=",".join(sorted(REPORTS)))
+    parser.add_argument("--tz", help="API server timezone (default: from the manifest)")
+    args = parser.parse_args()
+
+    snap = Snapshot(args.snapshot)
+    token = request(args.api, "/v1/auth/login", body={"email": args.email, "password": args.password})["accessToken"]
+    departments = [None] + (args.departments.split(",") if args.departments else [
+        d for d in snap.dictionary("users", "department") if d
+    ])
+
+    failures = 0
+    checks = 0
+    for report in args.reports.split(","):
+        for range_name in args.ranges.split(","):
+            for department in departments if report != "employee-growth" else [None]:
+                params = {"range": range_name, **({"department": department} if department else {})}
+                api = request(args.api, f"/v1/reports/{report}?{urllib.parse.urlencode(params)}", token)
+                started = time.perf_counter()
+                engine = run_report(snap, report, to_ms(api["period"]["startDate"]), to_ms(api["period"]["endDate"]),
+                                    department, args.tz)
+                elapsed = (time.perf_counter() - started) * 1000
+                problems = compare(report, api, engine)
+                checks += 1
+                label = f"{report} {range_name} {department or 'all'}"
+                if problems:
+                    failures += 1
+                    print(f"MISMATCH {label}")
+                    for p in problems[:20]:
+                        print(f"  {p}")
+                    if len(problems) > 20:
+                        print(f"  ... {len(problems) - 20} more")
+                else:
+                    print(f"ok       {label} (engine {elapsed:.1f}ms)")
+
+    print(f"\n{checks - failures}/{checks} reports match")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,445 @@
+"""
+Offline report engine over columnar snapshots (see scripts/export-snapshot.ts).
+
+Computes the metrics of ReportsService.companyOverview, attendanceAnalytics,
+employeeGrowth and leaveUtilization with vectorized NumPy operations on
+memory-mapped columns, so multi-year ranges never touch the live database.
+Results have the API's JSON shape, including its quirks (rates formatted like
+Number.toFixed, leave filters on start and end date, growth months in UTC);
+compare_reports.py uses them as an oracle for the SQL-backed endpoints.
+
+Timestamps carry millisecond precision, as Prisma returns them. Local clock
+times (late check-ins, --range boundaries and plain --start/--end dates) use
+the API server's timezone recorded in the manifest unless --tz overrides it.
+
+    pip install -r analytics/requirements.txt
+    python analytics/snapshot_reports.py SNAPSHOT company-overview --range year --department Engineering
+    python analytics/snapshot_reports.py SNAPSHOT employee-growth --start 2021-01-01 --end 2025-12-31
+"""
+import argparse
+import json
+import math
+import os
+import sys
+from datetime import date, datetime, timedelta, timezone
+from decimal import ROUND_HALF_UP, Decimal
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+SUPPORTED_VERSION = 1
+DAY_MS = 86_400_000
+# ReportsService: late after 09:30, early before 17:30 (server local time)
+LATE_AFTER_MINUTE = 9 * 60 + 30
+EARLY_BEFORE_MINUTE = 17 * 60 + 30
+# UTC offsets are looked up once per 15-minute bucket of timestamps
+OFFSET_BUCKET_MS = 15 * 60_000
+TOP_USERS = 10
+
+
+class Snapshot:
+    """A snapshot directory: manifest.json plus one file per column."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "manifest.json")) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != SUPPORTED_VERSION:
+            raise ValueError(f"Unsupported snapshot version {self.manifest.get('version')}")
+        self._columns = {}
+
+    @property
+    def server_timezone(self):
+        return self.manifest["serverTimeZone"]
+
+    def _spec(self, table, column):
+        return self.manifest["tables"][table]["columns"][column]
+
+    def column(self, table, column):
+        """Memory-mapped array (or list, for text columns)"""
+        key = (table, column)
+        if key not in self._columns:
+            spec = self._spec(table, column)
+            file = os.path.join(self.path, spec["file"])
+            if spec["dtype"] == "str":
+                with open(file) as f:
+                    values = json.load(f)
+            elif self.manifest["tables"][table]["rows"] == 0:
+                values = np.load(file)  # an empty file cannot be mapped
+            else:
+                values = np.load(file, mmap_mode="r")
+            self._columns[key] = values
+        return self._columns[key]
+
+    def dictionary(self, table, column):
+        return self._spec(table, column).get("dictionary", [])
+
+    def code(self, table, column, value):
+        """Dictionary code of `value`, or None when it never occurs"""
+        try:
+            return self.dictionary(table, column).index(value)
+        except ValueError:
+            return None
+
+
+def to_fixed(x):
+    """Number.prototype.toFixed(2)"""
+    if math.isnan(x):
+        return "NaN"
+    if math.isinf(x):
+        return "Infinity" if x > 0 else "-Infinity"
+    return str(Decimal(x).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+
+
+def js_ratio_pct(num, den):
+    """num / den * 100 with JavaScript's division by zero"""
+    if den == 0:
+        return math.nan if num == 0 else math.inf
+    return num / den * 100
+
+
+def js_number(x):
+    """How JSON.stringify renders a number: NaN and Infinity become null"""
+    return x if math.isfinite(x) else None
+
+
+def iso(ms):
+    """Date.prototype.toISOString()"""
+    dt = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(milliseconds=int(ms))
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{int(ms) % 1000:03d}Z"
+
+
+def period(start_ms, end_ms):
+    return {"startDate": iso(start_ms), "endDate": iso(end_ms)}
+
+
+def between(values, start_ms, end_ms):
+    """gte start and lte end; NaT never matches"""
+    return (values >= np.datetime64(start_ms, "ms")) & (values <= np.datetime64(end_ms, "ms"))
+
+
+def department_users(snap, department):
+    """Per-user mask for `user: { profile: { department } }`, or None without a department"""
+    if not department:
+        return None
+    codes = np.asarray(snap.column("users", "department"))
+    code = snap.code("users", "department", department)
+    if code is None:
+        return np.zeros(len(codes), dtype=bool)
+    return codes == code
+
+
+def user_rows(users_mask, user_column):
+    return True if users_mask is None else users_mask[user_column]
+
+
+def department_name(snap, code):
+    """profile?.department || 'Unassigned'"""
+    return (snap.dictionary("users", "department")[code] if code >= 0 else "") or "Unassigned"
+
+
+def count_code(snap, table, column, codes, value):
+    code = snap.code(table, column, value)
+    return 0 if code is None else int(np.count_nonzero(codes == code))
+
+
+def ordered_groups(keys):
+    """Distinct keys in order of first appearance, with each row's group index"""
+    uniq, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return uniq[order], rank[inverse.reshape(-1)]
+
+
+def local_minute_of_day(values, tz):
+    """Minute of the day (0-1439) of datetime64[ms] values in `tz`"""
+    ms = values.astype("i8")
+    buckets = ms // OFFSET_BUCKET_MS
+    uniq, inverse = np.unique(buckets, return_inverse=True)
+    zone = ZoneInfo(tz)
+    offsets = np.array(
+        [datetime.fromtimestamp(int(b) * OFFSET_BUCKET_MS / 1000, zone).utcoffset().total_seconds() * 1000 for b in uniq],
+        dtype="i8",
+    )
+    local = ms + offsets[inverse.reshape(-1)]
+    return (local // 60_000) % 1440
+
+
+def company_overview(snap, start_ms, end_ms, department=None):
+    in_dept = department_users(snap, department)
+    has_profile = np.asarray(snap.column("users", "has_profile"))
+    is_active = np.asarray(snap.column("users", "is_active"))
+    if in_dept is None:
+        total_employees = int(has_profile.sum())
+        active_employees = int(is_active.sum())
+    else:
+        total_employees = int(in_dept.sum())
+        active_employees = int((is_active & in_dept).sum())
+
+    att = between(snap.column("attendance", "date"), start_ms, end_ms) & user_rows(in_dept, snap.column("attendance", "user"))
+    total_records = int(att.sum())
+    present_days = int((att & ~np.isnat(snap.column("attendance", "check_in"))).sum())
+    total_days = math.ceil((end_ms - start_ms) / DAY_MS)
+    avg_attendance = 0
+    if total_employees > 0:
+        avg_attendance = js_number(float(to_fixed(js_ratio_pct(present_days, total_employees * total_days))))
+
+    pay = between(snap.column("payslips", "created_at"), start_ms, end_ms) & user_rows(in_dept, snap.column("payslips", "user"))
+    payslips = int(pay.sum())
+    gross = int(np.asarray(snap.column("payslips", "gross"))[pay].sum())
+    net = int(np.asarray(snap.column("payslips", "net"))[pay].sum())
+
+    leaves = (
+        (snap.column("leave_requests", "start_date") >= np.datetime64(start_ms, "ms"))
+        & (snap.column("leave_requests", "end_date") <= np.datetime64(end_ms, "ms"))
+        & user_rows(in_dept, snap.column("leave_requests", "user"))
+    )
+    statuses = np.asarray(snap.column("leave_requests", "status"))[leaves]
+
+    return {
+        "period": period(start_ms, end_ms),
+        "department": department or "All Departments",
+        "employees": {
+            "total": total_employees,
+            "active": active_employees,
+            "inactive": total_employees - active_employees,
+        },
+        "attendance": {
+            "avgAttendance": avg_attendance,
+            "totalRecords": total_records,
+            "presentDays": present_days,
+            "totalPossibleDays": total_employees * total_days,
+        },
+        "payroll": {
+            "totalGross": gross / 100,
+            "totalNet": net / 100,
+            "avgGross": gross / payslips / 100 if payslips else 0,
+            "avgNet": net / payslips / 100 if payslips else 0,
+        },
+        "leaves": {
+            "total": int(leaves.sum()),
+            "approved": count_code(snap, "leave_requests", "status", statuses, "APPROVED"),
+            "pending": count_code(snap, "leave_requests", "status", statuses, "PENDING"),
+            "rejected": count_code(snap, "leave_requests", "status", statuses, "REJECTED"),
+        },
+    }
+
+
+def attendance_analytics(snap, start_ms, end_ms, department=None, tz=None):
+    in_dept = department_users(snap, department)
+    rows = between(snap.column("attendance", "date"), start_ms, end_ms) & user_rows(in_dept, snap.column("attendance", "user"))
+    dates = np.asarray(snap.column("attendance", "date"))[rows]
+    check_in = np.asarray(snap.column("attendance", "check_in"))[rows]
+    check_out = np.asarray(snap.column("attendance", "check_out"))[rows]
+
+    present = ~np.isnat(check_in)
+    total_records = len(dates)
+    present_records = int(present.sum())
+    tz = tz or snap.server_timezone
+    late = int((local_minute_of_day(check_in[present], tz) > LATE_AFTER_MINUTE).sum())
+    early = int((local_minute_of_day(check_out[~np.isnat(check_out)], tz) < EARLY_BEFORE_MINUTE).sum())
+
+    # Days in UTC (toISOString), ascending
+    days, inverse = np.unique(dates.astype("i8") // DAY_MS, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    per_day = np.bincount(inverse, minlength=len(days))
+    present_per_day = np.bincount(inverse, weights=present.astype("f8"), minlength=len(days))
+
+    return {
+        "period": period(start_ms, end_ms),
+        "department": department or "All Departments",
+        "summary": {
+            "totalRecords": total_records,
+            "present": present_records,
+            "absent": total_records - present_records,
+            "attendanceRate": to_fixed(present_records / total_records * 100) if total_records > 0 else 0,
+        },
+        "patterns": {
+            "lateCheckIns": late,
+            "earlyCheckouts": early,
+            "lateCheckInRate": to_fixed(late / present_records * 100) if present_records > 0 else 0,
+        },
+        "dailyTrend": [
+            {"date": str(np.datetime64(int(d), "D")), "present": int(p), "absent": int(n - p)}
+            for d, n, p in zip(days, per_day, present_per_day)
+        ],
+    }
+
+
+def employee_growth(snap, start_ms, end_ms):
+    created = np.asarray(snap.column("users", "created_at"))
+    updated = np.asarray(snap.column("users", "updated_at"))
+    is_active = np.asarray(snap.column("users", "is_active"))
+
+    joined = np.flatnonzero(between(created, start_ms, end_ms))
+    joined = joined[np.argsort(created[joined], kind="stable")]
+    left = np.flatnonzero(~is_active & between(updated, start_ms, end_ms))
+    left = left[np.argsort(updated[left], kind="stable")]
+
+    # Months in UTC (toISOString); joined months ascending, months with only leavers appended after them
+    monthly = {}
+    months, counts = np.unique(created[joined].astype("M8[M]"), return_counts=True)
+    for month, n in zip(months, counts):
+        monthly[str(month)] = {"month": str(month), "joined": int(n), "left": 0}
+    left_months, left_group = ordered_groups(updated[left].astype("M8[M]"))
+    for month, n in zip(left_months, np.bincount(left_group, minlength=len(left_months))):
+        entry = monthly.setdefault(str(month), {"month": str(month), "joined": 0, "left": 0})
+        entry["left"] += int(n)
+    cumulative = 0
+    for entry in monthly.values():
+        cumulative += entry["joined"] - entry["left"]
+        entry["total"] = cumulative
+
+    current_total = int(is_active.sum())
+    attrition = float(to_fixed(len(left) / current_total * 100)) if current_total > 0 else 0.0
+
+    dept_codes, dept_group = ordered_groups(np.asarray(snap.column("users", "department"))[joined])
+    by_department = {}
+    for code, n in zip(dept_codes, np.bincount(dept_group, minlength=len(dept_codes))):
+        name = department_name(snap, int(code))
+        by_department[name] = by_department.get(name, 0) + int(n)
+
+    return {
+        "period": period(start_ms, end_ms),
+        "currentTotal": current_total,
+        "totalJoined": len(joined),
+        "totalLeft": len(left),
+        "attritionRate": attrition,
+        "monthlyGrowth": list(monthly.values()),
+        "byDepartment": by_department,
+    }
+
+
+def leave_utilization(snap, start_ms, end_ms, department=None):
+    in_dept = department_users(snap, department)
+    start = np.asarray(snap.column("leave_requests", "start_date"))
+    end = np.asarray(snap.column("leave_requests", "end_date"))
+    rows = np.flatnonzero(
+        (start >= np.datetime64(start_ms, "ms"))
+        & (end <= np.datetime64(end_ms, "ms"))
+        & user_rows(in_dept, snap.column("leave_requests", "user"))
+    )
+    # Math.ceil(diff / day) + 1
+    diff = end[rows].astype("i8") - start[rows].astype("i8")
+    days = -(-diff // DAY_MS) + 1
+
+    types = snap.dictionary("leave_requests", "type")
+    type_codes, type_group = ordered_groups(np.asarray(snap.column("leave_requests", "type"))[rows])
+    type_counts = np.bincount(type_group, minlength=len(type_codes))
+    type_days = np.bincount(type_group, weights=days, minlength=len(type_codes))
+    by_type = {
+        types[c]: {"count": int(n), "days": int(round(d))} for c, n, d in zip(type_codes, type_counts, type_days)
+    }
+
+    statuses = snap.dictionary("leave_requests", "status")
+    status_codes, status_group = ordered_groups(np.asarray(snap.column("leave_requests", "status"))[rows])
+    by_status = {
+        statuses[c]: int(n) for c, n in zip(status_codes, np.bincount(status_group, minlength=len(status_codes)))
+    }
+
+    # Users in order of their first request, then stably by total days (descending)
+    user_ids, user_group = ordered_groups(np.asarray(snap.column("leave_requests", "user"))[rows])
+    user_counts = np.bincount(user_group, minlength=len(user_ids))
+    user_days = np.rint(np.bincount(user_group, weights=days, minlength=len(user_ids))).astype("i8")
+    top = np.argsort(-user_days, kind="stable")[:TOP_USERS]
+    ids = snap.column("users", "id")
+    names = snap.column("users", "name")
+    departments = np.asarray(snap.column("users", "department"))
+
+    return {
+        "period": period(start_ms, end_ms),
+        "department": department or "All Departments",
+        "totalRequests": len(rows),
+        "byType": by_type,
+        "byStatus": by_status,
+        "topUsers": [
+            {
+                "userId": ids[user_ids[i]],
+                "userName": names[user_ids[i]],
+                "department": department_name(snap, int(departments[user_ids[i]])),
+                "count": int(user_counts[i]),
+                "days": int(user_days[i]),
+            }
+            for i in top
+        ],
+    }
+
+
+REPORTS = {
+    "company-overview": company_overview,
+    "attendance-analytics": attendance_analytics,
+    "employee-growth": employee_growth,
+    "leave-utilization": leave_utilization,
+}
+
+
+def run_report(snap, report, start_ms, end_ms, department=None, tz=None):
+    if report == "employee-growth":
+        return employee_growth(snap, start_ms, end_ms)
+    if report == "attendance-analytics":
+        return attendance_analytics(snap, start_ms, end_ms, department, tz)
+    return REPORTS[report](snap, start_ms, end_ms, department)
+
+
+def local_midnight_ms(day, tz):
+    return int(datetime(day.year, day.month, day.day, tzinfo=ZoneInfo(tz)).timestamp() * 1000)
+
+
+def month_day(year, month, day):
+    """new Date(year, month, day) date arithmetic: months and days overflow (day 0 = last day of previous month)"""
+    year += month // 12
+    month %= 12
+    return date(year, month + 1, 1) + timedelta(days=day - 1)
+
+
+def parse_date_range(range_name, tz, today=None):
+    """The reports controller's range presets, as local midnights in `tz`"""
+    today = today or datetime.now(ZoneInfo(tz)).date()
+    y, m = today.year, today.month - 1
+    if range_name == "last-month":
+        start, end = month_day(y, m - 1, 1), month_day(y, m, 0)
+    elif range_name == "quarter":
+        q = m // 3
+        start, end = month_day(y, q * 3, 1), month_day(y, (q + 1) * 3, 0)
+    elif range_name == "year":
+        start, end = month_day(y, 0, 1), month_day(y, 11, 31)
+    else:
+        start, end = month_day(y, m, 1), month_day(y, m + 1, 0)
+    return local_midnight_ms(start, tz), local_midnight_ms(end, tz)
+
+
+def parse_instant(value, tz):
+    """ISO date (local midnight in tz) or datetime (naive = local in tz)"""
+    if len(value) == 10:
+        return local_midnight_ms(date.fromisoformat(value), tz)
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo(tz))
+    return int(dt.timestamp() * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("snapshot")
+    parser.add_argument("report", choices=sorted(REPORTS))
+    parser.add_argument("--range", default="current-month", choices=["current-month", "last-month", "quarter", "year"])
+    parser.add_argument("--start", help="overrides --range, e.g. 2021-01-01 or 2021-01-01T00:00:00Z")
+    parser.add_argument("--end")
+    parser.add_argument("--department")
+    parser.add_argument("--tz", help="timezone for local times (default: the server timezone in the manifest)")
+    args = parser.parse_args()
+
+    snap = Snapshot(args.snapshot)
+    tz = args.tz or snap.server_timezone
+    start_ms, end_ms = parse_date_range(args.range, tz)
+    if args.start:
+        start_ms = parse_instant(args.start, tz)
+    if args.end:
+        end_ms = parse_instant(args.end, tz)
+    json.dump(run_report(snap, args.report, start_ms, end_ms, args.department, tz), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
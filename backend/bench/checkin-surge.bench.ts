@@ -0,0 +1,115 @@
+/**
+ * Morning check-in surge benchmark.
+ *
+ * Seeds N synthetic employees, then fires their check-ins through
+ * AttendanceService.checkin with a bounded number in flight, the way the 9 AM
+ * surge hits the API. Reports throughput and latency percentiles, replays the
+ * surge to measure the idempotent (already checked in) path, runs the matching
+ * check-out wave, and removes the synthetic users afterwards.
+ *
+ * Run it only against a dedicated database: the synthetic users and their
+ * attendance show up in every report while it runs. The script refuses to
+ * start unless CHECKIN_BENCH_DATABASE names the database DATABASE_URL points at
+ * and that name contains "bench" or "test".
+ *
+ * Needs DATABASE_URL pointing at a migrated database (seeded roles).
+ *
+ *   CHECKIN_BENCH_DATABASE=workzen_bench npx tsx bench/checkin-surge.bench.ts [users=2000] [concurrency=200]
+ */
+import { performance } from 'perf_hooks';
+import { prisma } from '../src/services/prisma.service';
+import { AttendanceService } from '../src/services/attendance.service';
+import { OfficeLocationService } from '../src/services/office-location.service';
+import { assertDedicatedDatabase } from './dedicated-database';
+
+const USERS = Number(process.argv[2] ?? 2000);
+const CONCURRENCY = Number(process.argv[3] ?? 200);
+const EMAIL_PREFIX = 'surge-bench-';
+
+function percentile(sorted: number[], p: number) {
+  if (!sorted.length) return 0;
+  return sorted[Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1)];
+}
+
+async function runWave(label: string, ids: string[], op: (id: string) => Promise<unknown>) {
+  const latencies: number[] = [];
+  let errors = 0;
+  let next = 0;
+
+  const worker = async () => {
+    while (next < ids.length) {
+      const id = ids[next++];
+      const t0 = performance.now();
+      try {
+        await op(id);
+      } catch {
+        errors++;
+      }
+      latencies.push(performance.now() - t0);
+    }
+  };
+
+  const start = performance.now();
+  await Promise.all(Array.from({ length: Math.min(CONCURRENCY, ids.length) }, worker));
+  const elapsed = performance.now() - start;
+
+  latencies.sort((a, b) => a - b);
+  return {
+    wave: label,
+    requests: ids.length,
+    errors,
+    'req/s': Math.round((ids.length / elapsed) * 1000),
+    'p50 ms': percentile(latencies, 50).toFixed(1),
+    'p95 ms': percentile(latencies, 95).toFixed(1),
+    'p99 ms': percentile(latencies, 99).toFixed(1),
+    'max ms': (latencies[latencies.length - 1] ?? 0).toFixed(1),
+  };
+}
+
+async function seedUsers() {
+  const role = await prisma.role.findUnique({ where: { name: 'employee' } });
+  if (!role) throw new Error('employee role missing; run the seed first');
+  const stamp = Date.now();
+  await prisma.user.createMany({
+    data: Array.from({ length: USERS }, (_, i) => ({
+      email: `${EMAIL_PREFIX}${stamp}-${i}@bench.local`,
+      name: `Surge Bench ${i}`,
+      passwordHash: 'x',
+      roleId: role.id,
+    })),
+  });
+  const users = await prisma.user.findMany({
+    where: { email: { startsWith: `${EMAIL_PREFIX}${stamp}-` } },
+    select: { id: true },
+  });
+  return users.map((u) => u.id);
+}
+
+async function main() {
+  await assertDedicatedDatabase('CHECKIN_BENCH_DATABASE', 'seeded');
+  const office = await OfficeLocationService.get();
+  // Check in from the office itself so geofenced setups pass validation
+  const location = office ? { lat: office.lat, lng: office.lng } : { lat: 12.9716, lng: 77.5946 };
+
+  console.log(`Seeding ${USERS} synthetic employees...`);
+  const ids = await seedUsers();
+
+  try {
+    const rows = [
+      await runWave('check-in', ids, (id) => AttendanceService.checkin(id, 'mobile', undefined, location)),
+      await runWave('check-in (repeat)', ids, (id) => AttendanceService.checkin(id, 'mobile', undefined, location)),
+      await runWave('check-out', ids, (id) => AttendanceService.checkout(id, location)),
+    ];
+    console.log(`check-in surge: ${USERS} users, ${CONCURRENCY} in flight`);
+    console.table(rows);
+  } finally {
+    // Attendance rows cascade with the users
+    await prisma.user.deleteMany({ where: { id: { in: ids } } });
+    await prisma.$disconnect();
+  }
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
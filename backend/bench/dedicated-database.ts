@@ -0,0 +1,16 @@
+import { prisma } from '../src/services/prisma.service';
+
+/**
+ * Refuse to seed (or lock) anything but a database set aside for benchmarks:
+ * `envVar` must name the database DATABASE_URL points at, and that name must
+ * contain "bench" or "test".
+ */
+export async function assertDedicatedDatabase(envVar: string, what: string) {
+  const [{ name }] = await prisma.$queryRaw<Array<{ name: string }>>`SELECT current_database() AS name`;
+  if (process.env[envVar] !== name) {
+    throw new Error(`Set ${envVar}=${name} to confirm this database may be ${what} by the benchmark`);
+  }
+  if (!/bench|test/i.test(name)) {
+    throw new Error(`Database "${name}" does not look dedicated to benchmarks (name must contain "bench" or "test")`);
+  }
+}
@@ -0,0 +1,338 @@
+/**
+ * Query-plan benchmark for the reporting, analytics, admin and payroll services.
+ *
+ * Seeds a large synthetic dataset, calls every query-issuing method of
+ * ReportsService, AnalyticsService, AdminService and PayrollService while
+ * capturing the SQL Prisma sends, then runs EXPLAIN (ANALYZE, BUFFERS) on each
+ * distinct statement twice: as the schema stands ("after"), and with the
+ * report-filter indexes dropped inside a rolled-back transaction ("before").
+ * Sequential scans reading more than the row threshold are flagged.
+ *
+ * Plans are written to bench/plans/{before,after}/ with a summary.md next to
+ * them. Only reads are captured (payroll runs are represented by their read
+ * half, calculatePayslips), statements are explained inside transactions that
+ * roll back, and the synthetic rows are removed at the end.
+ *
+ * Run it only against a dedicated database: the synthetic rows show up in every
+ * report while it runs, and each "before" plan holds ACCESS EXCLUSIVE locks on
+ * User, EmployeeProfile, LeaveRequest and Payslip (from DROP INDEX) until its
+ * transaction rolls back. The script refuses to start unless PLAN_BENCH_DATABASE
+ * names the database DATABASE_URL points at and that name contains "bench" or
+ * "test".
+ *
+ * Needs DATABASE_URL pointing at a migrated database (seeded roles), and
+ * PRISMA_QUERY_EVENTS=true so the Prisma clients emit query events.
+ *
+ *   PLAN_BENCH_DATABASE=workzen_bench PRISMA_QUERY_EVENTS=true \
+ *     npx tsx bench/query-plans.bench.ts [users=5000] [days=120] [seqScanRows=1000] [keep]
+ */
+
+import fs from 'fs';
+import path from 'path';
+import { Client } from 'pg';
+import { config } from '../src/config';
+import { prisma } from '../src/services/prisma.service';
+import { readDb, ReadReplicaService } from '../src/services/read-replica.service';
+import { cacheInvalidatePrefix } from '../src/services/cache.service';
+import { ReportsService } from '../src/services/reports.service';
+import { AnalyticsService } from '../src/services/analytics.service';
+import { AdminService } from '../src/services/admin.service';
+import { calculatePayslips, PayrollService } from '../src/services/payroll.service';
+import { assertDedicatedDatabase } from './dedicated-database';
+
+const USERS = Number(process.argv[2] ?? 5000);
+const DAYS = Number(process.argv[3] ?? 120);
+const SEQ_SCAN_ROWS = Number(process.argv[4] ?? 1000);
+const KEEP_DATA = process.argv[5] === 'keep';
+
+const PREFIX = 'plan-bench-';
+const OUT_DIR = path.join(__dirname, 'plans');
+const DEPARTMENTS = ['Engineering', 'Sales', 'Marketing', 'Operations', 'Finance', 'HR'];
+
+// Don't queue behind (and in front of) other sessions for the DROP INDEX locks
+const LOCK_TIMEOUT = '5s';
+
+// Indexes from migration 20251111090000_add_report_filter_indexes
+const REPORT_INDEXES = [
+  'User_createdAt_idx',
+  'User_isActive_updatedAt_idx',
+  'EmployeeProfile_department_idx',
+  'LeaveRequest_status_startDate_idx',
+  'Payslip_createdAt_idx',
+];
+
+type Captured = { source: string; sql: string; params: unknown[]; calls: number };
+type SeqScan = { relation: string; rowsScanned: number };
+type PlanResult = { planningMs: number; executionMs: number; sharedHit: number; sharedRead: number; seqScans: SeqScan[]; plan: unknown };
+
+const statements = new Map<string, Captured>();
+let currentSource = '';
+
+function capture(e: { query: string; params: string }) {
+  const sql = e.query.trim();
+  if (!/^(SELECT|WITH|INSERT|UPDATE|DELETE)\b/i.test(sql)) return; // BEGIN/COMMIT etc.
+  const key = `${currentSource}\n${sql}`;
+  const existing = statements.get(key);
+  if (existing) {
+    existing.calls++;
+    return;
+  }
+  let params: unknown[] = [];
+  try {
+    params = JSON.parse(e.params);
+  } catch {
+    // leave empty; EXPLAIN will report the problem
+  }
+  statements.set(key, { source: currentSource, sql, params, calls: 1 });
+}
+
+async function seed() {
+  const role = await prisma.role.findUnique({ where: { name: 'employee' } });
+  if (!role) throw new Error('employee role missing; run the seed first');
+
+  const run = (label: string, sql: string, ...params: unknown[]) => {
+    console.log(`  ${label}`);
+    return prisma.$executeRawUnsafe(sql, ...params);
+  };
+
+  await run('users', `
+    INSERT INTO "User" ("id", "email", "name", "passwordHash", "roleId", "isActive", "createdAt", "updatedAt")
+    SELECT '${PREFIX}' || g, '${PREFIX}' || g || '@bench.local', 'Plan Bench ' || g, 'x', $1,
+           g % 20 <> 0,
+           now() - (g % 720) * interval '1 day',
+           now() - (g % 365) * interval '1 day'
+    FROM generate_series(1, $2::int) g`, role.id, USERS);
+
+  await run('profiles', `
+    INSERT INTO "EmployeeProfile" ("id", "userId", "employeeCode", "department", "createdAt", "updatedAt")
+    SELECT '${PREFIX}p-' || g, '${PREFIX}' || g, 'PB' || lpad(g::text, 7, '0'),
+           (ARRAY['Engineering','Sales','Marketing','Operations','Finance','HR'])[1 + g % 6],
+           now() - (g % 720) * interval '1 day', now()
+    FROM generate_series(1, $1::int) g`, USERS);
+
+  await run('attendance', `
+    INSERT INTO "Attendance" ("id", "userId", "date", "status", "checkIn", "checkOut", "checkInMinute", "createdAt")
+    SELECT '${PREFIX}a-' || u || '-' || d, '${PREFIX}' || u, day, 'PRESENT'::"AttendanceStatus",
+           day + (540 + (u * 7 + d * 13) % 90) * interval '1 minute',
+           day + (1080 + (u + d) % 60) * interval '1 minute',
+           540 + (u * 7 + d * 13) % 90,
+           day
+    FROM generate_series(1, $1::int) u,
+         generate_series(0, $2::int - 1) d,
+         LATERAL (SELECT (current_date - d)::timestamp AS day) x
+    WHERE (u + d) % 10 <> 0`, USERS, DAYS);
+
+  await run('leave requests', `
+    INSERT INTO "LeaveRequest" ("id", "userId", "type", "status", "startDate", "endDate", "createdAt")
+    SELECT '${PREFIX}l-' || u || '-' || k, '${PREFIX}' || u,
+           (ARRAY['SICK','CASUAL','EARNED','UNPAID']::"LeaveType"[])[1 + (u + k) % 4],
+           (ARRAY['PENDING','APPROVED','REJECTED','CANCELLED']::"LeaveStatus"[])[1 + (u * 3 + k) % 4],
+           (current_date - ((u * 11 + k * 37) % $2::int))::timestamp,
+           (current_date - ((u * 11 + k * 37) % $2::int) + (k % 3))::timestamp,
+           now() - ((u * 11 + k * 37) % $2::int) * interval '1 day'
+    FROM generate_series(1, $1::int) u, generate_series(1, 4) k`, USERS, DAYS);
+
+  // Payruns use years no real payrun has; payslip createdAt spans recent months
+  await run('payruns', `
+    INSERT INTO "Payrun" ("id", "year", "month", "status", "createdAt")
+    SELECT '${PREFIX}r-' || m, 1900, m, 'FINALIZED'::"PayrunStatus", date_trunc('month', now()) - (m - 1) * interval '1 month'
+    FROM generate_series(1, 6) m`);
+
+  await run('payslips', `
+    INSERT INTO "Payslip" ("id", "userId", "payrunId", "basic", "gross", "net", "createdAt")
+    SELECT '${PREFIX}s-' || u || '-' || m, '${PREFIX}' || u, '${PREFIX}r-' || m,
+           30000 + u % 50000, 45000 + u % 50000, 40000 + u % 50000,
+           date_trunc('month', now()) - (m - 1) * interval '1 month' + interval '1 day'
+    FROM generate_series(1, $1::int) u, generate_series(1, 6) m`, USERS);
+
+  await run('audit logs', `
+    INSERT INTO "AuditLog" ("id", "userId", "action", "entity", "createdAt")
+    SELECT '${PREFIX}g-' || g, '${PREFIX}' || (1 + g % $1::int),
+           (ARRAY['LOGIN','LEAVE_APPLY','LEAVE_APPROVE','CHECKIN'])[1 + g % 4], 'Bench',
+           now() - (g % 86400) * interval '1 minute'
+    FROM generate_series(1, $1::int * 10) g`, USERS);
+
+  await prisma.$executeRawUnsafe('ANALYZE');
+}
+
+async function cleanup() {
+  // Profiles, attendance, leaves and payslips cascade with the users
+  await prisma.$executeRawUnsafe(`DELETE FROM "AuditLog" WHERE "id" LIKE '${PREFIX}%'`);
+  await prisma.$executeRawUnsafe(`DELETE FROM "User" WHERE "id" LIKE '${PREFIX}%'`);
+  await prisma.$executeRawUnsafe(`DELETE FROM "Payrun" WHERE "id" LIKE '${PREFIX}%'`);
+}
+
+async function scenario(source: string, fn: () => Promise<unknown>) {
+  cacheInvalidatePrefix('');
+  currentSource = source;
+  try {
+    await fn();
+  } catch (e) {
+    console.warn(`  ${source} failed: ${(e as Error).message}`);
+  }
+  // Query events are emitted asynchronously
+  await new Promise((r) => setTimeout(r, 50));
+  currentSource = '';
+}
+
+async function captureStatements() {
+  const admin = { id: `${PREFIX}1`, role: 'admin' };
+  const now = new Date();
+  const monthStart = new Date(now.getFullYear(), now.getMonth(), 1);
+  const monthEnd = new Date(now.getFullYear(), now.getMonth() + 1, 0);
+  const quarterStart = new Date(now.getFullYear(), now.getMonth() - 2, 1);
+  const month = `${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2, '0')}`;
+
+  await scenario('AnalyticsService.overview', () => AnalyticsService.overview());
+  await scenario('AnalyticsService.attendanceByDay', () => AnalyticsService.attendanceByDay(month));
+  await scenario('AnalyticsService.payrollTotals', () => AnalyticsService.payrollTotals(monthStart, monthEnd));
+
+  await scenario('ReportsService.companyOverview', () => ReportsService.companyOverview(quarterStart, monthEnd));
+  await scenario('ReportsService.companyOverview(department)', () => ReportsService.companyOverview(quarterStart, monthEnd, 'Engineering'));
+  await scenario('ReportsService.departmentPerformance', () => ReportsService.departmentPerformance(quarterStart, monthEnd));
+  await scenario('ReportsService.payrollSummary', () => ReportsService.payrollSummary(quarterStart, monthEnd));
+  await scenario('ReportsService.leaveUtilization', () => ReportsService.leaveUtilization(quarterStart, monthEnd));
+  await scenario('ReportsService.attendanceAnalytics', () => ReportsService.attendanceAnalytics(monthStart, monthEnd));
+  await scenario('ReportsService.employeeGrowth', () => ReportsService.employeeGrowth(new Date(now.getFullYear() - 1, now.getMonth(), 1), monthEnd));
+
+  await scenario('AdminService.getAuditLogs', () => AdminService.getAuditLogs('admin', 1, 20, {}));
+  await scenario('AdminService.getAuditLogs(action)', () => AdminService.getAuditLogs('admin', 1, 20, { action: 'LEAVE_APPLY' }));
+  await scenario('AdminService.getAnomalies', () => AdminService.getAnomalies('admin'));
+
+  await scenario('PayrollService.computeInputs', () => PayrollService.computeInputs(admin, monthStart, monthEnd));
+  await scenario('PayrollService.getById', () => PayrollService.getById(admin, `${PREFIX}r-1`));
+  await scenario('PayrollService.getPayslips', () => PayrollService.getPayslips(admin, `${PREFIX}1`));
+  // PayrollService.run writes a payrun and notifies other instances, so run its
+  // read half (the existing-payrun check, then calculatePayslips) and stop there
+  await scenario('PayrollService.run (reads)', () =>
+    prisma.$transaction(async (tx) => {
+      await tx.payrun.findUnique({ where: { year_month: { year: monthStart.getFullYear(), month: monthStart.getMonth() + 1 } } });
+      return calculatePayslips(tx, monthStart, monthEnd);
+    }, { timeout: 10 * 60_000 }));
+}
+
+function collectSeqScans(node: any, out: SeqScan[]) {
+  if (!node || typeof node !== 'object') return;
+  if (node['Node Type'] === 'Seq Scan' || node['Node Type'] === 'Parallel Seq Scan') {
+    const loops = node['Actual Loops'] ?? 1;
+    const rowsScanned = ((node['Actual Rows'] ?? 0) + (node['Rows Removed by Filter'] ?? 0)) * loops;
+    if (rowsScanned >= SEQ_SCAN_ROWS) out.push({ relation: node['Relation Name'], rowsScanned });
+  }
+  (node.Plans ?? []).forEach((child: any) => collectSeqScans(child, out));
+}
+
+async function explain(client: any, stmt: Captured, withoutIndexes: boolean): Promise<PlanResult | { error: string }> {
+  const sql = `EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) ${stmt.sql}`;
+  await client.query('BEGIN');
+  try {
+    await client.query(`SET LOCAL lock_timeout = '${LOCK_TIMEOUT}'`);
+    if (withoutIndexes) {
+      for (const name of REPORT_INDEXES) await client.query(`DROP INDEX IF EXISTS "${name}"`);
+    }
+    // First run warms the cache; keep the second
+    await client.query('SAVEPOINT warm');
+    await client.query(sql, stmt.params);
+    await client.query('ROLLBACK TO SAVEPOINT warm');
+    const { rows } = await client.query(sql, stmt.params);
+    const [result] = rows[0]['QUERY PLAN'];
+    const seqScans: SeqScan[] = [];
+    collectSeqScans(result.Plan, seqScans);
+    return {
+      planningMs: result['Planning Time'],
+      executionMs: result['Execution Time'],
+      sharedHit: result.Plan['Shared Hit Blocks'] ?? 0,
+      sharedRead: result.Plan['Shared Read Blocks'] ?? 0,
+      seqScans,
+      plan: result,
+    };
+  } catch (e) {
+    return { error: (e as Error).message };
+  } finally {
+    await client.query('ROLLBACK');
+  }
+}
+
+function writeArtifact(dir: string, index: number, stmt: Captured, result: unknown) {
+  fs.mkdirSync(dir, { recursive: true });
+  const name = `${String(index).padStart(3, '0')}-${stmt.source.replace(/[^A-Za-z0-9]+/g, '_')}.json`;
+  fs.writeFileSync(path.join(dir, name), JSON.stringify({ source: stmt.source, calls: stmt.calls, sql: stmt.sql, params: stmt.params, result }, null, 2));
+}
+
+const fmt = (r: PlanResult | { error: string }) => ('error' in r ? 'error' : (r.planningMs + r.executionMs).toFixed(2));
+const scans = (r: PlanResult | { error: string }) =>
+  'error' in r ? '' : r.seqScans.map((s) => `${s.relation}(${s.rowsScanned})`).join(', ');
+
+async function main() {
+  if (process.env.PRISMA_QUERY_EVENTS !== 'true') {
+    throw new Error('Set PRISMA_QUERY_EVENTS=true (pnpm bench:plans does) so statements can be captured');
+  }
+  await assertDedicatedDatabase('PLAN_BENCH_DATABASE', 'seeded and locked');
+  if (ReadReplicaService.status().configured) {
+    console.warn('DATABASE_READ_URL is set: report statements are captured from the replica but explained on the primary');
+  }
+  [prisma, readDb()].forEach((client: any) => client.$on('query', capture));
+
+  console.log(`Seeding ${USERS} users x ${DAYS} days...`);
+  await cleanup();
+  await seed();
+
+  const client = new Client({ connectionString: config.dbUrl });
+  await client.connect();
+  try {
+    console.log('Capturing statements...');
+    await captureStatements();
+    const list = Array.from(statements.values());
+    console.log(`Explaining ${list.length} distinct statements...`);
+
+    fs.rmSync(OUT_DIR, { recursive: true, force: true });
+    const rows: Record<string, unknown>[] = [];
+    const flagged: string[] = [];
+    for (const [i, stmt] of list.entries()) {
+      const before = await explain(client, stmt, true);
+      const after = await explain(client, stmt, false);
+      writeArtifact(path.join(OUT_DIR, 'before'), i + 1, stmt, before);
+      writeArtifact(path.join(OUT_DIR, 'after'), i + 1, stmt, after);
+      const row = {
+        '#': i + 1,
+        source: stmt.source,
+        calls: stmt.calls,
+        'before ms': fmt(before),
+        'after ms': fmt(after),
+        'seq scans before': scans(before),
+        'seq scans after': scans(after),
+      };
+      rows.push(row);
+      if (!('error' in after) && after.seqScans.length) flagged.push(`#${i + 1} ${stmt.source}: ${scans(after)}`);
+    }
+
+    console.table(rows);
+    const header = Object.keys(rows[0] ?? { '#': '' });
+    const md = [
+      `# Query plans (${USERS} users, ${DAYS} days, seq scan threshold ${SEQ_SCAN_ROWS} rows)`,
+      '',
+      `| ${header.join(' | ')} |`,
+      `| ${header.map(() => '---').join(' | ')} |`,
+      ...rows.map((r) => `| ${header.map((h) => String(r[h]).replace(/\|/g, '\\|')).join(' | ')} |`),
+      '',
+      flagged.length ? '## Sequential scans over threshold (current schema)\n' : '## No sequential scans over threshold',
+      ...flagged.map((f) => `- ${f}`),
+      '',
+    ].join('\n');
+    fs.writeFileSync(path.join(OUT_DIR, 'summary.md'), md);
+    console.log(`Plans written to ${path.relative(process.cwd(), OUT_DIR)}/`);
+    if (flagged.length) {
+      console.log('Sequential scans over threshold:');
+      flagged.forEach((f) => console.log(`  ${f}`));
+    }
+  } finally {
+    await client.end();
+    if (!KEEP_DATA) await cleanup();
+    await ReadReplicaService.disconnect();
+    await prisma.$disconnect();
+  }
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,95 @@
+/**
+ * Micro-benchmark for the input sanitization middleware.
+ *
+ * Compares the compiled single-pass scanner against the previous per-rule scan
+ * on payloads shaped like real traffic (check-ins, leave applications, report
+ * filters, bare GETs).
+ *
+ *   npx tsx bench/sanitize.bench.ts [iterations]
+ */
+import { performance } from 'perf_hooks';
+import type { Request, Response } from 'express';
+import { sanitizeInput } from '../src/middlewares/sanitize.middleware';
+
+const ITERATIONS = Number(process.argv[2] ?? 200_000);
+
+/** The previous implementation: ~15 regexes per string, rebuilt objects */
+function legacyCheck(value: string) {
+  const patterns = [
+    /(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE|UNION|DECLARE)\b)/i,
+    /(--|;|\/\*|\*\/|xp_|sp_)/i,
+    /('|('')|;|--|\/\*|\*\/)/i,
+    /<script[^>]*>.*?<\/script>/i,
+    /<iframe[^>]*>.*?<\/iframe>/i,
+    /javascript:/i,
+    /on\w+\s*=/i,
+    /<embed[^>]*>/i,
+    /<object[^>]*>/i,
+    /\.\.[\/\\]/,
+    /[\/\\]\.\./,
+    /%2e%2e/i,
+    /%252e%252e/i,
+  ];
+  if (patterns.some((p) => p.test(value))) throw new Error('rejected');
+  return value.replace(/\0/g, '').trim().replace(/[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]/g, '');
+}
+
+function legacyWalk(obj: any): any {
+  if (obj === null || obj === undefined) return obj;
+  if (typeof obj === 'string') return legacyCheck(obj);
+  if (Array.isArray(obj)) return obj.map(legacyWalk);
+  if (typeof obj === 'object') {
+    const out: any = {};
+    for (const [key, value] of Object.entries(obj)) {
+      if (!/^[a-zA-Z0-9_.-]+$/.test(key)) throw new Error('bad key');
+      out[key] = legacyWalk(value);
+    }
+    return out;
+  }
+  return obj;
+}
+
+function legacyMiddleware(req: any) {
+  if (req.body && typeof req.body === 'object') req.body = legacyWalk(req.body);
+  if (req.query && typeof req.query === 'object') req.query = legacyWalk(req.query);
+  if (req.params && typeof req.params === 'object') req.params = legacyWalk(req.params);
+}
+
+const PAYLOADS: Record<string, () => any> = {
+  'GET (no input)': () => ({ body: {}, query: {}, params: {} }),
+  'GET report filters': () => ({ body: {}, query: { range: 'current-month', department: 'Engineering' }, params: {} }),
+  'POST check-in': () => ({
+    body: { method: 'mobile', location: { lat: 12.9716, lng: 77.5946, address: 'Tech Park, Bangalore' } },
+    query: {},
+    params: {},
+  }),
+  'POST leave apply': () => ({
+    body: { type: 'CASUAL', startDate: '2025-11-10', endDate: '2025-11-12', reason: 'Family function in hometown' },
+    query: {},
+    params: {},
+  }),
+};
+
+function time(label: string, fn: () => void) {
+  for (let i = 0; i < 1_000; i++) fn(); // warm-up
+  const start = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) fn();
+  const ms = performance.now() - start;
+  return { label, nsPerOp: (ms * 1e6) / ITERATIONS, opsPerSec: Math.round((ITERATIONS / ms) * 1000) };
+}
+
+const noop = () => undefined;
+const rows = [];
+for (const [name, make] of Object.entries(PAYLOADS)) {
+  const legacy = time('legacy', () => legacyMiddleware(make()));
+  const current = time('current', () => sanitizeInput(make() as Request, {} as Response, noop));
+  rows.push({
+    payload: name,
+    'legacy ns/op': legacy.nsPerOp.toFixed(0),
+    'current ns/op': current.nsPerOp.toFixed(0),
+    speedup: `${(legacy.nsPerOp / current.nsPerOp).toFixed(2)}x`,
+  });
+}
+
+console.log(`sanitize benchmark, ${ITERATIONS} iterations per payload`);
+console.table(rows);
@@ -0,0 +1,11 @@
+#!/bin/sh
+# Clone the primary once, then run as a hot standby following it
+set -e
+if [ ! -s "$PGDATA/PG_VERSION" ]; then
+  until pg_basebackup -h db -U postgres -D "$PGDATA" -R -X stream; do
+    echo "waiting for primary..."
+    sleep 2
+  done
+  chmod 0700 "$PGDATA"
+fi
+exec postgres -c hot_standby=on
@@ -0,0 +1,19 @@
+-- AlterTable
+ALTER TABLE "Attendance" ADD COLUMN     "checkInMinute" INTEGER;
+
+-- Backfill: minute of day of the check-in in the company timezone
+UPDATE "Attendance" a
+SET "checkInMinute" = (
+  EXTRACT(HOUR FROM (a."checkIn" AT TIME ZONE 'UTC') AT TIME ZONE tz."name") * 60
+  + EXTRACT(MINUTE FROM (a."checkIn" AT TIME ZONE 'UTC') AT TIME ZONE tz."name")
+)::INTEGER
+FROM (
+  SELECT COALESCE(
+    (SELECT "value" #>> '{}' FROM "CompanySettings" WHERE "key" = 'company.timezone'),
+    'Asia/Kolkata'
+  ) AS "name"
+) tz
+WHERE a."checkIn" IS NOT NULL;
+
+-- CreateIndex
+CREATE INDEX "Attendance_date_checkInMinute_userId_idx" ON "Attendance"("date", "checkInMinute", "userId");
@@ -0,0 +1,14 @@
+-- CreateIndex
+CREATE INDEX "User_createdAt_idx" ON "User"("createdAt");
+
+-- CreateIndex
+CREATE INDEX "User_isActive_updatedAt_idx" ON "User"("isActive", "updatedAt");
+
+-- CreateIndex
+CREATE INDEX "EmployeeProfile_department_idx" ON "EmployeeProfile"("department");
+
+-- CreateIndex
+CREATE INDEX "LeaveRequest_status_startDate_idx" ON "LeaveRequest"("status", "startDate");
+
+-- CreateIndex
+CREATE INDEX "Payslip_createdAt_idx" ON "Payslip"("createdAt");
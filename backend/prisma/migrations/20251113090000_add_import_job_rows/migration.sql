@@ -0,0 +1,11 @@
+-- CreateTable
+CREATE TABLE "ImportJobRow" (
+    "importJobId" TEXT NOT NULL,
+    "row" INTEGER NOT NULL,
+    "data" JSONB NOT NULL,
+
+    CONSTRAINT "ImportJobRow_pkey" PRIMARY KEY ("importJobId","row")
+);
+
+-- AddForeignKey
+ALTER TABLE "ImportJobRow" ADD CONSTRAINT "ImportJobRow_importJobId_fkey" FOREIGN KEY ("importJobId") REFERENCES "ImportJob"("id") ON DELETE CASCADE ON UPDATE CASCADE;
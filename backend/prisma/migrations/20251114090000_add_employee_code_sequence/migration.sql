@@ -0,0 +1,15 @@
+-- Serials for employee codes (OI + initials + yy + serial): never reissued, unlike count() + 1
+CREATE SEQUENCE "employee_code_seq";
+
+-- Continue after the highest serial in use (or the profile count, whichever is larger)
+SELECT setval(
+    'employee_code_seq',
+    GREATEST(
+        (SELECT count(*) FROM "EmployeeProfile"),
+        COALESCE((
+            SELECT max(substring("employeeCode" FROM '^OI.{2}[0-9]{2}([0-9]{5,})$')::bigint)
+            FROM "EmployeeProfile"
+        ), 0)
+    ) + 1,
+    false
+);
@@ -5,6 +5,7 @@ import { router as apiRouter } from './routes';
 import { requestLogger } from './middlewares/request-logger.middleware';
 import { errorHandler } from './middlewares/error-handler.middleware';
 import { sanitizeInput } from './middlewares/sanitize.middleware';
+import { compressResponses } from './middlewares/compression.middleware';
 import cookieParser from 'cookie-parser';
 
 export function createApp() {
@@ -18,11 +19,14 @@ export function createApp() {
     origin: true,
     credentials: true,
     methods: ['GET', 'HEAD', 'PUT', 'PATCH', 'POST', 'DELETE'],
-    allowedHeaders: ['Content-Type', 'Authorization'],
-    exposedHeaders: ['Content-Length'],
+    allowedHeaders: ['Content-Type', 'Authorization', 'If-None-Match'],
+    exposedHeaders: ['Content-Length', 'ETag'],
     maxAge: 86400,
   }));
   app.options('*', cors());
+
+  // Negotiated gzip/brotli for responses above the size threshold
+  app.use(compressResponses);
   
   // Body parsing with size limits
   app.use(express.json({ 
@@ -15,6 +15,26 @@ const EnvSchema = z.object({
   CLOUDINARY_API_SECRET: z.string().optional().default(''),
   PGBOSS_SCHEMA: z.string().default('pgboss'),
   PGBOSS_MONITOR_INTERVAL: z.coerce.number().default(30000),
+  DATABASE_READ_URL: z.string().optional().default(''),
+  READ_POOL_SIZE: z.coerce.number().int().min(1).default(5),
+  READ_STATEMENT_TIMEOUT_MS: z.coerce.number().int().min(0).default(15000),
+  READ_MAX_LAG_MS: z.coerce.number().int().min(0).default(5000),
+  READ_LAG_CHECK_INTERVAL_MS: z.coerce.number().int().min(250).default(5000),
+  SNAPSHOT_DATABASE_URL: z.string().optional().default(''),
+  EMAIL_HOST: z.string().optional().default(''),
+  EMAIL_PORT: z.coerce.number().int().default(587),
+  EMAIL_USER: z.string().optional().default(''),
+  EMAIL_PASSWORD: z.string().optional().default(''),
+  EMAIL_FROM: z.string().optional().default(''),
+  EMAIL_POOL_SIZE: z.coerce.number().int().min(1).default(3),
+  EMAIL_RATE_PER_SECOND: z.coerce.number().int().min(1).default(5),
+  EMAIL_WORKERS: z.coerce.number().int().min(1).default(3),
+  EMAIL_RETRY_LIMIT: z.coerce.number().int().min(0).default(5),
+  EMAIL_RETRY_DELAY_SECONDS: z.coerce.number().int().min(1).default(30),
+  LOAD_SHEDDING: z.enum(['true', 'false']).default('true'),
+  TRANSACTIONAL_MAX_CONCURRENCY: z.coerce.number().int().min(1).default(256),
+  ANALYTICAL_MAX_CONCURRENCY: z.coerce.number().int().min(1).default(16),
+  AUTH_MAX_CONCURRENCY: z.coerce.number().int().min(1).default(32),
 });
 
 const parsed = EnvSchema.safeParse(process.env);
@@ -43,4 +63,36 @@ export const config = {
     schema: parsed.data.PGBOSS_SCHEMA,
     monitorInterval: parsed.data.PGBOSS_MONITOR_INTERVAL,
   },
+  // Reporting reads: separate pool, optionally on a streaming replica
+  readReplica: {
+    url: parsed.data.DATABASE_READ_URL,
+    poolSize: parsed.data.READ_POOL_SIZE,
+    statementTimeoutMs: parsed.data.READ_STATEMENT_TIMEOUT_MS,
+    maxLagMs: parsed.data.READ_MAX_LAG_MS,
+    lagCheckIntervalMs: parsed.data.READ_LAG_CHECK_INTERVAL_MS,
+  },
+  // Offline analytics exports (snapshot-export.service); empty = the primary
+  snapshot: {
+    url: parsed.data.SNAPSHOT_DATABASE_URL,
+  },
+  // Outgoing mail: queued in pg-boss, delivered over a pooled SMTP transport
+  email: {
+    host: parsed.data.EMAIL_HOST,
+    port: parsed.data.EMAIL_PORT,
+    user: parsed.data.EMAIL_USER,
+    password: parsed.data.EMAIL_PASSWORD,
+    from: parsed.data.EMAIL_FROM,
+    poolSize: parsed.data.EMAIL_POOL_SIZE,
+    ratePerSecond: parsed.data.EMAIL_RATE_PER_SECOND,
+    workers: parsed.data.EMAIL_WORKERS,
+    retryLimit: parsed.data.EMAIL_RETRY_LIMIT,
+    retryDelaySeconds: parsed.data.EMAIL_RETRY_DELAY_SECONDS,
+  },
+  // Adaptive per-lane concurrency limits (load-shedding.service)
+  loadShedding: {
+    enabled: parsed.data.LOAD_SHEDDING === 'true',
+    transactionalMax: parsed.data.TRANSACTIONAL_MAX_CONCURRENCY,
+    analyticalMax: parsed.data.ANALYTICAL_MAX_CONCURRENCY,
+    authMax: parsed.data.AUTH_MAX_CONCURRENCY,
+  },
 };
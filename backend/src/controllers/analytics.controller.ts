@@ -1,6 +1,32 @@
 import type { Response } from 'express';
 import { AuthRequest } from '../middlewares/auth.middleware';
 import { AnalyticsService } from '../services/analytics.service';
+import { LiveKpiService, KpiEvent } from '../services/live-kpi.service';
+
+// Open SSE streams share one subscription and one heartbeat timer
+const streams = new Set<Response>();
+const HEARTBEAT_MS = 25_000;
+let heartbeat: NodeJS.Timeout | null = null;
+let unsubscribe: (() => void) | null = null;
+
+function broadcast(chunk: string) {
+  for (const res of streams) res.write(chunk);
+}
+
+function onKpiEvent(event: KpiEvent | { resync: true }) {
+  if ('resync' in event) return broadcast('event: resync\ndata: {}\n\n');
+  const { id, source, deltas, domains, at } = event;
+  // Serialized once per event regardless of the number of streams
+  broadcast(`id: ${id}\nevent: kpi\ndata: ${JSON.stringify({ source, deltas, domains, at, sentAt: Date.now() })}\n\n`);
+}
+
+function closeStream(res: Response) {
+  if (!streams.delete(res) || streams.size) return;
+  if (heartbeat) clearInterval(heartbeat);
+  heartbeat = null;
+  unsubscribe?.();
+  unsubscribe = null;
+}
 
 export async function overview(req: AuthRequest, res: Response) {
   const data = await AnalyticsService.overview();
@@ -23,3 +49,34 @@ export async function payroll(req: AuthRequest, res: Response) {
   const data = await AnalyticsService.payrollTotals(start, end);
   return res.json(data);
 }
+
+/**
+ * Server-Sent Events stream of KPI deltas for live dashboards.
+ * Starts with a full `snapshot`, then sends `kpi` deltas as writes happen and
+ * `resync` when events may have been missed.
+ */
+export async function live(req: AuthRequest, res: Response) {
+  let snapshot;
+  try {
+    snapshot = await AnalyticsService.overview();
+  } catch (e) {
+    return res.status(500).json({ error: (e as Error).message || 'Internal server error' });
+  }
+
+  req.socket.setTimeout(0);
+  req.socket.setNoDelay(true);
+  res.status(200).set({
+    'Content-Type': 'text/event-stream',
+    'Cache-Control': 'no-cache, no-transform',
+    Connection: 'keep-alive',
+    'X-Accel-Buffering': 'no',
+  });
+  res.flushHeaders();
+  res.write(`retry: 3000\nevent: snapshot\ndata: ${JSON.stringify({ kpis: snapshot, sentAt: Date.now() })}\n\n`);
+
+  streams.add(res);
+  if (!unsubscribe) unsubscribe = LiveKpiService.subscribe(onKpiEvent);
+  if (!heartbeat) heartbeat = setInterval(() => broadcast(': ping\n\n'), HEARTBEAT_MS);
+
+  req.on('close', () => closeStream(res));
+}
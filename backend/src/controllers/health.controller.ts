@@ -2,6 +2,9 @@ import type { Request, Response } from 'express';
 import { prisma } from '../services/prisma.service';
 import { cloudinaryClient, cloudinaryPing } from '../services/cloudinary.service';
 import { getBossInstance } from '../jobs/worker';
+import { ReadReplicaService } from '../services/read-replica.service';
+import { EmailQueueService } from '../services/email-queue.service';
+import { LoadSheddingService } from '../services/load-shedding.service';
 
 export async function healthHandler(_req: Request, res: Response) {
   const checks = {
@@ -35,5 +38,7 @@ export async function healthHandler(_req: Request, res: Response) {
   }
 
   const status = checks.db.ok && checks.cloudinary.ok && checks.queue.ok ? 200 : 503;
-  res.status(status).json({ status: status === 200 ? 'ok' : 'degraded', checks });
+  const email = await EmailQueueService.status().catch((e: any) => ({ error: e?.message ?? 'Email queue error' }));
+  // Informational: reporting reads fall back to the primary on their own; mail waits in its queue
+  res.status(status).json({ status: status === 200 ? 'ok' : 'degraded', checks, readReplica: ReadReplicaService.status(), email, limiters: LoadSheddingService.status() });
 }
@@ -3,7 +3,15 @@ import { AuthRequest } from '../middlewares/auth.middleware';
 import { listUsers, getUser, createUser, updateUser, deleteUser } from '../services/users.service';
 import { listUsersQuerySchema, createUserSchema, updateUserSchema } from '../dto/user.dto';
 import { asyncHandler } from '../middlewares/error-handler.middleware';
-import { ValidationError, NotFoundError } from '../utils/errors';
+import { ValidationError, NotFoundError, AppError } from '../utils/errors';
+import { UserImportService, ImportFormat } from '../services/user-import.service';
+
+const IMPORT_CONTENT_TYPES: Record<string, ImportFormat> = {
+  'text/csv': 'csv',
+  'application/x-ndjson': 'ndjson',
+  'application/ndjson': 'ndjson',
+  'application/jsonl': 'ndjson',
+};
 
 export const listHandler = asyncHandler(async (req: AuthRequest, res: Response) => {
   const parsed = listUsersQuerySchema.safeParse(req.query);
@@ -30,10 +38,10 @@ export const createHandler = asyncHandler(async (req: AuthRequest, res: Response
   // Return user with generated password if applicable
   return res.status(201).json({
     user: result.user,
-    message: result.generatedPassword 
-      ? 'User created successfully. Credentials have been sent to their email.' 
+    message: result.credentialsQueued
+      ? 'User created successfully. Login credentials will be sent to their email.'
       : 'User created successfully.',
-    generatedPassword: result.generatedPassword, // Only present if auto-generated
+    generatedPassword: result.generatedPassword, // Only present if auto-generated and not emailed
   });
 });
 
@@ -54,3 +62,20 @@ export const deleteHandler = asyncHandler(async (req: AuthRequest, res: Response
   await deleteUser(req.params.id, { id: actorId, ip, userAgent });
   return res.status(204).send();
 });
+
+// Body is streamed straight from the request: CSV or NDJSON are not parsed by the JSON/urlencoded parsers
+export const importHandler = asyncHandler(async (req: AuthRequest, res: Response) => {
+  const contentType = (req.get('content-type') || '').split(';')[0].trim().toLowerCase();
+  const format = IMPORT_CONTENT_TYPES[contentType];
+  if (!format) throw new AppError('Send the import as text/csv or application/x-ndjson', 415);
+  const actorId = req.user?.sub as string;
+  const ip = req.ip;
+  const userAgent = req.get('user-agent') || undefined;
+  const result = await UserImportService.start({ id: actorId, ip, userAgent }, req, format);
+  return res.status(202).json(result);
+});
+
+export const importStatusHandler = asyncHandler(async (req: AuthRequest, res: Response) => {
+  const job = await UserImportService.get(req.params.jobId);
+  return res.json(job);
+});
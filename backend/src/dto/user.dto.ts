@@ -24,3 +24,24 @@ export const updateUserSchema = z.object({
   isActive: z.boolean().optional(),
 });
 export type UpdateUserDto = z.infer<typeof updateUserSchema>;
+
+// One row of a bulk import (CSV cells arrive as strings; empty cells are dropped beforehand)
+const booleanCell = z.preprocess(
+  (v) => (typeof v === 'string' ? !['false', '0', 'no', 'n'].includes(v.trim().toLowerCase()) : v),
+  z.boolean(),
+);
+
+export const importUserRowSchema = z.object({
+  email: z.string().trim().email(),
+  name: z.string().trim().min(1),
+  password: z.string().min(8).optional(),
+  role: z.enum(['employee','hr','payroll','admin']).default('employee'),
+  department: z.string().trim().optional(),
+  salary: z.coerce.number().positive().optional(),
+  sendCredentials: booleanCell.default(true),
+}).refine((r) => r.password || r.sendCredentials, {
+  // Nobody would ever learn a generated password that is not emailed
+  message: 'required when sendCredentials is false',
+  path: ['password'],
+});
+export type ImportUserRow = z.infer<typeof importUserRowSchema>;
@@ -2,6 +2,7 @@ import { createApp } from './app';
 import { env } from './config/env';
 import { initBoss } from './jobs/boss';
 import { prisma } from './lib/prisma';
+import { LiveKpiService } from './services/live-kpi.service';
 
 async function bootstrap() {
   const app = createApp();
@@ -12,6 +13,9 @@ async function bootstrap() {
   // Initialize pg-boss
   await initBoss();
 
+  // Receive KPI deltas (and cache invalidations) from every API instance
+  await LiveKpiService.start();
+
   app.listen(env.port, () => {
     console.log(`API listening on http://localhost:${env.port}`);
   });
@@ -1,5 +1,7 @@
 import PgBoss from 'pg-boss';
 import { env } from '../config/env';
+import { EmailQueueService } from '../services/email-queue.service';
+import { UserImportService } from '../services/user-import.service';
 
 // Use a broad type here to avoid tight coupling to pg-boss typings while preserving runtime behavior
 let boss: any | null = null;
@@ -21,17 +23,18 @@ export async function initBoss() {
 
   await boss.start();
 
-  // Example job subscription
-  await boss.work('email:send', async (job: any) => {
-    // Implement email sending
-    console.log('Sending email', job.data);
-  });
+  // Queued outgoing mail (retries, dead-lettering and SMTP pooling inside)
+  await EmailQueueService.attach(boss);
+  // Bulk imports, a chunk per job so an interrupted import resumes
+  await UserImportService.attach(boss);
 
   console.log('pg-boss started');
 }
 
 export async function stopBoss() {
   if (boss) {
+    EmailQueueService.detach();
+    UserImportService.detach();
     await boss.stop();
     boss = null;
   }
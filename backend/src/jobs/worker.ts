@@ -1,5 +1,7 @@
 import PgBoss from 'pg-boss';
 import { config } from '../config';
+import { EmailQueueService } from '../services/email-queue.service';
+import { UserImportService } from '../services/user-import.service';
 
 // Use a broad type here to avoid tight coupling to pg-boss typings while preserving runtime behavior
 let boss: any | null = null;
@@ -18,12 +20,8 @@ export async function startWorker() {
 
   await boss.start();
 
-  // Example job handler
-  await boss.work('email:send', async (job: any) => {
-    // TODO: integrate with real mailer
-    // eslint-disable-next-line no-console
-    console.log('email:send job', job.data);
-  });
+  await EmailQueueService.attach(boss);
+  await UserImportService.attach(boss);
 
   // eslint-disable-next-line no-console
   console.log('pg-boss worker started');
@@ -0,0 +1,61 @@
+import type { Request, Response, NextFunction } from 'express';
+import zlib from 'zlib';
+
+const THRESHOLD_BYTES = 1024;
+const COMPRESSIBLE = /^(?:application\/(?:json|[\w.+-]+\+json)|text\/)/i;
+
+const BROTLI_OPTIONS: zlib.BrotliOptions = {
+  params: {
+    // Quality 4 is the usual sweet spot for dynamic responses; 11 is far too slow
+    [zlib.constants.BROTLI_PARAM_QUALITY]: 4,
+  },
+};
+
+function compress(encoding: 'br' | 'gzip', body: Buffer, cb: (err: Error | null, out: Buffer) => void) {
+  if (encoding === 'br') zlib.brotliCompress(body, BROTLI_OPTIONS, cb);
+  else zlib.gzip(body, cb);
+}
+
+/**
+ * Negotiated response compression (brotli preferred, then gzip).
+ *
+ * Hooks res.send, which every JSON response goes through, and compresses
+ * bodies of at least THRESHOLD_BYTES off the main thread via zlib's async API.
+ * Small payloads, 204/304 responses and already-encoded bodies pass through.
+ */
+export function compressResponses(req: Request, res: Response, next: NextFunction) {
+  const send = res.send.bind(res);
+
+  res.send = function compressedSend(body?: any) {
+    const contentType = String(res.getHeader('Content-Type') ?? '');
+    const isText = typeof body === 'string' || Buffer.isBuffer(body);
+
+    if (
+      !isText ||
+      req.method === 'HEAD' ||
+      res.statusCode === 204 ||
+      res.statusCode === 304 ||
+      res.getHeader('Content-Encoding') ||
+      !COMPRESSIBLE.test(contentType)
+    ) {
+      return send(body);
+    }
+
+    res.vary('Accept-Encoding');
+    const raw = Buffer.isBuffer(body) ? body : Buffer.from(body, 'utf8');
+    const encoding = raw.length >= THRESHOLD_BYTES ? req.acceptsEncodings(['br', 'gzip']) : false;
+    if (encoding !== 'br' && encoding !== 'gzip') return send(body);
+
+    // Let a conditional request resolve to 304 before spending CPU on compression
+    if (req.fresh) return send(body);
+
+    compress(encoding, raw, (err, out) => {
+      if (err) return send(body);
+      res.setHeader('Content-Encoding', encoding);
+      send(out);
+    });
+    return res;
+  } as Response['send'];
+
+  next();
+}
@@ -0,0 +1,42 @@
+import type { Request, Response, NextFunction } from 'express';
+import { createHash } from 'crypto';
+import { DataDomain, DataVersionService } from '../services/data-version.service';
+
+function localDay() {
+  const now = new Date();
+  return `${now.getFullYear()}-${now.getMonth() + 1}-${now.getDate()}`;
+}
+
+function matches(ifNoneMatch: string, etag: string) {
+  if (ifNoneMatch.trim() === '*') return true;
+  return ifNoneMatch.split(',').some((t) => t.trim().replace(/^W\//, '') === etag);
+}
+
+/**
+ * Conditional GET for report/analytics endpoints.
+ *
+ * The strong ETag is derived from the data version counters of `domains`, the
+ * request URL and the current day (ranges such as "current-month" and "today"
+ * move at midnight). A matching If-None-Match short-circuits with 304 before
+ * the handler runs, so nothing is queried or serialized.
+ */
+export function conditionalGet(...domains: DataDomain[]) {
+  return (req: Request, res: Response, next: NextFunction) => {
+    if (req.method !== 'GET' && req.method !== 'HEAD') return next();
+
+    const digest = createHash('sha1')
+      .update(`${req.originalUrl}|${localDay()}`)
+      .digest('base64url')
+      .slice(0, 16);
+    const etag = `"${DataVersionService.token(domains)}:${digest}"`;
+
+    res.setHeader('ETag', etag);
+    res.setHeader('Cache-Control', 'private, no-cache');
+
+    const ifNoneMatch = req.get('if-none-match');
+    if (ifNoneMatch && matches(ifNoneMatch, etag)) {
+      return res.status(304).end();
+    }
+    next();
+  };
+}
@@ -0,0 +1,28 @@
+import type { Request, Response, NextFunction } from 'express';
+import { config } from '../config';
+import { AdaptiveLimiter, Lane, LoadSheddingService } from '../services/load-shedding.service';
+
+/**
+ * Admit the request into a concurrency lane or shed it right away with 503
+ * and Retry-After. The slot is held until the response finishes (or the
+ * client goes away); 5xx responses count against the lane's limit.
+ *
+ * Place it after authentication and conditional GET so rejected tokens and
+ * 304s never take a slot.
+ */
+export function limitConcurrency(lane: Lane | AdaptiveLimiter) {
+  const limiter = typeof lane === 'string' ? LoadSheddingService.lanes[lane] : lane;
+  return (_req: Request, res: Response, next: NextFunction) => {
+    if (!config.loadShedding.enabled) return next();
+
+    const release = limiter.tryAcquire();
+    if (!release) {
+      res.setHeader('Retry-After', String(limiter.retryAfterSeconds()));
+      return res.status(503).json({ error: 'Server busy, please retry shortly' });
+    }
+    const done = () => release(res.statusCode >= 500);
+    res.once('finish', done);
+    res.once('close', done);
+    next();
+  };
+}
@@ -7,154 +7,172 @@ import { Request, Response, NextFunction } from 'express';
 import { ValidationError } from '../utils/errors';
 
 /**
- * Sanitize string input to prevent XSS and injection attacks
+ * Detection rules, compiled once at module load.
+ *
+ * These are the SQL, XSS and path traversal patterns the middleware has always
+ * enforced, grouped by category. Building them here rather than per request
+ * means each string is tested against already-compiled expressions.
  */
-function sanitizeString(value: string): string {
-  if (typeof value !== 'string') return value;
-  
-  // Remove null bytes
-  let sanitized = value.replace(/\0/g, '');
-  
-  // Trim whitespace
-  sanitized = sanitized.trim();
-  
-  // Remove control characters except newline and tab
-  sanitized = sanitized.replace(/[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]/g, '');
-  
-  return sanitized;
-}
+const SQL_RULES = [
+  /\b(?:SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE|UNION|DECLARE)\b/i,
+  /--|;|\/\*|\*\/|xp_|sp_|'/i,
+];
+
+const XSS_RULES = [
+  /<script[^>]*>.*?<\/script>/i,
+  /<iframe[^>]*>.*?<\/iframe>/i,
+  /javascript:/i,
+  /on\w+\s*=/i, // onclick, onerror, etc.
+  /<embed[^>]*>/i,
+  /<object[^>]*>/i,
+];
+
+const PATH_RULES = [/\.\.[\/\\]/, /[\/\\]\.\./, /%2e%2e/i, /%252e%252e/i];
+
+const SQL_PATTERN = new RegExp(SQL_RULES.map((r) => r.source).join('|'), 'i');
+const XSS_PATTERN = new RegExp(XSS_RULES.map((r) => r.source).join('|'), 'i');
+const PATH_PATTERN = new RegExp(PATH_RULES.map((r) => r.source).join('|'), 'i');
 
 /**
- * Check for SQL injection patterns
+ * Every rule in a single alternation. Clean strings (the overwhelming majority)
+ * are scanned exactly once; only a hit pays for classification.
  */
-function containsSQLInjection(value: string): boolean {
-  if (typeof value !== 'string') return false;
-  
-  const sqlPatterns = [
-    /(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE|UNION|DECLARE)\b)/gi,
-    /(--|;|\/\*|\*\/|xp_|sp_)/gi,
-    /('|('')|;|--|\/\*|\*\/)/gi,
-  ];
-  
-  return sqlPatterns.some(pattern => pattern.test(value));
-}
+const THREAT_PATTERN = new RegExp(
+  [SQL_PATTERN.source, XSS_PATTERN.source, PATH_PATTERN.source].join('|'),
+  'i',
+);
+
+const CONTROL_CHARS = /[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]/;
+const CONTROL_CHARS_ALL = /[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]/g;
+const NULL_BYTES = /\0/g;
+const VALID_KEY = /^[a-zA-Z0-9_.-]+$/;
+
+/** Limits on the shape of a request payload */
+const MAX_DEPTH = 32;
+const MAX_NODES = 50_000;
+
+export type ThreatType = 'sql' | 'xss' | 'path';
+
+/** Error message prefix for each threat category, followed by the field path */
+export const THREAT_MESSAGES: Record<ThreatType, string> = {
+  sql: 'Potential SQL injection detected in',
+  xss: 'Potential XSS attack detected in',
+  path: 'Path traversal attempt detected in',
+};
 
 /**
- * Check for XSS patterns
+ * Return the first threat category a string matches, checked in the order
+ * SQL, XSS, path traversal, or null for clean input
  */
-function containsXSS(value: string): boolean {
-  if (typeof value !== 'string') return false;
-  
-  const xssPatterns = [
-    /<script[^>]*>.*?<\/script>/gi,
-    /<iframe[^>]*>.*?<\/iframe>/gi,
-    /javascript:/gi,
-    /on\w+\s*=/gi, // onclick, onerror, etc.
-    /<embed[^>]*>/gi,
-    /<object[^>]*>/gi,
-  ];
-  
-  return xssPatterns.some(pattern => pattern.test(value));
+export function detectThreat(value: string): ThreatType | null {
+  if (!THREAT_PATTERN.test(value)) return null;
+  if (SQL_PATTERN.test(value)) return 'sql';
+  if (XSS_PATTERN.test(value)) return 'xss';
+  return 'path';
 }
 
 /**
- * Check for path traversal attempts
+ * Sanitize string input to prevent XSS and injection attacks
  */
-function containsPathTraversal(value: string): boolean {
-  if (typeof value !== 'string') return false;
-  
-  const pathPatterns = [
-    /\.\.[\/\\]/g,
-    /[\/\\]\.\./g,
-    /%2e%2e/gi,
-    /%252e%252e/gi,
-  ];
-  
-  return pathPatterns.some(pattern => pattern.test(value));
+export function sanitizeString(value: string): string {
+  if (typeof value !== 'string') return value;
+
+  // Common case: nothing to strip besides surrounding whitespace
+  if (!CONTROL_CHARS.test(value)) return value.trim();
+
+  // Remove null bytes, trim, then remove control characters except newline and tab
+  return value.replace(NULL_BYTES, '').trim().replace(CONTROL_CHARS_ALL, '');
+}
+
+function containsSQLInjection(value: string): boolean {
+  return typeof value === 'string' && SQL_PATTERN.test(value);
+}
+
+function containsXSS(value: string): boolean {
+  return typeof value === 'string' && XSS_PATTERN.test(value);
+}
+
+function checkString(value: string, path: string): string {
+  const threat = detectThreat(value);
+  if (threat) {
+    throw new ValidationError(`${THREAT_MESSAGES[threat]} ${path || 'input'}`);
+  }
+  return sanitizeString(value);
+}
+
+function checkKey(key: string) {
+  // Allow alphanumeric, underscore, hyphen, and dot for nested objects;
+  // reject keys that look like path traversal
+  if (!VALID_KEY.test(key) || key.includes('..') || key.startsWith('.') || key.endsWith('.')) {
+    throw new ValidationError(`Invalid field name: ${key}`);
+  }
 }
 
 /**
- * Validate and sanitize object recursively
+ * Validate and sanitize a value in place, walking containers once.
+ * `budget` tracks how many nodes may still be visited across the whole request.
  */
-function sanitizeObject(obj: any, path: string = ''): any {
-  if (obj === null || obj === undefined) return obj;
-  
-  if (typeof obj === 'string') {
-    // Check for malicious patterns
-    if (containsSQLInjection(obj)) {
-      throw new ValidationError(`Potential SQL injection detected in ${path || 'input'}`);
-    }
-    if (containsXSS(obj)) {
-      throw new ValidationError(`Potential XSS attack detected in ${path || 'input'}`);
-    }
-    if (containsPathTraversal(obj)) {
-      throw new ValidationError(`Path traversal attempt detected in ${path || 'input'}`);
-    }
-    
-    return sanitizeString(obj);
-  }
-  
-  if (typeof obj === 'number') {
-    // Check for NaN and Infinity
-    if (!Number.isFinite(obj)) {
-      throw new ValidationError(`Invalid number value in ${path || 'input'}`);
-    }
-    return obj;
+function sanitizeValue(value: any, path: string, depth: number, budget: { nodes: number }): any {
+  if (value === null || value === undefined) return value;
+
+  if (--budget.nodes < 0) {
+    throw new ValidationError('Input contains too many fields');
   }
-  
-  if (typeof obj === 'boolean') {
-    return obj;
+
+  switch (typeof value) {
+    case 'string':
+      return checkString(value, path);
+    case 'number':
+      // Check for NaN and Infinity
+      if (!Number.isFinite(value)) {
+        throw new ValidationError(`Invalid number value in ${path || 'input'}`);
+      }
+      return value;
+    case 'object':
+      break;
+    default:
+      return value;
   }
-  
-  if (Array.isArray(obj)) {
-    return obj.map((item, index) => 
-      sanitizeObject(item, `${path}[${index}]`)
-    );
+
+  if (depth >= MAX_DEPTH) {
+    throw new ValidationError(`Input nested too deeply in ${path || 'input'}`);
   }
-  
-  if (typeof obj === 'object') {
-    const sanitized: any = {};
-    for (const [key, value] of Object.entries(obj)) {
-      // Validate key names - allow alphanumeric, underscore, hyphen, and dot for nested objects
-      // Also allow common safe characters used in JSON keys
-      if (!/^[a-zA-Z0-9_.-]+$/.test(key)) {
-        throw new ValidationError(`Invalid field name: ${key}`);
-      }
-      
-      // Additional check: prevent keys that look like path traversal
-      if (key.includes('..') || key.startsWith('.') || key.endsWith('.')) {
-        throw new ValidationError(`Invalid field name: ${key}`);
-      }
-      
-      const newPath = path ? `${path}.${key}` : key;
-      sanitized[key] = sanitizeObject(value, newPath);
+
+  if (Array.isArray(value)) {
+    for (let i = 0; i < value.length; i++) {
+      value[i] = sanitizeValue(value[i], `${path}[${i}]`, depth + 1, budget);
     }
-    return sanitized;
+    return value;
   }
-  
-  return obj;
+
+  for (const key of Object.keys(value)) {
+    checkKey(key);
+    value[key] = sanitizeValue(value[key], path ? `${path}.${key}` : key, depth + 1, budget);
+  }
+  return value;
+}
+
+function hasEntries(value: any): boolean {
+  return !!value && typeof value === 'object' && Object.keys(value).length > 0;
 }
 
 /**
- * Middleware to sanitize request body, query, and params
+ * Middleware to sanitize request body, query, and params.
+ * Requests without any input (most GETs) skip the walk entirely.
  */
 export function sanitizeInput(req: Request, res: Response, next: NextFunction) {
+  const hasBody = hasEntries(req.body);
+  const hasQuery = hasEntries(req.query);
+  const hasParams = hasEntries(req.params);
+  if (!hasBody && !hasQuery && !hasParams) return next();
+
   try {
-    // Sanitize body
-    if (req.body && typeof req.body === 'object') {
-      req.body = sanitizeObject(req.body, 'body');
-    }
-    
-    // Sanitize query parameters
-    if (req.query && typeof req.query === 'object') {
-      req.query = sanitizeObject(req.query, 'query');
-    }
-    
-    // Sanitize route parameters
-    if (req.params && typeof req.params === 'object') {
-      req.params = sanitizeObject(req.params, 'params');
-    }
-    
+    const budget = { nodes: MAX_NODES };
+
+    if (hasBody) req.body = sanitizeValue(req.body, 'body', 0, budget);
+    if (hasQuery) req.query = sanitizeValue(req.query, 'query', 0, budget);
+    if (hasParams) req.params = sanitizeValue(req.params, 'params', 0, budget);
+
     next();
   } catch (error) {
     next(error);
@@ -1,12 +1,103 @@
+import type { Attendance } from '@prisma/client';
 import { prisma } from '../services/prisma.service';
+import { cuid } from '../utils/cuid.util';
+
+// Raw statements bind timestamps as UTC instants and store them the way Prisma
+// does for TIMESTAMP(3) columns (UTC wall-clock time)
+const ts = (d: Date) => d.toISOString();
+const json = (v: unknown) => (v === undefined || v === null ? null : JSON.stringify(v));
 
 export const AttendanceRepository = {
   findByUserAndDate: (userId: string, date: Date) =>
     prisma.attendance.findUnique({ where: { userId_date: { userId, date } } }),
-  createCheckin: (data: { userId: string; date: Date; checkIn: Date; checkInLocation?: unknown; metadata?: unknown }) =>
-    prisma.attendance.create({ data: { userId: data.userId, date: data.date, checkIn: data.checkIn, checkInLocation: data.checkInLocation as any, metadata: data.metadata as any } }),
-  setCheckout: (userId: string, date: Date, checkOut: Date, checkOutLocation?: unknown) =>
-    prisma.attendance.update({ where: { userId_date: { userId, date } }, data: { checkOut, checkOutLocation: checkOutLocation as any } }),
+
+  /**
+   * Idempotent check-in in one statement, relying on @@unique([userId, date]).
+   * Inserts today's row, or fills checkIn on a row that has none; an existing
+   * check-in is left untouched and returned with `changed = false`.
+   */
+  upsertCheckin: async (data: { userId: string; date: Date; checkIn: Date; checkInMinute: number; checkInLocation?: unknown; metadata?: unknown }) => {
+    const rows = await prisma.$queryRaw<Array<Attendance & { changed: boolean }>>`
+      WITH up AS (
+        INSERT INTO "Attendance" ("id", "userId", "date", "checkIn", "checkInMinute", "checkInLocation", "metadata")
+        VALUES (
+          ${cuid()}, ${data.userId},
+          ${ts(data.date)}::timestamptz AT TIME ZONE 'UTC',
+          ${ts(data.checkIn)}::timestamptz AT TIME ZONE 'UTC',
+          ${data.checkInMinute},
+          ${json(data.checkInLocation)}::jsonb, ${json(data.metadata)}::jsonb
+        )
+        ON CONFLICT ("userId", "date") DO UPDATE
+          SET "checkIn" = EXCLUDED."checkIn",
+              "checkInMinute" = EXCLUDED."checkInMinute",
+              "checkInLocation" = EXCLUDED."checkInLocation",
+              "metadata" = EXCLUDED."metadata"
+          WHERE "Attendance"."checkIn" IS NULL
+        RETURNING *
+      )
+      SELECT *, true AS "changed" FROM up
+      UNION ALL
+      SELECT a.*, false AS "changed" FROM "Attendance" a
+      WHERE a."userId" = ${data.userId}
+        AND a."date" = ${ts(data.date)}::timestamptz AT TIME ZONE 'UTC'
+        AND NOT EXISTS (SELECT 1 FROM up)`;
+    if (rows.length) return rows[0];
+    // Lost a race with a concurrent check-in committed after our snapshot
+    const existing = await prisma.attendance.findUnique({ where: { userId_date: { userId: data.userId, date: data.date } } });
+    return existing ? { ...existing, changed: false } : null;
+  },
+
+  /**
+   * Idempotent check-out in one statement. Sets checkOut only if it is still
+   * empty (`changed` tells which); returns null when there is no row for the day.
+   */
+  checkoutOnce: async (userId: string, date: Date, checkOut: Date, checkOutLocation?: unknown) => {
+    const rows = await prisma.$queryRaw<Array<Attendance & { changed: boolean }>>`
+      UPDATE "Attendance"
+      SET "checkOut" = COALESCE("checkOut", ${ts(checkOut)}::timestamptz AT TIME ZONE 'UTC'),
+          "checkOutLocation" = CASE WHEN "checkOut" IS NULL THEN ${json(checkOutLocation)}::jsonb ELSE "checkOutLocation" END
+      WHERE "userId" = ${userId}
+        AND "date" = ${ts(date)}::timestamptz AT TIME ZONE 'UTC'
+      RETURNING *, ("checkOut" = ${ts(checkOut)}::timestamptz AT TIME ZONE 'UTC') AS "changed"`;
+    return rows[0] ?? null;
+  },
+
+  /**
+   * Users with more than `minCount` check-ins after `afterMinute` (minute of day
+   * in the company timezone) in [from, to). Grouped in the database and served
+   * by the (date, checkInMinute, userId) index.
+   */
+  lateArrivalsByUser: (from: Date, to: Date, afterMinute: number, minCount: number) =>
+    prisma.$queryRaw<Array<{ userId: string; userName: string | null; employeeCode: string | null; lateCount: number; dates: string[] }>>`
+      WITH late AS (
+        SELECT "userId",
+               COUNT(*)::int AS "lateCount",
+               array_agg(to_char("date", 'YYYY-MM-DD') ORDER BY "date") AS "dates"
+        FROM "Attendance"
+        WHERE "date" >= ${ts(from)}::timestamptz AT TIME ZONE 'UTC'
+          AND "date" < ${ts(to)}::timestamptz AT TIME ZONE 'UTC'
+          AND "checkInMinute" > ${afterMinute}
+        GROUP BY "userId"
+        HAVING COUNT(*) > ${minCount}
+      )
+      SELECT late."userId", u."name" AS "userName", p."employeeCode", late."lateCount", late."dates"
+      FROM late
+      LEFT JOIN "User" u ON u."id" = late."userId"
+      LEFT JOIN "EmployeeProfile" p ON p."userId" = late."userId"
+      ORDER BY late."lateCount" DESC, late."userId"`,
+
+  /**
+   * Recompute checkInMinute for every row, e.g. after the company timezone changes
+   */
+  recomputeCheckInMinutes: (timeZone: string) =>
+    prisma.$executeRaw`
+      UPDATE "Attendance"
+      SET "checkInMinute" = (
+        EXTRACT(HOUR FROM ("checkIn" AT TIME ZONE 'UTC') AT TIME ZONE ${timeZone}) * 60
+        + EXTRACT(MINUTE FROM ("checkIn" AT TIME ZONE 'UTC') AT TIME ZONE ${timeZone})
+      )::int
+      WHERE "checkIn" IS NOT NULL`,
+
   listByMonth: (userId: string, from: Date, to: Date) =>
     prisma.attendance.findMany({ where: { userId, date: { gte: from, lt: to } }, orderBy: { date: 'asc' } }),
   listAllByMonth: (from: Date, to: Date) =>
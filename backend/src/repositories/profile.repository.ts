@@ -1,4 +1,5 @@
 import { prisma } from '../services/prisma.service';
+import { nextEmployeeCodes } from '../utils/employee-code.util';
 
 export const ProfileRepository = {
   getByUserId: (userId: string) =>
@@ -20,23 +21,13 @@ export const ProfileRepository = {
     return { items, total, page, limit };
   },
   upsertByUserId: async (userId: string, data: { phone?: string; designation?: string; workLocation?: string; photoPublicId?: string }) => {
-    // Get user name for employee code generation if creating new profile
-    const user = await prisma.user.findUnique({ where: { id: userId }, select: { name: true } });
-    const userName = user?.name || 'Unknown User';
-    
-    const year = new Date().getFullYear().toString().slice(-2);
-    const count = await prisma.employeeProfile.count();
-    const sequence = String(count + 1).padStart(5, '0');
-    const nameParts = userName.trim().split(/\s+/);
-    let initials = '';
-    if (nameParts.length >= 2) {
-      initials = (nameParts[0][0] + nameParts[nameParts.length - 1][0]).toUpperCase();
-    } else if (nameParts.length === 1 && nameParts[0].length >= 2) {
-      initials = nameParts[0].slice(0, 2).toUpperCase();
-    } else {
-      initials = nameParts[0] ? (nameParts[0][0] + nameParts[0][0]).toUpperCase() : 'XX';
+    // Employee code only for a new profile: each one uses up a serial
+    const existing = await prisma.employeeProfile.findUnique({ where: { userId }, select: { employeeCode: true } });
+    let employeeCode = existing?.employeeCode;
+    if (!employeeCode) {
+      const user = await prisma.user.findUnique({ where: { id: userId }, select: { name: true } });
+      [employeeCode] = await nextEmployeeCodes(prisma, [user?.name || 'Unknown User']);
     }
-    const employeeCode = `OI${initials}${year}${sequence}`;
     
     return prisma.employeeProfile.upsert({
       where: { userId },
@@ -1,5 +1,6 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 import { getAuditLogs, getAnomalies, deleteUser } from '../controllers/admin.controller';
 
 export const adminRouter = Router();
@@ -7,6 +8,7 @@ export const adminRouter = Router();
 adminRouter.use(authenticate);
 adminRouter.use(authorize(['admin']));
 
-adminRouter.get('/audit', getAuditLogs);
-adminRouter.get('/anomalies', getAnomalies);
-adminRouter.delete('/users/:id', deleteUser);
+adminRouter.get('/audit', limitConcurrency('transactional'), getAuditLogs);
+// Scans attendance history
+adminRouter.get('/anomalies', limitConcurrency('analytical'), getAnomalies);
+adminRouter.delete('/users/:id', limitConcurrency('transactional'), deleteUser);
@@ -1,16 +1,23 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
-import { overview, attendance, payroll } from '../controllers/analytics.controller';
+import { conditionalGet } from '../middlewares/conditional-get.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
+import { overview, attendance, payroll, live } from '../controllers/analytics.controller';
 
 export const analyticsRouter = Router();
 
 analyticsRouter.use(authenticate);
 
+const analytical = limitConcurrency('analytical');
+
 // Overview for admin/hr/payroll
-analyticsRouter.get('/overview', authorize(['admin','hr','payroll']), overview);
+analyticsRouter.get('/overview', authorize(['admin','hr','payroll']), conditionalGet('users', 'attendance', 'leaves'), analytical, overview);
 
 // Attendance chart (admin/hr)
-analyticsRouter.get('/attendance', authorize(['admin','hr']), attendance);
+analyticsRouter.get('/attendance', authorize(['admin','hr']), conditionalGet('attendance'), analytical, attendance);
 
 // Payroll totals (admin/payroll/hr)
-analyticsRouter.get('/payroll', authorize(['admin','payroll','hr']), payroll);
+analyticsRouter.get('/payroll', authorize(['admin','payroll','hr']), conditionalGet('payroll'), analytical, payroll);
+
+// Live KPI deltas (Server-Sent Events); long-lived, so outside the analytical lane
+analyticsRouter.get('/live', authorize(['admin','hr','payroll']), live);
@@ -1,10 +1,12 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 import { checkin, checkout, list, stats, summary, listAll } from '../controllers/attendance.controller';
 
 export const attendanceRouter = Router();
 
 attendanceRouter.use(authenticate);
+attendanceRouter.use(limitConcurrency('transactional'));
 
 attendanceRouter.post('/checkin', checkin);
 attendanceRouter.post('/checkout', checkout);
@@ -1,11 +1,15 @@
 import { Router } from 'express';
 import { signup, login, refresh, logout, changePassword } from '../controllers/auth.controller';
 import { authenticate } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 
 export const authRouter = Router();
 
-authRouter.post('/signup', signup);
-authRouter.post('/login', login);
-authRouter.post('/refresh', refresh);
-authRouter.post('/logout', logout);
-authRouter.post('/change-password', authenticate, changePassword);
+// Every route here hashes or compares a password or refresh token
+const credentials = limitConcurrency('auth');
+
+authRouter.post('/signup', credentials, signup);
+authRouter.post('/login', credentials, login);
+authRouter.post('/refresh', credentials, refresh);
+authRouter.post('/logout', credentials, logout);
+authRouter.post('/change-password', authenticate, credentials, changePassword);
@@ -15,7 +15,7 @@ import { officeLocationRouter } from './office-location.routes';
 
 export const router = Router();
 
-// versioned API
+// versioned API (load-shedding lanes are applied inside each router, after authentication)
 const v1 = Router();
 
 v1.get('/health', healthHandler);
@@ -1,10 +1,12 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 import { apply, list, approve, reject, getMyBalances, cancel } from '../controllers/leaves.controller';
 
 export const leavesRouter = Router();
 
 leavesRouter.use(authenticate);
+leavesRouter.use(limitConcurrency('transactional'));
 
 // Balances (current user)
 leavesRouter.get('/balances/me', getMyBalances);
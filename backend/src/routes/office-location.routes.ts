@@ -4,6 +4,7 @@
 
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 import {
   getOfficeLocation,
   setOfficeLocation,
@@ -14,6 +15,7 @@ import {
 export const officeLocationRouter = Router();
 
 officeLocationRouter.use(authenticate);
+officeLocationRouter.use(limitConcurrency('transactional'));
 
 // All authenticated users can view office location
 officeLocationRouter.get('/', getOfficeLocation);
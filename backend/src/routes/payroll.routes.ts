@@ -1,5 +1,6 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 import { run, getById, listUserPayslips, getMyPayslips, getInputs } from '../controllers/payroll.controller';
 import { getTemplates, saveTemplates, deleteTemplate } from '../controllers/payroll.templates.controller';
 
@@ -7,7 +8,10 @@ export const payrollRouter = Router();
 
 payrollRouter.use(authenticate);
 
-payrollRouter.post('/run', authorize(['admin','payroll']), run);
+// A run computes every payslip: analytical lane, registered before the transactional one
+payrollRouter.post('/run', authorize(['admin','payroll']), limitConcurrency('analytical'), run);
+
+payrollRouter.use(limitConcurrency('transactional'));
 
 // Employee self-service
 payrollRouter.get('/payslips/me', getMyPayslips);
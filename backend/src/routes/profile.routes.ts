@@ -1,11 +1,13 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 import { requireInternalKey } from '../middlewares/internal-key.middleware';
 import { list, getMe, updateMe, getByUserId, postParsedResume } from '../controllers/profile.controller';
 
 export const profileRouter = Router();
 
 profileRouter.use(authenticate);
+profileRouter.use(limitConcurrency('transactional'));
 
 // HR/Admin/Payroll list all profiles
 profileRouter.get('/', authorize(['admin','hr','payroll']), list);
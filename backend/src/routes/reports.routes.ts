@@ -1,15 +1,21 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { conditionalGet } from '../middlewares/conditional-get.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 import * as reportsController from '../controllers/reports.controller';
 
 const reportsRouter = Router();
 
 // All routes require authentication and admin/hr role
-reportsRouter.get('/company-overview', authenticate, authorize(['admin', 'hr']), reportsController.companyOverview);
-reportsRouter.get('/department-performance', authenticate, authorize(['admin', 'hr']), reportsController.departmentPerformance);
-reportsRouter.get('/payroll-summary', authenticate, authorize(['admin', 'hr', 'payroll']), reportsController.payrollSummary);
-reportsRouter.get('/leave-utilization', authenticate, authorize(['admin', 'hr']), reportsController.leaveUtilization);
-reportsRouter.get('/attendance-analytics', authenticate, authorize(['admin', 'hr']), reportsController.attendanceAnalytics);
-reportsRouter.get('/employee-growth', authenticate, authorize(['admin', 'hr']), reportsController.employeeGrowth);
+// Conditional GET: unchanged data versions answer 304 without recomputing
+// Everything else runs in the analytical lane (shed with 503 under load)
+const analytical = limitConcurrency('analytical');
+
+reportsRouter.get('/company-overview', authenticate, authorize(['admin', 'hr']), conditionalGet('users', 'attendance', 'payroll', 'leaves'), analytical, reportsController.companyOverview);
+reportsRouter.get('/department-performance', authenticate, authorize(['admin', 'hr']), conditionalGet('users', 'attendance', 'payroll', 'leaves'), analytical, reportsController.departmentPerformance);
+reportsRouter.get('/payroll-summary', authenticate, authorize(['admin', 'hr', 'payroll']), conditionalGet('users', 'payroll'), analytical, reportsController.payrollSummary);
+reportsRouter.get('/leave-utilization', authenticate, authorize(['admin', 'hr']), conditionalGet('users', 'leaves'), analytical, reportsController.leaveUtilization);
+reportsRouter.get('/attendance-analytics', authenticate, authorize(['admin', 'hr']), conditionalGet('users', 'attendance'), analytical, reportsController.attendanceAnalytics);
+reportsRouter.get('/employee-growth', authenticate, authorize(['admin', 'hr']), conditionalGet('users'), analytical, reportsController.employeeGrowth);
 
 export default reportsRouter;
@@ -1,16 +1,19 @@
 import { Router } from 'express';
 import { getSettings, getSettingsByCategory, updateSettings } from '../controllers/settings.controller';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
 
 const settingsRouter = Router();
 
+const transactional = limitConcurrency('transactional');
+
 // Get all settings (admin only)
-settingsRouter.get('/', authenticate, authorize(['admin']), getSettings);
+settingsRouter.get('/', authenticate, authorize(['admin']), transactional, getSettings);
 
 // Get settings by category (admin only)
-settingsRouter.get('/:category', authenticate, authorize(['admin']), getSettingsByCategory);
+settingsRouter.get('/:category', authenticate, authorize(['admin']), transactional, getSettingsByCategory);
 
 // Update settings by category (admin only)
-settingsRouter.put('/:category', authenticate, authorize(['admin']), updateSettings);
+settingsRouter.put('/:category', authenticate, authorize(['admin']), transactional, updateSettings);
 
 export default settingsRouter;
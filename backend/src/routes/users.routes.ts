@@ -1,12 +1,19 @@
 import { Router } from 'express';
 import { authenticate, authorize } from '../middlewares/auth.middleware';
-import { listHandler, getByIdHandler, createHandler, updateHandler, deleteHandler } from '../controllers/users.controller';
+import { limitConcurrency } from '../middlewares/load-shed.middleware';
+import { listHandler, getByIdHandler, createHandler, updateHandler, deleteHandler, importHandler, importStatusHandler } from '../controllers/users.controller';
 
 export const usersRouter = Router();
 
 usersRouter.use(authenticate);
 
+// Bulk import streams and validates the whole file: analytical lane, registered before the transactional one
+usersRouter.post('/import', authorize(['admin','hr']), limitConcurrency('analytical'), importHandler);
+
+usersRouter.use(limitConcurrency('transactional'));
+
 usersRouter.get('/', authorize(['admin','hr']), listHandler);
+usersRouter.get('/import/:jobId', authorize(['admin','hr']), importStatusHandler);
 usersRouter.get('/:id', authorize(['admin','hr']), getByIdHandler);
 usersRouter.post('/', authorize(['admin','hr']), createHandler);
 usersRouter.put('/:id', authorize(['admin','hr']), updateHandler);
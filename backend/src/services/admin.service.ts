@@ -1,5 +1,14 @@
 import { prisma } from './prisma.service';
 import { AuditRepository } from '../repositories/audit.repository';
+import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
+import { AttendanceRepository } from '../repositories/attendance.repository';
+import { SettingsService } from './settings.service';
+import { DataVersionService } from './data-version.service';
+import { cacheGet, cacheSet } from './cache.service';
+import { parseClockTime } from '../utils/timezone.util';
+
+type AnomalyRow = { userId: string; userName: string; employeeCode: string; lateCount: number; dates: string[] };
 
 export const AdminService = {
   async getAuditLogs(requestorRole: string, page: number, limit: number, filters: { entity?: string; action?: string; userId?: string }) {
@@ -18,46 +27,35 @@ export const AdminService = {
       throw err;
     }
 
-    // Detect attendance anomalies: late check-ins (after 9:30 AM)
+    // Detect attendance anomalies: check-ins after office start + grace time,
+    // grouped per user in the database
     const now = new Date();
     const monthStart = new Date(now.getFullYear(), now.getMonth(), 1);
     const monthEnd = new Date(now.getFullYear(), now.getMonth() + 1, 1);
 
-    const lateCheckIns = await prisma.attendance.findMany({
-      where: {
-        date: { gte: monthStart, lt: monthEnd },
-        checkIn: { not: null },
-      },
-      include: { user: { include: { profile: true } } },
-    });
+    // Results stay valid until attendance or settings change
+    const cacheKey = `admin:anomalies:${monthStart.getFullYear()}-${monthStart.getMonth() + 1}`;
+    const version = DataVersionService.token(['attendance', 'settings']);
+    const cached = cacheGet<{ version: string; data: AnomalyRow[] }>(cacheKey);
+    if (cached && cached.version === version) return cached.data;
 
-    const anomalies = lateCheckIns
-      .filter((a) => {
-        if (!a.checkIn) return false;
-        const hour = a.checkIn.getHours();
-        const minute = a.checkIn.getMinutes();
-        return hour > 9 || (hour === 9 && minute > 30);
-      })
-      .map((a) => ({
-        userId: a.userId,
-        userName: (a.user as any)?.name || 'Unknown',
-        employeeCode: (a.user as any)?.profile?.employeeCode || a.userId.slice(0, 8),
-        date: a.date.toISOString().slice(0, 10),
-        checkInTime: a.checkIn?.toISOString() || '',
-        type: 'late_checkin',
-      }));
+    const attendance = await SettingsService.getByCategory('attendance');
+    const grace = Number(attendance.graceTimeMinutes);
+    const lateAfter =
+      parseClockTime(attendance.officeStartTime, 9 * 60 + 15) + (Number.isFinite(grace) ? grace : 15);
 
-    // Group by user and count
-    const byUser: Record<string, { userId: string; userName: string; employeeCode: string; lateCount: number; dates: string[] }> = {};
-    anomalies.forEach((a) => {
-      if (!byUser[a.userId]) {
-        byUser[a.userId] = { userId: a.userId, userName: a.userName, employeeCode: a.employeeCode, lateCount: 0, dates: [] };
-      }
-      byUser[a.userId].lateCount++;
-      byUser[a.userId].dates.push(a.date);
-    });
+    // Only show users with >3 late check-ins
+    const rows = await AttendanceRepository.lateArrivalsByUser(monthStart, monthEnd, lateAfter, 3);
+    const data: AnomalyRow[] = rows.map((r) => ({
+      userId: r.userId,
+      userName: r.userName || 'Unknown',
+      employeeCode: r.employeeCode || r.userId.slice(0, 8),
+      lateCount: r.lateCount,
+      dates: r.dates,
+    }));
 
-    return Object.values(byUser).filter((u) => u.lateCount > 3); // Only show users with >3 late check-ins
+    cacheSet(cacheKey, { version, data }, 300_000);
+    return data;
   },
 
   async deleteUser(requestorId: string, requestorRole: string, userId: string) {
@@ -81,6 +79,8 @@ export const AdminService = {
       entityId: userId,
       meta: { soft: true },
     });
+    AnalyticsService.invalidateEmployees();
+    LiveKpiService.publish('user.deleted', {}, ['users']);
 
     // TODO: Enqueue user_cleanup job with pg-boss (not implemented yet)
     // await jobQueue.send('user_cleanup', { userId });
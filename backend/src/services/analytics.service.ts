@@ -1,5 +1,6 @@
-import { prisma } from '../services/prisma.service';
+import { readDb } from './read-replica.service';
 import { cacheGet, cacheSet, cacheInvalidatePrefix } from './cache.service';
+import { DataVersionService } from './data-version.service';
 
 function startEndOfMonth(month?: string) {
   const now = new Date();
@@ -16,17 +17,18 @@ export const AnalyticsService = {
     const key = 'analytics:overview';
     const cached = cacheGet<any>(key);
     if (cached) return cached;
+    const db = readDb(['users', 'attendance', 'leaves']);
 
     const now = new Date();
     const today = new Date(now.getFullYear(), now.getMonth(), now.getDate());
     const { from, to } = startEndOfMonth(`${now.getFullYear()}-${String(now.getMonth() + 1).padStart(2,'0')}`);
 
     const [totalEmployees, attendanceToday, attendanceMonth, onLeaveToday, pendingLeaveRequests] = await Promise.all([
-      prisma.employeeProfile.count().catch(() => 0),
-      prisma.attendance.count({ where: { date: today, checkIn: { not: null } } }).catch(() => 0),
-      prisma.attendance.findMany({ where: { date: { gte: from, lt: to } } }).catch(() => []),
-      prisma.leaveRequest.count({ where: { status: 'APPROVED', startDate: { lte: today }, endDate: { gte: today } } }).catch(() => 0),
-      prisma.leaveRequest.count({ where: { status: 'PENDING' } }).catch(() => 0),
+      db.employeeProfile.count().catch(() => 0),
+      db.attendance.count({ where: { date: today, checkIn: { not: null } } }).catch(() => 0),
+      db.attendance.findMany({ where: { date: { gte: from, lt: to } } }).catch(() => []),
+      db.leaveRequest.count({ where: { status: 'APPROVED', startDate: { lte: today }, endDate: { gte: today } } }).catch(() => 0),
+      db.leaveRequest.count({ where: { status: 'PENDING' } }).catch(() => 0),
     ]);
 
     const presentToday = attendanceToday;
@@ -44,9 +46,10 @@ export const AnalyticsService = {
     const key = `analytics:attendance:${month}`;
     const cached = cacheGet<any>(key);
     if (cached) return cached;
+    const db = readDb(['attendance']);
     const { from, to } = startEndOfMonth(month);
-    const items = await prisma.attendance.groupBy({ by: ['date'], where: { date: { gte: from, lt: to } }, _count: true, orderBy: { date: 'asc' } }).catch(async () => {
-      const rows = await prisma.attendance.findMany({ where: { date: { gte: from, lt: to } }, orderBy: { date: 'asc' } });
+    const items = await db.attendance.groupBy({ by: ['date'], where: { date: { gte: from, lt: to } }, _count: true, orderBy: { date: 'asc' } }).catch(async () => {
+      const rows = await db.attendance.findMany({ where: { date: { gte: from, lt: to } }, orderBy: { date: 'asc' } });
       const map = new Map<string, number>();
       for (const r of rows) { const k = r.date.toISOString().slice(0,10); map.set(k, (map.get(k) || 0) + 1); }
       return Array.from(map.entries()).map(([k, v]) => ({ date: new Date(k), _count: v }));
@@ -60,6 +63,7 @@ export const AnalyticsService = {
     const key = `analytics:payroll:${periodStart.toISOString().slice(0,10)}:${periodEnd.toISOString().slice(0,10)}`;
     const cached = cacheGet<any>(key);
     if (cached) return cached;
+    const db = readDb(['payroll']);
     // If the requested period falls within a single calendar month,
     // prefer filtering by Payrun.year/month to avoid depending on createdAt timing.
     const singleMonth = periodStart.getFullYear() === periodEnd.getFullYear() && periodStart.getMonth() === periodEnd.getMonth();
@@ -67,16 +71,21 @@ export const AnalyticsService = {
     if (singleMonth) {
       const y = periodStart.getFullYear();
       const m = periodStart.getMonth() + 1; // Prisma schema stores month as 1-12
-      payslips = await prisma.payslip.findMany({ where: { payrun: { year: y, month: m } } });
+      payslips = await db.payslip.findMany({ where: { payrun: { year: y, month: m } } });
     } else {
       // Fallback for multi-month ranges
-      payslips = await prisma.payslip.findMany({ where: { payrun: { createdAt: { gte: periodStart, lte: periodEnd } } } });
+      payslips = await db.payslip.findMany({ where: { payrun: { createdAt: { gte: periodStart, lte: periodEnd } } } });
     }
     const totals = payslips.reduce((acc, p) => ({ gross: acc.gross + Number(p.gross), net: acc.net + Number(p.net) }), { gross: 0, net: 0 });
     cacheSet(key, totals, 60_000);
     return totals;
   },
 
-  invalidateAttendanceCache() { cacheInvalidatePrefix('analytics:attendance:'); },
-  invalidateOverview() { cacheInvalidatePrefix('analytics:overview'); },
+  // Cached reports (`report:`) read every domain, so each helper drops them along with its
+  // version bump; otherwise a fresh ETag could be served with a stale cached body
+  invalidateAttendanceCache() { cacheInvalidatePrefix('analytics:attendance:'); cacheInvalidatePrefix('report:'); DataVersionService.bump('attendance'); },
+  invalidateOverview() { cacheInvalidatePrefix('analytics:overview'); cacheInvalidatePrefix('report:'); },
+  invalidateLeaves() { cacheInvalidatePrefix('analytics:overview'); cacheInvalidatePrefix('report:'); DataVersionService.bump('leaves'); },
+  invalidatePayroll() { cacheInvalidatePrefix('analytics:payroll:'); cacheInvalidatePrefix('report:'); DataVersionService.bump('payroll'); },
+  invalidateEmployees() { cacheInvalidatePrefix('analytics:overview'); cacheInvalidatePrefix('report:'); DataVersionService.bump('users'); },
 };
@@ -1,8 +1,12 @@
+import type { Attendance } from '@prisma/client';
 import { AttendanceRepository } from '../repositories/attendance.repository';
 import { MlService } from './ml.service';
 import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
 import { OfficeLocationService } from './office-location.service';
 import { validateAttendanceLocation } from './geolocation.service';
+import { SettingsService } from './settings.service';
+import { minuteOfDayInTimeZone } from '../utils/timezone.util';
 
 function startOfDay(date: Date) {
   const d = new Date(date);
@@ -26,16 +30,22 @@ function startEndOfMonth(month?: string) {
 export const AttendanceService = {
   async checkin(userId: string, method: 'manual'|'face'|'mobile', publicId?: string, location?: { lat: number; lng: number; address?: string }) {
     const today = startOfDay(new Date());
-    const existing = await AttendanceRepository.findByUserAndDate(userId, today);
-    if (existing?.checkIn) {
+    const alreadyCheckedIn = (record: Attendance) =>
       // Idempotent: return existing record instead of throwing
-      return { record: existing, faceVerified: undefined as boolean | undefined, score: undefined as number | undefined, reason: undefined as string | undefined };
+      ({ record, faceVerified: undefined as boolean | undefined, score: undefined as number | undefined, reason: undefined as string | undefined });
+
+    // Face verification is expensive; don't run it for a repeat check-in
+    if (method === 'face') {
+      const existing = await AttendanceRepository.findByUserAndDate(userId, today);
+      if (existing?.checkIn) return alreadyCheckedIn(existing);
     }
 
-    // Validate location if office location is configured
+    // Validate location if office location is configured (geofence is cached in memory)
     const officeLocation = await OfficeLocationService.get();
     const locationValidation = validateAttendanceLocation(location, officeLocation);
     if (!locationValidation.valid) {
+      const existing = await AttendanceRepository.findByUserAndDate(userId, today);
+      if (existing?.checkIn) return alreadyCheckedIn(existing);
       const err: any = new Error(locationValidation.error || 'Location validation failed');
       err.status = 403;
       throw err;
@@ -61,39 +71,57 @@ export const AttendanceService = {
       }
     }
 
+    // Single statement: insert today's row or return the existing check-in
     const checkIn = new Date();
-    const record = await AttendanceRepository.createCheckin({ 
+    const { timezone } = await SettingsService.getByCategory('company');
+    const result = await AttendanceRepository.upsertCheckin({ 
       userId, 
       date: today, 
       checkIn, 
+      checkInMinute: minuteOfDayInTimeZone(checkIn, timezone),
       checkInLocation: location,
       metadata 
     });
+    if (!result) {
+      const err: any = new Error('Check-in conflicted with a concurrent update, please retry'); err.status = 409; throw err;
+    }
+    const { changed, ...record } = result;
+    if (!changed) return alreadyCheckedIn(record);
+
+    AnalyticsService.invalidateAttendanceCache();
+    AnalyticsService.invalidateOverview();
+    LiveKpiService.publish('attendance.checkin', { presentToday: 1 }, ['attendance']);
     return { record, faceVerified, score, reason, distance: locationValidation.distance };
   },
 
   async checkout(userId: string, location?: { lat: number; lng: number; address?: string }) {
     const today = startOfDay(new Date());
-    const existing = await AttendanceRepository.findByUserAndDate(userId, today);
-    if (!existing) {
-      const err: any = new Error('No check-in found for today'); err.status = 400; throw err;
-    }
-    if (existing.checkOut) {
-      // Idempotent: return existing record instead of throwing error
-      return existing;
-    }
 
-    // Validate location if office location is configured
+    // Validate location if office location is configured (geofence is cached in memory)
     const officeLocation = await OfficeLocationService.get();
     const locationValidation = validateAttendanceLocation(location, officeLocation);
     if (!locationValidation.valid) {
+      const existing = await AttendanceRepository.findByUserAndDate(userId, today);
+      if (!existing) {
+        const err: any = new Error('No check-in found for today'); err.status = 400; throw err;
+      }
+      // Idempotent: return existing record instead of throwing error
+      if (existing.checkOut) return existing;
       const err: any = new Error(locationValidation.error || 'Location validation failed');
       err.status = 403;
       throw err;
     }
 
-    const checkOut = new Date();
-    const record = await AttendanceRepository.setCheckout(userId, today, checkOut, location);
+    // Single statement: sets checkOut only if it is still empty
+    const result = await AttendanceRepository.checkoutOnce(userId, today, new Date(), location);
+    if (!result) {
+      const err: any = new Error('No check-in found for today'); err.status = 400; throw err;
+    }
+    const { changed, ...record } = result;
+    if (changed) {
+      AnalyticsService.invalidateAttendanceCache();
+      LiveKpiService.publish('attendance.checkout', {}, ['attendance']);
+    }
     return record;
   },
 
@@ -4,6 +4,9 @@ import { prisma } from './prisma.service';
 import { config } from '../config';
 import { signAccessToken } from './jwt.service';
 import { SessionRepository } from '../repositories/session.repository';
+import { nextEmployeeCodes } from '../utils/employee-code.util';
+import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
 import { ConflictError, UnauthorizedError, NotFoundError, AppError } from '../utils/errors';
 
 // Simple in-memory rate limiter for dev (key: email)
@@ -43,23 +46,13 @@ export async function signup(email: string, password: string, fullName: string)
     const created = await tx.user.create({ data: { email, name: fullName, passwordHash, roleId: role.id } });
     
     // Generate employee code based on name
-    const year = new Date().getFullYear().toString().slice(-2);
-    const count = await tx.employeeProfile.count();
-    const sequence = String(count + 1).padStart(5, '0');
-    const nameParts = fullName.trim().split(/\s+/);
-    let initials = '';
-    if (nameParts.length >= 2) {
-      initials = (nameParts[0][0] + nameParts[nameParts.length - 1][0]).toUpperCase();
-    } else if (nameParts.length === 1 && nameParts[0].length >= 2) {
-      initials = nameParts[0].slice(0, 2).toUpperCase();
-    } else {
-      initials = nameParts[0] ? (nameParts[0][0] + nameParts[0][0]).toUpperCase() : 'XX';
-    }
-    const employeeCode = `OI${initials}${year}${sequence}`;
+    const [employeeCode] = await nextEmployeeCodes(tx, [fullName]);
     
     await tx.employeeProfile.create({ data: { userId: created.id, employeeCode } });
     return created;
   });
+  AnalyticsService.invalidateEmployees();
+  LiveKpiService.publish('user.signup', {}, ['users']);
 
   const accessToken = signAccessToken({ sub: user.id, role: 'employee' }, config.jwt.accessTtl);
   return { user, accessToken };
@@ -0,0 +1,59 @@
+import { randomBytes } from 'crypto';
+
+/**
+ * Monotonic per-domain data version counters.
+ *
+ * Every write that can change a report bumps the counter for its domain
+ * (through the AnalyticsService.invalidate* helpers). Read endpoints derive
+ * their ETag from the counters they depend on, so a poll that arrives after
+ * no relevant write can be answered with 304 without recomputing anything.
+ *
+ * The counters live in this process. Writers also publish the domain through
+ * LiveKpiService, and every other instance bumps its own counter when the
+ * event arrives (or all of them after its listener reconnects).
+ */
+export type DataDomain = 'attendance' | 'leaves' | 'payroll' | 'users' | 'settings';
+
+const versions: Record<DataDomain, number> = {
+  attendance: 0,
+  leaves: 0,
+  payroll: 0,
+  users: 0,
+  settings: 0,
+};
+
+// Date.now() of each domain's last bump (0: not since boot)
+const changedAt: Record<DataDomain, number> = {
+  attendance: 0,
+  leaves: 0,
+  payroll: 0,
+  users: 0,
+  settings: 0,
+};
+
+// Distinguishes this process so tags issued before a restart never match
+const bootId = randomBytes(4).toString('hex');
+
+export const DataVersionService = {
+  bump(...domains: DataDomain[]) {
+    const now = Date.now();
+    for (const d of domains) {
+      versions[d]++;
+      changedAt[d] = now;
+    }
+  },
+
+  /** When any of the domains last changed (0 if none has since boot) */
+  lastChange(domains: DataDomain[]) {
+    return Math.max(0, ...domains.map((d) => changedAt[d]));
+  },
+
+  get(domain: DataDomain) {
+    return versions[domain];
+  },
+
+  /** Compact token for a set of domains, e.g. "3f9a1c02:4.0.12" */
+  token(domains: DataDomain[]) {
+    return `${bootId}:${domains.map((d) => versions[d]).join('.')}`;
+  },
+};
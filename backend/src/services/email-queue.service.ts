@@ -0,0 +1,156 @@
+import * as bcrypt from 'bcrypt';
+import { config } from '../config';
+import { prisma } from './prisma.service';
+import { generateMemorablePassword } from '../utils/password-generator';
+import { ensureQueue } from '../utils/boss-queue.util';
+import { employeeCredentialsEmail, isPermanentFailure, sendEmail, SendEmailParams } from './mailer.service';
+
+// pg-boss 10 queue names may not contain ':'
+export const EMAIL_QUEUE = 'email-send';
+export const EMAIL_DEAD_LETTER_QUEUE = 'email-dead-letter';
+
+/**
+ * A queued message: a template and the ids it is rendered from. Bodies are
+ * rendered at send time so no message content (passwords, personal data) is
+ * stored in the job tables.
+ */
+export type EmailJob = { template: 'employee-credentials'; userId: string };
+
+// Use a broad type here to avoid tight coupling to pg-boss typings
+let boss: any | null = null;
+
+/**
+ * Issue the first password of a new account and build its credentials email.
+ * The password is generated here, at send time, so it is never stored in a
+ * job; a retry issues a fresh one in place of the undelivered one.
+ */
+async function renderCredentials(userId: string): Promise<SendEmailParams | null> {
+  const user = await prisma.user.findUnique({
+    where: { id: userId },
+    include: { role: true, profile: true, sessions: { select: { id: true }, take: 1 } },
+  });
+  // Deleted or deactivated since it was queued, or already signed in: nothing to send
+  if (!user || !user.isActive || user.sessions.length) return null;
+
+  const password = generateMemorablePassword();
+  const passwordHash = await bcrypt.hash(password, config.bcryptRounds);
+  // A password set in the meantime (e.g. by an admin) wins
+  const { count } = await prisma.user.updateMany({
+    where: { id: user.id, passwordHash: user.passwordHash },
+    data: { passwordHash },
+  });
+  if (!count) return null;
+
+  return employeeCredentialsEmail({
+    to: user.email,
+    name: user.name,
+    email: user.email,
+    password,
+    role: user.role.name,
+    department: user.profile?.department ?? undefined,
+  });
+}
+
+async function render(job: EmailJob): Promise<SendEmailParams | null> {
+  switch (job.template) {
+    case 'employee-credentials':
+      return renderCredentials(job.userId);
+    default:
+      console.error('Unknown email template:', (job as EmailJob).template);
+      return null;
+  }
+}
+
+async function deliver(job: EmailJob) {
+  const params = await render(job);
+  if (params) await sendEmail(params);
+}
+
+/**
+ * Outgoing mail goes through pg-boss so request handlers never wait on SMTP.
+ *
+ * Transient failures (connection errors, 4xx replies) are retried by pg-boss
+ * with exponential backoff; a message that exhausts its retries, or that the
+ * server rejects outright with a 5xx reply, lands in EMAIL_DEAD_LETTER_QUEUE
+ * with the last error attached. Rate limiting and connection reuse live in the
+ * pooled transport in mailer.service.
+ */
+export const EmailQueueService = {
+  /**
+   * Create the queues on a started pg-boss instance and, unless `work` is
+   * false, start `config.email.workers` handlers draining them.
+   */
+  async attach(instance: any, options: { work?: boolean } = {}) {
+    await ensureQueue(instance, EMAIL_DEAD_LETTER_QUEUE, {});
+    await ensureQueue(instance, EMAIL_QUEUE, {
+      retryLimit: config.email.retryLimit,
+      retryDelay: config.email.retryDelaySeconds,
+      retryBackoff: true,
+      expireInSeconds: 120,
+      deadLetter: EMAIL_DEAD_LETTER_QUEUE,
+    });
+    boss = instance;
+
+    if (options.work === false) return;
+    // pg-boss 10 runs one job at a time per work() call
+    for (let i = 0; i < config.email.workers; i++) {
+      await instance.work(EMAIL_QUEUE, { pollingIntervalSeconds: 1 }, (jobs: any[]) => EmailQueueService.handle(jobs));
+    }
+  },
+
+  detach() {
+    boss = null;
+  },
+
+  /**
+   * Queue a message and return its job id. Without a running queue (scripts,
+   * tests) the message is sent in the background instead; either way the
+   * caller does not wait for delivery.
+   */
+  async enqueue(job: EmailJob, options: { singletonKey?: string } = {}): Promise<string | null> {
+    if (!boss) {
+      deliver(job).catch((e) => console.error('Failed to send email:', e));
+      return null;
+    }
+    return boss.send(EMAIL_QUEUE, job, options.singletonKey ? { singletonKey: options.singletonKey } : {});
+  },
+
+  /**
+   * Queue many messages with one insert (bulk onboarding)
+   */
+  async enqueueMany(messages: Array<{ job: EmailJob; singletonKey?: string }>) {
+    if (!messages.length) return;
+    if (!boss) {
+      messages.forEach(({ job }) => deliver(job).catch((e) => console.error('Failed to send email:', e)));
+      return;
+    }
+    await boss.insert(EMAIL_QUEUE, messages.map(({ job, singletonKey }) => ({ data: job, singletonKey })));
+  },
+
+  /**
+   * Worker handler: renders each message and sends it. Throwing hands the job
+   * back to pg-boss for a retry; permanent rejections are dead-lettered right
+   * away instead, with the template reference and error but no message body.
+   */
+  async handle(jobs: Array<{ id: string; data: EmailJob }>) {
+    for (const job of jobs) {
+      try {
+        await deliver(job.data);
+      } catch (error: any) {
+        if (!isPermanentFailure(error) || !boss) throw error;
+        await boss.send(EMAIL_DEAD_LETTER_QUEUE, {
+          template: job.data.template,
+          userId: job.data.userId,
+          jobId: job.id,
+          error: { message: error.message, responseCode: error.responseCode, response: error.response },
+        });
+      }
+    }
+  },
+
+  async status() {
+    if (!boss) return { running: false, queued: 0, deadLettered: 0 };
+    const [queued, deadLettered] = await Promise.all([boss.getQueueSize(EMAIL_QUEUE), boss.getQueueSize(EMAIL_DEAD_LETTER_QUEUE)]);
+    return { running: true, queued, deadLettered };
+  },
+};
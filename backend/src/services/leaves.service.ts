@@ -2,6 +2,8 @@ import { prisma } from '../services/prisma.service';
 import { LeavesRepository } from '../repositories/leaves.repository';
 import { AuditService } from './audit.service';
 import { SettingsService } from './settings.service';
+import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
 
 function daysBetweenInclusive(start: Date, end: Date) {
   const ms = end.getTime() - start.getTime();
@@ -35,6 +37,13 @@ async function ensureLeaveBalancesInitialized(userId: string) {
   });
 }
 
+// Same notion of "on leave today" as AnalyticsService.overview
+function coversToday(leave: { startDate: Date; endDate: Date }) {
+  const now = new Date();
+  const today = new Date(now.getFullYear(), now.getMonth(), now.getDate());
+  return leave.startDate <= today && leave.endDate >= today;
+}
+
 export const LeavesService = {
   async getBalances(userId: string) {
     await ensureLeaveBalancesInitialized(userId);
@@ -87,6 +96,8 @@ export const LeavesService = {
     await AuditService.create({ userId: data.userId, action: 'LEAVE_APPLY', entity: 'LeaveRequest', entityId: created.id, ip: data.ip, userAgent: data.userAgent, meta: { days } });
     // store days in metadata early for visibility
     await prisma.leaveRequest.update({ where: { id: created.id }, data: { metadata: { days } } });
+    AnalyticsService.invalidateLeaves();
+    LiveKpiService.publish('leave.applied', { pendingLeaveRequests: 1 }, ['leaves']);
 
     return await LeavesRepository.findById(created.id);
   },
@@ -134,6 +145,8 @@ export const LeavesService = {
 
     const updated = await LeavesRepository.approve(id, approver.id);
     await AuditService.create({ userId: approver.id, action: 'LEAVE_APPROVE', entity: 'LeaveRequest', entityId: id, ip, userAgent, meta: { days } });
+    AnalyticsService.invalidateLeaves();
+    LiveKpiService.publish('leave.approved', { pendingLeaveRequests: -1, ...(coversToday(leave) ? { onLeaveToday: 1 } : {}) }, ['leaves']);
     return updated;
   },
 
@@ -145,6 +158,8 @@ export const LeavesService = {
 
     const updated = await LeavesRepository.reject(id, approver.id, reason);
     await AuditService.create({ userId: approver.id, action: 'LEAVE_REJECT', entity: 'LeaveRequest', entityId: id, ip, userAgent, meta: { reason } });
+    AnalyticsService.invalidateLeaves();
+    LiveKpiService.publish('leave.rejected', { pendingLeaveRequests: -1 }, ['leaves']);
     return updated;
   },
 
@@ -159,6 +174,8 @@ export const LeavesService = {
 
     const updated = await LeavesRepository.cancel(id);
     await AuditService.create({ userId: actor.id, action: 'LEAVE_CANCEL', entity: 'LeaveRequest', entityId: id, ip, userAgent });
+    AnalyticsService.invalidateLeaves();
+    LiveKpiService.publish('leave.cancelled', { pendingLeaveRequests: -1 }, ['leaves']);
     return updated;
   },
 };
@@ -0,0 +1,178 @@
+import { randomUUID } from 'crypto';
+import { Client } from 'pg';
+import { config } from '../config';
+import { prisma } from './prisma.service';
+import { logger } from './logger.service';
+import { AnalyticsService } from './analytics.service';
+import { cacheInvalidatePrefix } from './cache.service';
+import { DataDomain, DataVersionService } from './data-version.service';
+
+/**
+ * Live KPI deltas over Postgres LISTEN/NOTIFY.
+ *
+ * Writers publish small deltas (e.g. presentToday +1) with pg_notify; every API
+ * instance LISTENs on one dedicated connection and fans events out to its
+ * in-process subscribers (the SSE stream). Going through Postgres keeps all
+ * instances on the same event sequence, and lets instances that did not make
+ * the write drop their cached analytics for the affected domains.
+ */
+
+export type KpiName = 'presentToday' | 'onLeaveToday' | 'pendingLeaveRequests';
+
+export interface KpiEvent {
+  id: string;
+  /** What caused the change, e.g. 'attendance.checkin' */
+  source: string;
+  deltas: Partial<Record<KpiName, number>>;
+  /** Data domains whose reports changed */
+  domains: DataDomain[];
+  /** Publishing instance */
+  origin: string;
+  /** Epoch ms at publish time */
+  at: number;
+}
+
+export type KpiListener = (event: KpiEvent | { resync: true }) => void;
+
+const CHANNEL = 'kpi_events';
+const MAX_RETRY_MS = 30_000;
+
+const instanceId = randomUUID();
+const listeners = new Set<KpiListener>();
+
+let client: any = null;
+let connecting: Promise<void> | null = null;
+let retryMs = 1000;
+let retryTimer: NodeJS.Timeout | null = null;
+let stopped = false;
+let wasConnected = false;
+
+// Caches to drop when another instance reports a write
+const remoteInvalidation: Partial<Record<DataDomain, () => void>> = {
+  attendance: () => {
+    AnalyticsService.invalidateAttendanceCache();
+    AnalyticsService.invalidateOverview();
+  },
+  leaves: () => AnalyticsService.invalidateLeaves(),
+  payroll: () => AnalyticsService.invalidatePayroll(),
+  users: () => AnalyticsService.invalidateEmployees(),
+  settings: () => {
+    cacheInvalidatePrefix('settings:');
+    DataVersionService.bump('settings');
+  },
+};
+
+function dispatch(event: KpiEvent | { resync: true }) {
+  for (const listener of listeners) {
+    try {
+      listener(event);
+    } catch (e) {
+      logger.warn(`Live KPI listener failed: ${(e as Error).message}`);
+    }
+  }
+}
+
+function onNotification(msg: { channel: string; payload?: string }) {
+  if (msg.channel !== CHANNEL || !msg.payload) return;
+  let event: KpiEvent;
+  try {
+    event = JSON.parse(msg.payload);
+  } catch {
+    return;
+  }
+  if (event.origin !== instanceId) {
+    event.domains.forEach((d) => remoteInvalidation[d]?.());
+  }
+  dispatch(event);
+}
+
+// Close a connection we no longer use without reacting to its shutdown events
+function discard(c: any) {
+  c.removeAllListeners();
+  c.on('error', () => undefined);
+  c.end().catch(() => undefined);
+}
+
+function scheduleReconnect(failed: any) {
+  if (client === failed) client = null;
+  discard(failed);
+  if (stopped || retryTimer) return;
+  retryTimer = setTimeout(() => {
+    retryTimer = null;
+    connect().catch(() => undefined);
+  }, retryMs);
+  retryMs = Math.min(retryMs * 2, MAX_RETRY_MS);
+}
+
+async function connect() {
+  if (client || stopped) return;
+  if (connecting) return connecting;
+  connecting = (async () => {
+    const c = new Client({ connectionString: config.dbUrl });
+    c.on('notification', onNotification);
+    c.on('error', (err: Error) => {
+      logger.warn(`Live KPI listener connection error: ${err.message}`);
+      scheduleReconnect(c);
+    });
+    c.on('end', () => scheduleReconnect(c));
+    try {
+      await c.connect();
+      await c.query(`LISTEN ${CHANNEL}`);
+      client = c;
+      retryMs = 1000;
+      // Events published while disconnected were missed: drop every cache
+      // another instance may have invalidated and make clients reload
+      if (wasConnected) {
+        Object.values(remoteInvalidation).forEach((invalidate) => invalidate());
+        dispatch({ resync: true });
+      }
+      wasConnected = true;
+    } catch (err) {
+      logger.warn(`Live KPI listener failed to connect: ${(err as Error).message}`);
+      scheduleReconnect(c);
+    }
+  })().finally(() => {
+    connecting = null;
+  });
+  return connecting;
+}
+
+export const LiveKpiService = {
+  /** Open the LISTEN connection; safe to call repeatedly */
+  start() {
+    stopped = false;
+    return connect();
+  },
+
+  stop() {
+    stopped = true;
+    if (retryTimer) clearTimeout(retryTimer);
+    retryTimer = null;
+    const c = client;
+    client = null;
+    if (c) discard(c);
+  },
+
+  subscribe(listener: KpiListener) {
+    listeners.add(listener);
+    LiveKpiService.start().catch(() => undefined);
+    return () => {
+      listeners.delete(listener);
+    };
+  },
+
+  subscriberCount() {
+    return listeners.size;
+  },
+
+  /**
+   * Broadcast a change to every instance. Fire-and-forget: a lost event only
+   * costs freshness, never the write that caused it.
+   */
+  publish(source: string, deltas: KpiEvent['deltas'], domains: DataDomain[]) {
+    const event: KpiEvent = { id: randomUUID(), source, deltas, domains, origin: instanceId, at: Date.now() };
+    prisma.$executeRaw`SELECT pg_notify(${CHANNEL}, ${JSON.stringify(event)})`.catch((err: Error) => {
+      logger.warn(`Live KPI publish failed: ${err.message}`);
+    });
+  },
+};
@@ -0,0 +1,172 @@
+import { performance } from 'perf_hooks';
+import { config } from '../config';
+
+export interface LimiterOptions {
+  initialLimit: number;
+  minLimit: number;
+  maxLimit: number;
+  // Short-term latency may exceed the long-term baseline by this factor before the limit shrinks
+  tolerance?: number;
+  // Share of each new estimate blended into the limit
+  smoothing?: number;
+  // Higher-priority lane: while it is congested this one only admits minLimit
+  yieldTo?: AdaptiveLimiter;
+}
+
+const SHORT_ALPHA = 0.2;
+const LONG_ALPHA = 0.02;
+// Samples before the latency baseline is trusted for congestion decisions
+const WARMUP_SAMPLES = 20;
+
+/**
+ * Gradient concurrency limiter.
+ *
+ * Tracks a short (recent) and long (baseline) moving average of request
+ * latency. While recent latency stays within `tolerance` of the baseline the
+ * limit grows by about sqrt(limit) per sample; when it rises above, the limit
+ * is scaled down by baseline/recent (at most halved per sample). Failed
+ * requests shrink it by 10%. Requests over the limit are rejected instead of
+ * queued, so an overloaded lane sheds load in constant time.
+ */
+export class AdaptiveLimiter {
+  private limit: number;
+  private inflight = 0;
+  private shortRtt = 0;
+  private longRtt = 0;
+  private samples = 0;
+  private accepted = 0;
+  private rejected = 0;
+  private readonly tolerance: number;
+  private readonly smoothing: number;
+
+  constructor(readonly name: string, private readonly options: LimiterOptions) {
+    this.limit = options.initialLimit;
+    this.tolerance = options.tolerance ?? 1.5;
+    this.smoothing = options.smoothing ?? 0.2;
+  }
+
+  /** Busy and slower than its baseline (an idle lane with one slow request is not congested) */
+  get congested() {
+    return (
+      this.samples >= WARMUP_SAMPLES &&
+      this.inflight >= Math.max(1, this.options.minLimit / 4) &&
+      this.shortRtt > this.longRtt * this.tolerance
+    );
+  }
+
+  /** Current admission limit, accounting for a congested higher-priority lane */
+  get effectiveLimit() {
+    if (this.options.yieldTo?.congested) return this.options.minLimit;
+    return Math.floor(this.limit);
+  }
+
+  /**
+   * Take a slot. Returns a release callback (pass `true` when the request
+   * failed server-side), or null when the lane is full.
+   */
+  tryAcquire(): ((failed?: boolean) => void) | null {
+    if (this.inflight >= this.effectiveLimit) {
+      this.rejected++;
+      return null;
+    }
+    this.inflight++;
+    this.accepted++;
+    const started = performance.now();
+    const inflightAtStart = this.inflight;
+    let released = false;
+    return (failed = false) => {
+      if (released) return;
+      released = true;
+      this.inflight--;
+      this.sample(performance.now() - started, inflightAtStart, failed);
+    };
+  }
+
+  /** Feed one completed request into the estimate */
+  sample(rttMs: number, inflight: number, failed = false) {
+    this.samples++;
+    if (this.samples === 1) {
+      this.shortRtt = rttMs;
+      this.longRtt = rttMs;
+    } else {
+      this.shortRtt += (rttMs - this.shortRtt) * SHORT_ALPHA;
+      this.longRtt += (rttMs - this.longRtt) * LONG_ALPHA;
+      // Let the baseline catch up once a slow period is over
+      if (this.longRtt > this.shortRtt * 2) this.longRtt *= 0.95;
+    }
+
+    let estimate: number;
+    if (failed) {
+      estimate = this.limit * 0.9;
+    } else if (inflight < this.limit / 2) {
+      // Lightly used: latency says nothing about where the limit should be
+      return;
+    } else {
+      const gradient = Math.max(0.5, Math.min(1, (this.tolerance * this.longRtt) / this.shortRtt));
+      estimate = this.limit * gradient + Math.sqrt(this.limit);
+    }
+    const next = this.limit * (1 - this.smoothing) + estimate * this.smoothing;
+    this.limit = Math.max(this.options.minLimit, Math.min(this.options.maxLimit, next));
+  }
+
+  /** Seconds a shed client should wait: about one recent request duration */
+  retryAfterSeconds() {
+    return Math.max(1, Math.ceil(this.shortRtt / 1000));
+  }
+
+  status() {
+    return {
+      limit: this.effectiveLimit,
+      inflight: this.inflight,
+      recentLatencyMs: Math.round(this.shortRtt),
+      baselineLatencyMs: Math.round(this.longRtt),
+      congested: this.congested,
+      accepted: this.accepted,
+      rejected: this.rejected,
+    };
+  }
+}
+
+const transactional = new AdaptiveLimiter('transactional', {
+  initialLimit: Math.min(64, config.loadShedding.transactionalMax),
+  minLimit: Math.min(16, config.loadShedding.transactionalMax),
+  maxLimit: config.loadShedding.transactionalMax,
+});
+
+// Reports, analytics and bulk jobs (payroll runs, imports) give way to everyday traffic
+const analytical = new AdaptiveLimiter('analytical', {
+  initialLimit: config.loadShedding.analyticalMax,
+  minLimit: 1,
+  maxLimit: config.loadShedding.analyticalMax,
+  yieldTo: transactional,
+});
+
+// Password hashing (login, signup, token refresh): CPU-bound and reachable
+// without a token, so a credential flood cannot take transactional slots
+const auth = new AdaptiveLimiter('auth', {
+  initialLimit: Math.min(16, config.loadShedding.authMax),
+  minLimit: Math.min(4, config.loadShedding.authMax),
+  maxLimit: config.loadShedding.authMax,
+});
+
+export type Lane = 'transactional' | 'analytical' | 'auth';
+
+/**
+ * Priority lanes for API routes: transactional (attendance, leaves, profile,
+ * payslips, user and settings admin), analytical (reports, analytics,
+ * anomalies, payroll runs, bulk imports) and auth (credential endpoints).
+ * Each adapts its own concurrency limit to observed latency; analytical work
+ * is held to one request at a time while the transactional lane is congested.
+ */
+export const LoadSheddingService = {
+  lanes: { transactional, analytical, auth } as Record<Lane, AdaptiveLimiter>,
+
+  status() {
+    return {
+      enabled: config.loadShedding.enabled,
+      transactional: transactional.status(),
+      analytical: analytical.status(),
+      auth: auth.status(),
+    };
+  },
+};
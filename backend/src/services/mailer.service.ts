@@ -1,4 +1,5 @@
 import nodemailer from 'nodemailer';
+import { config } from '../config';
 
 export interface SendEmailParams {
   to: string;
@@ -7,32 +8,58 @@ export interface SendEmailParams {
   text?: string;
 }
 
-// Create transporter (reuse connection)
+// One pooled transport per process: connections are reused across messages and
+// nodemailer spaces sends to stay under the provider's rate limit.
 let transporter: nodemailer.Transporter | null = null;
 
 function getTransporter() {
   if (transporter) return transporter;
 
-  // Check if email is configured
-  if (!process.env.EMAIL_HOST || !process.env.EMAIL_USER || !process.env.EMAIL_PASSWORD) {
-    console.warn('⚠️  Email not configured. Set EMAIL_HOST, EMAIL_USER, and EMAIL_PASSWORD in .env');
+  // Check if email is configured (a local SMTP stand-in needs no credentials)
+  if (!config.email.host) {
+    console.warn('⚠️  Email not configured. Set EMAIL_HOST (and EMAIL_USER/EMAIL_PASSWORD if the server needs auth) in .env');
     return null;
   }
 
   transporter = nodemailer.createTransport({
-    host: process.env.EMAIL_HOST,
-    port: parseInt(process.env.EMAIL_PORT || '587'),
-    secure: process.env.EMAIL_PORT === '465', // true for 465, false for other ports
-    auth: {
-      user: process.env.EMAIL_USER,
-      pass: process.env.EMAIL_PASSWORD,
-    },
+    pool: true,
+    maxConnections: config.email.poolSize,
+    rateDelta: 1000,
+    rateLimit: config.email.ratePerSecond,
+    host: config.email.host,
+    port: config.email.port,
+    secure: config.email.port === 465, // true for 465, false for other ports
+    auth: config.email.user ? { user: config.email.user, pass: config.email.password } : undefined,
   });
 
   console.log('✅ Email transporter configured');
   return transporter;
 }
 
+/**
+ * Close pooled SMTP connections; the next send opens a fresh transport
+ */
+export function closeMailer() {
+  if (transporter) {
+    transporter.close();
+    transporter = null;
+  }
+}
+
+/**
+ * Whether retrying cannot help: the server rejected the message or a recipient
+ * with a 5xx reply. Authentication failures are configuration problems and
+ * stay retryable so mail flows again once credentials are fixed.
+ */
+export function isPermanentFailure(error: any) {
+  if (!error || error.code === 'EAUTH') return false;
+  return typeof error.responseCode === 'number' && error.responseCode >= 500 && error.responseCode < 600;
+}
+
+/**
+ * Deliver a message now. Callers outside the email queue worker should use
+ * EmailQueueService.enqueue instead of waiting on SMTP.
+ */
 export async function sendEmail(params: SendEmailParams) {
   const transport = getTransporter();
 
@@ -47,7 +74,7 @@ export async function sendEmail(params: SendEmailParams) {
 
   try {
     const info = await transport.sendMail({
-      from: process.env.EMAIL_FROM || `"WorkZen HRMS" <${process.env.EMAIL_USER}>`,
+      from: config.email.from || `"WorkZen HRMS" <${config.email.user || 'noreply@workzen.com'}>`,
       to: params.to,
       subject: params.subject,
       text: params.text,
@@ -63,16 +90,16 @@ export async function sendEmail(params: SendEmailParams) {
 }
 
 /**
- * Send employee credentials email
+ * Employee credentials email
  */
-export async function sendEmployeeCredentials(data: {
+export function employeeCredentialsEmail(data: {
   to: string;
   name: string;
   email: string;
   password: string;
   role: string;
   department?: string;
-}) {
+}): SendEmailParams {
   const subject = 'Welcome to WorkZen HRMS - Your Account Credentials';
   
   const html = `
@@ -170,10 +197,10 @@ Best regards,
 WorkZen HRMS Team
   `;
   
-  await sendEmail({
+  return {
     to: data.to,
     subject,
     html,
     text,
-  });
+  };
 }
@@ -4,9 +4,13 @@
  */
 
 import { prisma } from '../lib/prisma';
+import { cacheGet, cacheSet, cacheInvalidate } from './cache.service';
 
 const OFFICE_LOCATION_KEY = 'office_location';
 const OFFICE_LOCATION_CATEGORY = 'attendance';
+const CACHE_KEY = 'office-location';
+// Bounds staleness on other API instances; this instance invalidates on write
+const CACHE_TTL_MS = 5 * 60_000;
 
 interface OfficeLocation {
   lat: number;
@@ -20,18 +24,20 @@ interface OfficeLocation {
 
 export const OfficeLocationService = {
   /**
-   * Get office location settings
+   * Get office location settings.
+   * Served from memory: every check-in/check-out reads it.
    */
   async get(): Promise<OfficeLocation | null> {
+    const cached = cacheGet<OfficeLocation | null>(CACHE_KEY);
+    if (cached !== undefined) return cached;
+
     const setting = await prisma.companySettings.findUnique({
       where: { key: OFFICE_LOCATION_KEY },
     });
 
-    if (!setting) {
-      return null;
-    }
-
-    return setting.value as unknown as OfficeLocation;
+    const location = setting ? (setting.value as unknown as OfficeLocation) : null;
+    cacheSet(CACHE_KEY, location, CACHE_TTL_MS);
+    return location;
   },
 
   /**
@@ -56,6 +62,7 @@ export const OfficeLocationService = {
         updatedAt: new Date(),
       },
     });
+    cacheInvalidate(CACHE_KEY);
 
     return locationData;
   },
@@ -67,6 +74,7 @@ export const OfficeLocationService = {
     await prisma.companySettings.deleteMany({
       where: { key: OFFICE_LOCATION_KEY },
     });
+    cacheInvalidate(CACHE_KEY);
   },
 
   /**
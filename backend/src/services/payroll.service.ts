@@ -1,5 +1,7 @@
 import { prisma } from '../services/prisma.service';
 import { PayrunRepository } from '../repositories/payrun.repository';
+import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
 import { calculatePayslip, countWorkingDays, safe } from '../utils/payroll-calculator.util';
 
 function normalizeDateOnly(d: Date) {
@@ -69,6 +71,134 @@ async function getOfficeScore(tx: any, userId: string, startDate: Date, endDate:
   return 10;
 }
 
+/**
+ * Calculate the payslips a payrun for the period would contain.
+ * Reads only; `run` writes the result.
+ */
+export async function calculatePayslips(tx: any, start: Date, end: Date) {
+  // Load employees by role (avoid tight type coupling in filters)
+  const employees = await tx.user.findMany({ 
+    where: { role: { is: { name: 'employee' } }, isActive: true } 
+  });
+
+  const workingDays = countWorkingDays(start, end);
+
+  const payslips: Array<{
+    userId: string;
+    basic: number;
+    hra: number;
+    bonus: number;
+    gross: number;
+    pf: number;
+    employerPf: number;
+    tax: number;
+    esi: number;
+    totalDeductions: number;
+    absentDays: number;
+    dayDeduction: number;
+    extraPaidLeaveHours: number;
+    paidLeaveHourDeduction: number;
+    net: number;
+    ctc: number;
+    officeScore: number;
+    components: any;
+  }> = [];
+
+  for (const emp of employees) {
+    try {
+      // Get employee profile and salary
+      const profile = await tx.employeeProfile.findUnique({ where: { userId: emp.id } });
+      
+      // Get salary with proper fallback chain
+      let salary = 0;
+      if (profile?.salary && Number(profile.salary) > 0) {
+        salary = Number(profile.salary);
+      } else if ((profile?.metadata as any)?.basicSalary) {
+        salary = Number((profile?.metadata as any).basicSalary);
+      } else {
+        salary = 30000; // Default minimum salary
+      }
+      
+      // Ensure salary is never 0
+      if (salary <= 0) {
+        console.warn(`Employee ${emp.id} (${emp.name}) has invalid salary, using default 30000`);
+        salary = 30000;
+      }
+
+      // Get attendance data
+      const presentDays = await tx.attendance.count({ 
+        where: { 
+          userId: emp.id, 
+          date: { gte: start, lte: end }, 
+          NOT: { checkIn: null } 
+        } 
+      });
+
+      // Calculate absent days
+      const absentDays = Math.max(0, workingDays - presentDays);
+
+      // Get extra paid leave hours
+      const extraPaidLeaveHours = await calculateExtraPaidLeaveHours(tx, emp.id, start, end);
+
+      // Get office score
+      const officeScore = await getOfficeScore(tx, emp.id, start, end);
+
+      // Calculate payslip using new comprehensive logic
+      const payslip = calculatePayslip({
+        salary,
+        officeScore,
+        absentDays,
+        totalWorkingDays: workingDays,
+        extraPaidLeaveHours,
+        standardWorkHoursPerDay: 8,
+      });
+
+      // Log calculation for debugging
+      console.log(`Payslip for ${emp.name} (${emp.id}):`, {
+        salary,
+        gross: payslip.gross,
+        totalDeductions: payslip.totalDeductions,
+        net: payslip.finalNet,
+        ctc: payslip.ctc,
+        presentDays,
+        absentDays,
+      });
+
+      payslips.push({
+        userId: emp.id,
+        basic: payslip.basic,
+        hra: payslip.hra,
+        bonus: payslip.bonus,
+        gross: payslip.gross,
+        pf: payslip.pf,
+        employerPf: payslip.employerPf,
+        tax: payslip.tax,
+        esi: payslip.esi,
+        totalDeductions: payslip.totalDeductions,
+        absentDays: payslip.absentDays,
+        dayDeduction: payslip.dayDeduction,
+        extraPaidLeaveHours: payslip.extraPaidLeaveHours,
+        paidLeaveHourDeduction: payslip.paidLeaveHourDeduction,
+        net: payslip.finalNet,
+        ctc: payslip.ctc,
+        officeScore,
+        components: {
+          salary,
+          presentDays,
+          workingDays,
+          perDaySalary: payslip.perDaySalary,
+          perHourSalary: payslip.perHourSalary,
+        },
+      });
+    } catch (error) {
+      console.error(`Error calculating payslip for employee ${emp.id}:`, error);
+      // Continue with other employees even if one fails
+    }
+  }
+
+  return { workingDays, payslips };
+}
+
 export const PayrollService = {
   async computeInputs(actor: { id: string; role: string }, periodStart: Date, periodEnd: Date, department: string = 'all') {
     if (!['admin','payroll'].includes(actor.role)) {
@@ -154,130 +284,12 @@ export const PayrollService = {
     const year = start.getFullYear();
     const month = start.getMonth() + 1;
 
-    return prisma.$transaction(async (tx) => {
+    const payrun = await prisma.$transaction(async (tx) => {
       // Ensure payrun for year+month doesn't already exist
       const existing = await tx.payrun.findUnique({ where: { year_month: { year, month } } }).catch(() => null);
       if (existing) { const err: any = new Error('Payrun already exists for this month'); err.status = 409; throw err; }
 
-      // Load employees by role (avoid tight type coupling in filters)
-      const employees = await tx.user.findMany({ 
-        where: { role: { is: { name: 'employee' } }, isActive: true } 
-      });
-
-      const workingDays = countWorkingDays(start, end);
-
-      const payslips: Array<{
-        userId: string;
-        basic: number;
-        hra: number;
-        bonus: number;
-        gross: number;
-        pf: number;
-        employerPf: number;
-        tax: number;
-        esi: number;
-        totalDeductions: number;
-        absentDays: number;
-        dayDeduction: number;
-        extraPaidLeaveHours: number;
-        paidLeaveHourDeduction: number;
-        net: number;
-        ctc: number;
-        officeScore: number;
-        components: any;
-      }> = [];
-
-      for (const emp of employees) {
-        try {
-          // Get employee profile and salary
-          const profile = await tx.employeeProfile.findUnique({ where: { userId: emp.id } });
-          
-          // Get salary with proper fallback chain
-          let salary = 0;
-          if (profile?.salary && Number(profile.salary) > 0) {
-            salary = Number(profile.salary);
-          } else if ((profile?.metadata as any)?.basicSalary) {
-            salary = Number((profile?.metadata as any).basicSalary);
-          } else {
-            salary = 30000; // Default minimum salary
-          }
-          
-          // Ensure salary is never 0
-          if (salary <= 0) {
-            console.warn(`Employee ${emp.id} (${emp.name}) has invalid salary, using default 30000`);
-            salary = 30000;
-          }
-
-          // Get attendance data
-          const presentDays = await tx.attendance.count({ 
-            where: { 
-              userId: emp.id, 
-              date: { gte: start, lte: end }, 
-              NOT: { checkIn: null } 
-            } 
-          });
-
-          // Calculate absent days
-          const absentDays = Math.max(0, workingDays - presentDays);
-
-          // Get extra paid leave hours
-          const extraPaidLeaveHours = await calculateExtraPaidLeaveHours(tx, emp.id, start, end);
-
-          // Get office score
-          const officeScore = await getOfficeScore(tx, emp.id, start, end);
-
-          // Calculate payslip using new comprehensive logic
-          const payslip = calculatePayslip({
-            salary,
-            officeScore,
-            absentDays,
-            totalWorkingDays: workingDays,
-            extraPaidLeaveHours,
-            standardWorkHoursPerDay: 8,
-          });
-
-          // Log calculation for debugging
-          console.log(`Payslip for ${emp.name} (${emp.id}):`, {
-            salary,
-            gross: payslip.gross,
-            totalDeductions: payslip.totalDeductions,
-            net: payslip.finalNet,
-            ctc: payslip.ctc,
-            presentDays,
-            absentDays,
-          });
-
-          payslips.push({
-            userId: emp.id,
-            basic: payslip.basic,
-            hra: payslip.hra,
-            bonus: payslip.bonus,
-            gross: payslip.gross,
-            pf: payslip.pf,
-            employerPf: payslip.employerPf,
-            tax: payslip.tax,
-            esi: payslip.esi,
-            totalDeductions: payslip.totalDeductions,
-            absentDays: payslip.absentDays,
-            dayDeduction: payslip.dayDeduction,
-            extraPaidLeaveHours: payslip.extraPaidLeaveHours,
-            paidLeaveHourDeduction: payslip.paidLeaveHourDeduction,
-            net: payslip.finalNet,
-            ctc: payslip.ctc,
-            officeScore,
-            components: {
-              salary,
-              presentDays,
-              workingDays,
-              perDaySalary: payslip.perDaySalary,
-              perHourSalary: payslip.perHourSalary,
-            },
-          });
-        } catch (error) {
-          console.error(`Error calculating payslip for employee ${emp.id}:`, error);
-          // Continue with other employees even if one fails
-        }
-      }
+      const { workingDays, payslips } = await calculatePayslips(tx, start, end);
 
       const payrun = await PayrunRepository.createPayrunWithPayslips(tx, {
         year,
@@ -288,6 +300,9 @@ export const PayrollService = {
 
       return payrun;
     });
+    AnalyticsService.invalidatePayroll();
+    LiveKpiService.publish('payroll.run', {}, ['payroll']);
+    return payrun;
   },
 
   async getById(actor: { id: string; role: string }, id: string) {
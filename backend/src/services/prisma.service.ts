@@ -1,5 +1,13 @@
-import { PrismaClient } from '@prisma/client';
+import { PrismaClient, Prisma } from '@prisma/client';
+
+// PRISMA_QUERY_EVENTS=true makes clients emit 'query' events with SQL and
+// parameters (used by bench/query-plans.bench.ts to capture statements)
+export const queryEventLog: Prisma.LogDefinition[] =
+  process.env.PRISMA_QUERY_EVENTS === 'true' ? [{ emit: 'event', level: 'query' }] : [];
 
 export const prisma = new PrismaClient({
-  log: process.env.NODE_ENV === 'development' ? ['query', 'info', 'warn', 'error'] : ['warn', 'error'],
+  log: [
+    ...queryEventLog,
+    ...(process.env.NODE_ENV === 'development' ? ['query', 'info', 'warn', 'error'] as const : ['warn', 'error'] as const),
+  ],
 });
@@ -1,5 +1,9 @@
 import { prisma } from '../services/prisma.service';
 import { ProfileRepository } from '../repositories/profile.repository';
+import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
+import { Prisma } from '@prisma/client';
+import { nextEmployeeCodes } from '../utils/employee-code.util';
 
 function stripScripts(value: unknown): unknown {
   if (typeof value === 'string') {
@@ -35,26 +39,15 @@ export const ProfileService = {
   async generateEmployeeCode(userName: string): Promise<string> {
     // Generate unique employee code: OI[firstletter,secondletter][year][serialnumber]
     // Example: John Doe in 2025 → OIJD2500001
-    const year = new Date().getFullYear().toString().slice(-2); // Last 2 digits of year
-    const count = await prisma.employeeProfile.count();
-    const sequence = String(count + 1).padStart(5, '0'); // 5-digit serial number
-    
-    // Extract first two letters from name
-    const nameParts = userName.trim().split(/\s+/);
-    let initials = '';
-    
-    if (nameParts.length >= 2) {
-      // First letter of first name + First letter of last name
-      initials = (nameParts[0][0] + nameParts[nameParts.length - 1][0]).toUpperCase();
-    } else if (nameParts.length === 1 && nameParts[0].length >= 2) {
-      // First two letters of single name
-      initials = nameParts[0].slice(0, 2).toUpperCase();
-    } else {
-      // Fallback: use first letter twice or XX
-      initials = nameParts[0] ? (nameParts[0][0] + nameParts[0][0]).toUpperCase() : 'XX';
-    }
-    
-    return `OI${initials}${year}${sequence}`;
+    const [code] = await nextEmployeeCodes(prisma, [userName]);
+    return code;
+  },
+
+  /**
+   * Employee codes for a batch of new profiles (see nextEmployeeCodes)
+   */
+  async reserveEmployeeCodes(tx: Prisma.TransactionClient, userNames: string[]): Promise<string[]> {
+    return nextEmployeeCodes(tx, userNames);
   },
 
   async getMe(userId: string) {
@@ -67,6 +60,8 @@ export const ProfileService = {
       // create shell profile to ensure existence with unique employee code
       const employeeCode = await this.generateEmployeeCode(userName);
       await prisma.employeeProfile.create({ data: { userId, employeeCode } });
+      AnalyticsService.invalidateEmployees();
+      LiveKpiService.publish('profile.created', {}, ['users']);
       return ProfileRepository.getByUserId(userId);
     }
     return profile;
@@ -80,6 +75,8 @@ export const ProfileService = {
       workLocation: data.workLocation,
       photoPublicId: data.photoPublicId,
     });
+    AnalyticsService.invalidateEmployees();
+    LiveKpiService.publish('profile.updated', {}, ['users']);
     return updated;
   },
 
@@ -0,0 +1,121 @@
+import { PrismaClient } from '@prisma/client';
+import { config } from '../config';
+import { logger } from './logger.service';
+import { queryEventLog } from './prisma.service';
+import { DataVersionService, DataDomain } from './data-version.service';
+
+/**
+ * Datasource for reporting and analytics reads.
+ *
+ * Reports never use the transactional client (prisma.service): they get their
+ * own small pool with a statement timeout, so a month-end report run cannot
+ * hold every primary connection. When DATABASE_READ_URL points at a streaming
+ * replica, reads go there while its replay lag stays under READ_MAX_LAG_MS and
+ * fall back to a reporting pool on the primary otherwise. Reads of a domain
+ * written within the last READ_MAX_LAG_MS (plus one lag-check interval, since
+ * the measured lag can be that old) also use the primary, so a report fetched
+ * under a freshly bumped ETag always includes the write that bumped it.
+ */
+
+const { url: replicaUrl, poolSize, statementTimeoutMs, maxLagMs, lagCheckIntervalMs } = config.readReplica;
+
+function poolUrl(base: string) {
+  const url = new URL(base);
+  url.searchParams.set('connection_limit', String(poolSize));
+  url.searchParams.set('application_name', 'workzen-reports');
+  if (statementTimeoutMs > 0) url.searchParams.set('options', `-c statement_timeout=${statementTimeoutMs}`);
+  return url.toString();
+}
+
+function createClient(base: string) {
+  return new PrismaClient({
+    datasources: { db: { url: poolUrl(base) } },
+    log: [...queryEventLog, 'warn', 'error'],
+  });
+}
+
+let primaryReports: PrismaClient | null = null;
+let replica: PrismaClient | null = null;
+let lagTimer: NodeJS.Timeout | null = null;
+
+// Unknown until the first lag check: start on the primary
+let replicaUsable = false;
+let lastLagMs: number | null = null;
+let lastError: string | null = null;
+
+function primaryReportsClient() {
+  if (!primaryReports) primaryReports = createClient(config.dbUrl);
+  return primaryReports;
+}
+
+async function checkLag() {
+  const wasUsable = replicaUsable;
+  try {
+    // Caught up (nothing left to replay) counts as zero lag even when the
+    // primary has been idle and the last replayed transaction is old
+    const [row] = await replica!.$queryRaw<Array<{ lagMs: number }>>`
+      SELECT CASE
+               WHEN NOT pg_is_in_recovery() THEN 0
+               WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+               ELSE COALESCE(EXTRACT(EPOCH FROM (now() - pg_last_xact_replay_timestamp())) * 1000, 0)
+             END::float8 AS "lagMs"`;
+    lastLagMs = Number(row.lagMs);
+    lastError = null;
+    replicaUsable = lastLagMs <= maxLagMs;
+  } catch (e) {
+    lastLagMs = null;
+    lastError = (e as Error).message;
+    replicaUsable = false;
+  }
+  if (wasUsable && !replicaUsable) {
+    logger.warn(`Read replica unavailable (lag=${lastLagMs ?? 'n/a'}ms${lastError ? `, ${lastError}` : ''}); reporting reads use the primary`);
+  } else if (!wasUsable && replicaUsable) {
+    logger.info(`Read replica in use (lag=${lastLagMs}ms)`);
+  }
+}
+
+function ensureReplica() {
+  if (replica || !replicaUrl) return;
+  replica = createClient(replicaUrl);
+  checkLag().catch(() => undefined);
+  lagTimer = setInterval(() => {
+    checkLag().catch(() => undefined);
+  }, lagCheckIntervalMs);
+  lagTimer.unref();
+}
+
+// How long after a write the replica may still be missing it
+const readYourWritesMs = maxLagMs + lagCheckIntervalMs;
+
+/**
+ * Client for report/analytics reads over `domains` (the same ones the route's
+ * ETag is derived from). Callers should take one per operation so all queries
+ * of a report hit the same datasource.
+ */
+export function readDb(domains: DataDomain[] = []): PrismaClient {
+  ensureReplica();
+  if (!replica || !replicaUsable) return primaryReportsClient();
+  const recentlyWritten = Date.now() - DataVersionService.lastChange(domains) < readYourWritesMs;
+  return recentlyWritten ? primaryReportsClient() : replica;
+}
+
+export const ReadReplicaService = {
+  status() {
+    return {
+      configured: !!replicaUrl,
+      target: replica && replicaUsable ? 'replica' : 'primary',
+      lagMs: lastLagMs,
+      maxLagMs,
+      error: lastError,
+    };
+  },
+
+  async disconnect() {
+    if (lagTimer) clearInterval(lagTimer);
+    lagTimer = null;
+    await Promise.all([replica?.$disconnect(), primaryReports?.$disconnect()]);
+    replica = null;
+    primaryReports = null;
+    replicaUsable = false;
+  },
+};
@@ -1,4 +1,4 @@
-import { prisma } from './prisma.service';
+import { readDb } from './read-replica.service';
 import { cacheGet, cacheSet } from './cache.service';
 
 export const ReportsService = {
@@ -10,17 +10,18 @@ export const ReportsService = {
     const cacheKey = `report:company:${startDate.toISOString()}:${endDate.toISOString()}:${department || 'all'}`;
     const cached = cacheGet<any>(cacheKey);
     if (cached) return cached;
+    const db = readDb(['users', 'attendance', 'payroll', 'leaves']);
 
     const where: any = {
       createdAt: { gte: startDate, lte: endDate },
     };
 
     // Employee stats
-    const totalEmployees = await prisma.employeeProfile.count({
+    const totalEmployees = await db.employeeProfile.count({
       where: department ? { department } : undefined,
     });
 
-    const activeEmployees = await prisma.user.count({
+    const activeEmployees = await db.user.count({
       where: {
         isActive: true,
         profile: department ? { department } : undefined,
@@ -28,7 +29,7 @@ export const ReportsService = {
     });
 
     // Attendance stats
-    const attendanceRecords = await prisma.attendance.findMany({
+    const attendanceRecords = await db.attendance.findMany({
       where: {
         date: { gte: startDate, lte: endDate },
         user: department ? { profile: { department } } : undefined,
@@ -40,7 +41,7 @@ export const ReportsService = {
     const avgAttendance = totalEmployees > 0 ? ((presentDays / (totalEmployees * totalDays)) * 100).toFixed(2) : 0;
 
     // Payroll stats
-    const payrollData = await prisma.payslip.aggregate({
+    const payrollData = await db.payslip.aggregate({
       where: {
         createdAt: { gte: startDate, lte: endDate },
         user: department ? { profile: { department } } : undefined,
@@ -50,7 +51,7 @@ export const ReportsService = {
     });
 
     // Leave stats
-    const leaveRequests = await prisma.leaveRequest.findMany({
+    const leaveRequests = await db.leaveRequest.findMany({
       where: {
         startDate: { gte: startDate },
         endDate: { lte: endDate },
@@ -98,15 +99,16 @@ export const ReportsService = {
    * Department Performance Report
    */
   async departmentPerformance(startDate: Date, endDate: Date) {
+    const db = readDb(['users', 'attendance', 'payroll', 'leaves']);
     const departments = ['Engineering', 'Sales', 'Marketing', 'Operations', 'Finance', 'HR'];
     
     const performanceData = await Promise.all(
       departments.map(async (dept) => {
-        const employeeCount = await prisma.employeeProfile.count({
+        const employeeCount = await db.employeeProfile.count({
           where: { department: dept },
         });
 
-        const attendance = await prisma.attendance.count({
+        const attendance = await db.attendance.count({
           where: {
             date: { gte: startDate, lte: endDate },
             checkIn: { not: null },
@@ -114,7 +116,7 @@ export const ReportsService = {
           },
         });
 
-        const payroll = await prisma.payslip.aggregate({
+        const payroll = await db.payslip.aggregate({
           where: {
             createdAt: { gte: startDate, lte: endDate },
             user: { profile: { department: dept } },
@@ -122,7 +124,7 @@ export const ReportsService = {
           _sum: { gross: true },
         });
 
-        const leaves = await prisma.leaveRequest.count({
+        const leaves = await db.leaveRequest.count({
           where: {
             startDate: { gte: startDate },
             status: 'APPROVED',
@@ -151,7 +153,8 @@ export const ReportsService = {
    * Payroll Summary Report
    */
   async payrollSummary(startDate: Date, endDate: Date, department?: string) {
-    const payslips = await prisma.payslip.findMany({
+    const db = readDb(['users', 'payroll']);
+    const payslips = await db.payslip.findMany({
       where: {
         createdAt: { gte: startDate, lte: endDate },
         user: department ? { profile: { department } } : undefined,
@@ -191,7 +194,8 @@ export const ReportsService = {
    * Leave Utilization Report
    */
   async leaveUtilization(startDate: Date, endDate: Date, department?: string) {
-    const leaves = await prisma.leaveRequest.findMany({
+    const db = readDb(['users', 'leaves']);
+    const leaves = await db.leaveRequest.findMany({
       where: {
         startDate: { gte: startDate },
         endDate: { lte: endDate },
@@ -256,7 +260,8 @@ export const ReportsService = {
    * Attendance Analytics Report
    */
   async attendanceAnalytics(startDate: Date, endDate: Date, department?: string) {
-    const attendance = await prisma.attendance.findMany({
+    const db = readDb(['users', 'attendance']);
+    const attendance = await db.attendance.findMany({
       where: {
         date: { gte: startDate, lte: endDate },
         user: department ? { profile: { department } } : undefined,
@@ -326,7 +331,8 @@ export const ReportsService = {
    * Employee Growth Report
    */
   async employeeGrowth(startDate: Date, endDate: Date) {
-    const employees = await prisma.user.findMany({
+    const db = readDb(['users']);
+    const employees = await db.user.findMany({
       where: {
         createdAt: { gte: startDate, lte: endDate },
       },
@@ -348,7 +354,7 @@ export const ReportsService = {
     }, []);
 
     // Get inactive users (left)
-    const inactiveUsers = await prisma.user.findMany({
+    const inactiveUsers = await db.user.findMany({
       where: {
         isActive: false,
         updatedAt: { gte: startDate, lte: endDate },
@@ -372,7 +378,7 @@ export const ReportsService = {
       m.total = cumulative;
     });
 
-    const currentTotal = await prisma.user.count({ where: { isActive: true } });
+    const currentTotal = await db.user.count({ where: { isActive: true } });
     const attritionRate = currentTotal > 0 ? ((inactiveUsers.length / currentTotal) * 100).toFixed(2) : '0';
 
     return {
@@ -1,8 +1,13 @@
 import { prisma } from './prisma.service';
 import { cacheGet, cacheSet, cacheInvalidatePrefix } from './cache.service';
+import { DataVersionService } from './data-version.service';
+import { LiveKpiService } from './live-kpi.service';
+import { AttendanceRepository } from '../repositories/attendance.repository';
+import { isValidTimeZone } from '../utils/timezone.util';
+import { ValidationError } from '../utils/errors';
 
 // Default settings structure
-const DEFAULT_SETTINGS = {
+export const DEFAULT_SETTINGS = {
   company: {
     companyName: 'WorkZen Technologies',
     fiscalYearStart: '2025-04',
@@ -12,6 +17,7 @@ const DEFAULT_SETTINGS = {
   },
   attendance: {
     minHoursPerDay: 8,
+    officeStartTime: '09:15',
     graceTimeMinutes: 15,
     workingDays: 'Monday - Saturday',
     autoMarkAbsentAfterDays: 3,
@@ -36,6 +42,10 @@ const DEFAULT_SETTINGS = {
   },
 };
 
+// Rows are stored as `${category}.${key}`; callers see the bare key
+const settingKey = (category: string, key: string) =>
+  key.startsWith(`${category}.`) ? key.slice(category.length + 1) : key;
+
 export const SettingsService = {
   async getAll() {
     const cacheKey = 'settings:all';
@@ -54,7 +64,7 @@ export const SettingsService = {
     };
 
     settings.forEach((setting) => {
-      settingsMap[setting.category][setting.key] = setting.value;
+      settingsMap[setting.category][settingKey(setting.category, setting.key)] = setting.value;
     });
 
     // Merge with defaults for any missing settings
@@ -81,7 +91,7 @@ export const SettingsService = {
 
     const settingsMap: any = {};
     settings.forEach((setting) => {
-      settingsMap[setting.key] = setting.value;
+      settingsMap[settingKey(category, setting.key)] = setting.value;
     });
 
     // Merge with defaults
@@ -93,25 +103,43 @@ export const SettingsService = {
   },
 
   async updateSettings(category: string, data: Record<string, any>) {
-    // Update or create each setting
-    const updates = Object.entries(data).map(([key, value]) =>
-      prisma.companySettings.upsert({
-        where: { key: `${category}.${key}` },
-        create: {
-          key: `${category}.${key}`,
-          category,
-          value: value as any,
-        },
-        update: {
-          value: value as any,
-        },
-      })
-    );
-
-    await Promise.all(updates);
-
-    // Invalidate cache
-    cacheInvalidatePrefix('settings:');
+    const timezoneChange = category === 'company' && 'timezone' in data;
+    if (timezoneChange && !isValidTimeZone(data.timezone)) {
+      throw new ValidationError(`Unknown timezone: ${data.timezone}`);
+    }
+    const previousTimezone = timezoneChange
+      ? (await prisma.companySettings.findUnique({ where: { key: 'company.timezone' } }))?.value ?? DEFAULT_SETTINGS.company.timezone
+      : undefined;
+
+    try {
+      // Update or create each setting
+      const updates = Object.entries(data).map(([key, value]) =>
+        prisma.companySettings.upsert({
+          where: { key: `${category}.${key}` },
+          create: {
+            key: `${category}.${key}`,
+            category,
+            value: value as any,
+          },
+          update: {
+            value: value as any,
+          },
+        })
+      );
+
+      await Promise.all(updates);
+
+      // Late-arrival detection stores check-in minutes in the company timezone;
+      // rewriting them touches every attendance row, so only on an actual change
+      if (timezoneChange && data.timezone !== previousTimezone) {
+        await AttendanceRepository.recomputeCheckInMinutes(data.timezone);
+      }
+    } finally {
+      // Some upserts may have landed even if a later step failed
+      cacheInvalidatePrefix('settings:');
+      DataVersionService.bump('settings');
+      LiveKpiService.publish('settings.updated', {}, ['settings']);
+    }
 
     return this.getByCategory(category);
   },
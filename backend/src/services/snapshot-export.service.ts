@@ -0,0 +1,315 @@
+import fs from 'fs/promises';
+import path from 'path';
+import { Client, QueryResultRow, types } from 'pg';
+import { AttendanceStatus, LeaveStatus, LeaveType } from '@prisma/client';
+import { config } from '../config';
+import { DEFAULT_SETTINGS } from './settings.service';
+import { ColumnSpec, SnapshotTable, TableManifest } from '../utils/snapshot-writer.util';
+
+export const SNAPSHOT_FORMAT_VERSION = 1;
+const DEFAULT_BATCH_SIZE = 5000;
+
+export interface SnapshotManifest {
+  version: number;
+  exportedAt: string;
+  // Timezone the API formats local times in (attendance lateness in ReportsService uses server local time)
+  serverTimeZone: string;
+  companyTimeZone: string;
+  tables: Record<string, TableManifest>;
+}
+
+const USER_COLUMNS: ColumnSpec[] = [
+  { name: 'id', dtype: 'str' },
+  { name: 'name', dtype: 'str' },
+  { name: 'role', dtype: 'dict' },
+  { name: 'has_profile', dtype: '|b1' },
+  { name: 'department', dtype: 'dict' },
+  { name: 'is_active', dtype: '|b1' },
+  { name: 'created_at', dtype: '<M8[ms]' },
+  { name: 'updated_at', dtype: '<M8[ms]' },
+];
+
+// `user` columns are row indexes into the users table
+const ATTENDANCE_COLUMNS: ColumnSpec[] = [
+  { name: 'user', dtype: '<i4' },
+  { name: 'date', dtype: '<M8[ms]' },
+  { name: 'status', dtype: 'dict', dictionary: Object.values(AttendanceStatus) },
+  { name: 'check_in', dtype: '<M8[ms]' },
+  { name: 'check_out', dtype: '<M8[ms]' },
+];
+
+// Money is stored as integer cents so sums match the database exactly
+const PAYSLIP_COLUMNS: ColumnSpec[] = [
+  { name: 'user', dtype: '<i4' },
+  { name: 'payrun_year', dtype: '<i2' },
+  { name: 'payrun_month', dtype: '|i1' },
+  { name: 'gross', dtype: '<i8', scale: 2 },
+  { name: 'net', dtype: '<i8', scale: 2 },
+  { name: 'total_deductions', dtype: '<i8', scale: 2 },
+  { name: 'created_at', dtype: '<M8[ms]' },
+];
+
+const LEAVE_COLUMNS: ColumnSpec[] = [
+  { name: 'user', dtype: '<i4' },
+  { name: 'type', dtype: 'dict', dictionary: Object.values(LeaveType) },
+  { name: 'status', dtype: 'dict', dictionary: Object.values(LeaveStatus) },
+  { name: 'start_date', dtype: '<M8[ms]' },
+  { name: 'end_date', dtype: '<M8[ms]' },
+  { name: 'created_at', dtype: '<M8[ms]' },
+];
+
+// Prisma stores DateTime as timestamp(3) without time zone, in UTC; pg would read it as local time
+const parseUtcTimestamp = (value: string) => new Date(`${value.replace(' ', 'T')}Z`);
+const typeParsers = {
+  getTypeParser: ((oid: number, format?: any) =>
+    oid === types.builtins.TIMESTAMP ? parseUtcTimestamp : types.getTypeParser(oid, format)) as typeof types.getTypeParser,
+};
+
+/** A connection of its own, outside the API pools and their statement timeouts */
+async function connect() {
+  const url = config.snapshot.url || config.dbUrl;
+  const client = new Client({ connectionString: url, application_name: 'workzen-snapshot', types: typeParsers });
+  await client.connect();
+  // Prisma's ?schema= parameter, which pg ignores
+  const schema = new URL(url).searchParams.get('schema');
+  if (schema) await client.query(`SET search_path TO ${client.escapeIdentifier(schema)}`);
+  // Snapshot transactions sit idle while other connections read
+  await client.query('SET idle_in_transaction_session_timeout = 0');
+  return client;
+}
+
+/**
+ * Keyset-paginate a query by id: `sql` takes the last id seen as $1 and the
+ * page size as $2. Each page is handed to `write` before the next is read, so
+ * memory stays bounded by the batch size.
+ */
+async function streamById<T extends QueryResultRow & { id: string }>(
+  client: Client,
+  batchSize: number,
+  sql: string,
+  write: (rows: T[]) => Promise<void>,
+) {
+  let cursor = '';
+  for (;;) {
+    const { rows } = await client.query<T>(sql, [cursor, batchSize]);
+    if (rows.length) await write(rows);
+    if (rows.length < batchSize) return;
+    cursor = rows[rows.length - 1].id;
+  }
+}
+
+function userIndex(index: Map<string, number>, userId: string) {
+  const i = index.get(userId);
+  if (i === undefined) throw new Error(`Snapshot references unknown user ${userId}`);
+  return i;
+}
+
+type Progress = (table: string, rows: number) => void;
+
+async function exportUsers(client: Client, outDir: string, batchSize: number, index: Map<string, number>, progress: Progress) {
+  const users = await SnapshotTable.open(outDir, 'users', USER_COLUMNS);
+  await streamById<{
+    id: string;
+    name: string;
+    role: string;
+    hasProfile: boolean;
+    department: string | null;
+    isActive: boolean;
+    createdAt: Date;
+    updatedAt: Date;
+  }>(
+    client,
+    batchSize,
+    `SELECT u."id", u."name", r."name" AS "role", p."userId" IS NOT NULL AS "hasProfile", p."department",
+            u."isActive", u."createdAt", u."updatedAt"
+       FROM "User" u
+       JOIN "Role" r ON r."id" = u."roleId"
+       LEFT JOIN "EmployeeProfile" p ON p."userId" = u."id"
+      WHERE u."id" > $1
+      ORDER BY u."id"
+      LIMIT $2`,
+    async (rows) => {
+      for (const u of rows) index.set(u.id, index.size);
+      await users.append({
+        id: rows.map((u) => u.id),
+        name: rows.map((u) => u.name),
+        role: rows.map((u) => u.role),
+        has_profile: rows.map((u) => u.hasProfile),
+        department: rows.map((u) => u.department),
+        is_active: rows.map((u) => u.isActive),
+        created_at: rows.map((u) => u.createdAt),
+        updated_at: rows.map((u) => u.updatedAt),
+      });
+      progress('users', index.size);
+    },
+  );
+  return users.close();
+}
+
+async function exportAttendance(client: Client, outDir: string, batchSize: number, index: Map<string, number>, progress: Progress) {
+  const attendance = await SnapshotTable.open(outDir, 'attendance', ATTENDANCE_COLUMNS);
+  let count = 0;
+  await streamById<{ id: string; userId: string; date: Date; status: string; checkIn: Date | null; checkOut: Date | null }>(
+    client,
+    batchSize,
+    `SELECT "id", "userId", "date", "status", "checkIn", "checkOut"
+       FROM "Attendance"
+      WHERE "id" > $1
+      ORDER BY "id"
+      LIMIT $2`,
+    async (rows) => {
+      await attendance.append({
+        user: rows.map((a) => userIndex(index, a.userId)),
+        date: rows.map((a) => a.date),
+        status: rows.map((a) => a.status),
+        check_in: rows.map((a) => a.checkIn),
+        check_out: rows.map((a) => a.checkOut),
+      });
+      progress('attendance', (count += rows.length));
+    },
+  );
+  return attendance.close();
+}
+
+async function exportPayslips(client: Client, outDir: string, batchSize: number, index: Map<string, number>, progress: Progress) {
+  const payslips = await SnapshotTable.open(outDir, 'payslips', PAYSLIP_COLUMNS);
+  let count = 0;
+  // Money is converted to cents in the database, so no float rounding is involved
+  await streamById<{
+    id: string;
+    userId: string;
+    year: number;
+    month: number;
+    gross: string;
+    net: string;
+    totalDeductions: string;
+    createdAt: Date;
+  }>(
+    client,
+    batchSize,
+    `SELECT s."id", s."userId", r."year", r."month",
+            (s."gross" * 100)::bigint AS "gross", (s."net" * 100)::bigint AS "net",
+            (s."totalDeductions" * 100)::bigint AS "totalDeductions", s."createdAt"
+       FROM "Payslip" s
+       JOIN "Payrun" r ON r."id" = s."payrunId"
+      WHERE s."id" > $1
+      ORDER BY s."id"
+      LIMIT $2`,
+    async (rows) => {
+      await payslips.append({
+        user: rows.map((p) => userIndex(index, p.userId)),
+        payrun_year: rows.map((p) => p.year),
+        payrun_month: rows.map((p) => p.month),
+        gross: rows.map((p) => Number(p.gross)),
+        net: rows.map((p) => Number(p.net)),
+        total_deductions: rows.map((p) => Number(p.totalDeductions)),
+        created_at: rows.map((p) => p.createdAt),
+      });
+      progress('payslips', (count += rows.length));
+    },
+  );
+  return payslips.close();
+}
+
+async function exportLeaves(client: Client, outDir: string, batchSize: number, index: Map<string, number>, progress: Progress) {
+  const leaves = await SnapshotTable.open(outDir, 'leave_requests', LEAVE_COLUMNS);
+  let count = 0;
+  await streamById<{ id: string; userId: string; type: string; status: string; startDate: Date; endDate: Date; createdAt: Date }>(
+    client,
+    batchSize,
+    `SELECT "id", "userId", "type", "status", "startDate", "endDate", "createdAt"
+       FROM "LeaveRequest"
+      WHERE "id" > $1
+      ORDER BY "id"
+      LIMIT $2`,
+    async (rows) => {
+      await leaves.append({
+        user: rows.map((l) => userIndex(index, l.userId)),
+        type: rows.map((l) => l.type),
+        status: rows.map((l) => l.status),
+        start_date: rows.map((l) => l.startDate),
+        end_date: rows.map((l) => l.endDate),
+        created_at: rows.map((l) => l.createdAt),
+      });
+      progress('leave_requests', (count += rows.length));
+    },
+  );
+  return leaves.close();
+}
+
+/**
+ * Columnar snapshots of users/profiles, attendance, payslips and leave
+ * requests for offline analytics (see analytics/ in the backend folder).
+ *
+ * Reads run on dedicated connections to SNAPSHOT_DATABASE_URL (the primary by
+ * default), never through the reporting pool: a standby cancels long queries
+ * that conflict with replay unless it runs with hot_standby_feedback. One
+ * REPEATABLE READ transaction exports its snapshot with pg_export_snapshot();
+ * it reads the company settings and users, and the other tables are read in
+ * parallel by transactions that import the same snapshot, so everything is
+ * mutually consistent. The snapshot holds back vacuum until the export ends.
+ * manifest.json is written last; a directory without one is an incomplete
+ * export.
+ */
+export const SnapshotExportService = {
+  async export(outDir: string, options: { batchSize?: number; onProgress?: Progress } = {}) {
+    const batchSize = options.batchSize ?? DEFAULT_BATCH_SIZE;
+    const progress = options.onProgress ?? (() => {});
+    await fs.mkdir(outDir, { recursive: true });
+    await fs.rm(path.join(outDir, 'manifest.json'), { force: true });
+
+    const clients: Client[] = [];
+    const open = async () => {
+      const client = await connect();
+      clients.push(client);
+      return client;
+    };
+
+    const tables: Record<string, TableManifest> = {};
+    let companyTimeZone = DEFAULT_SETTINGS.company.timezone;
+    try {
+      const main = await open();
+      await main.query('BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY');
+      const {
+        rows: [{ snapshot }],
+      } = await main.query<{ snapshot: string }>('SELECT pg_export_snapshot() AS snapshot');
+
+      const { rows: settings } = await main.query<{ value: unknown }>(
+        `SELECT "value" FROM "CompanySettings" WHERE "key" = 'company.timezone'`,
+      );
+      const stored = settings[0]?.value;
+      if (typeof stored === 'string') companyTimeZone = stored;
+
+      const readers = await Promise.all(
+        [0, 1, 2].map(async () => {
+          const reader = await open();
+          await reader.query('BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY');
+          await reader.query(`SET TRANSACTION SNAPSHOT ${reader.escapeLiteral(snapshot)}`);
+          return reader;
+        }),
+      );
+
+      // Other tables refer to users by row index, so users come first
+      const index = new Map<string, number>();
+      tables.users = await exportUsers(main, outDir, batchSize, index, progress);
+      [tables.attendance, tables.payslips, tables.leave_requests] = await Promise.all([
+        exportAttendance(readers[0], outDir, batchSize, index, progress),
+        exportPayslips(readers[1], outDir, batchSize, index, progress),
+        exportLeaves(readers[2], outDir, batchSize, index, progress),
+      ]);
+    } finally {
+      // Read-only transactions: ending the sessions is all the cleanup needed
+      await Promise.all(clients.map((c) => c.end().catch(() => undefined)));
+    }
+
+    const manifest: SnapshotManifest = {
+      version: SNAPSHOT_FORMAT_VERSION,
+      exportedAt: new Date().toISOString(),
+      serverTimeZone: Intl.DateTimeFormat().resolvedOptions().timeZone,
+      companyTimeZone,
+      tables,
+    };
+    await fs.writeFile(path.join(outDir, 'manifest.json'), JSON.stringify(manifest, null, 2));
+    return manifest;
+  },
+};
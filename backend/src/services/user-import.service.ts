@@ -0,0 +1,448 @@
+import * as bcrypt from 'bcrypt';
+import crypto from 'crypto';
+import { Prisma } from '@prisma/client';
+import { config } from '../config';
+import { prisma } from './prisma.service';
+import { ProfileService } from './profile.service';
+import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
+import { AuditService } from './audit.service';
+import { EmailQueueService } from './email-queue.service';
+import { DEFAULT_LEAVE_BALANCE } from './users.service';
+import { importUserRowSchema, ImportUserRow } from '../dto/user.dto';
+import { decodeText, parseCsv, splitLines } from '../utils/import-parser.util';
+import { detectThreat, sanitizeString, THREAT_MESSAGES } from '../middlewares/sanitize.middleware';
+import { ensureQueue } from '../utils/boss-queue.util';
+import { AppError, NotFoundError, ValidationError } from '../utils/errors';
+
+export type ImportFormat = 'csv' | 'ndjson';
+export type ImportRowError = { row: number; email?: string; error: string };
+
+const MAX_IMPORT_BYTES = 20 * 1024 * 1024;
+const MAX_IMPORT_ROWS = 20000;
+const CHUNK_SIZE = 500;
+// Rows kept in ImportJob.errors; the failed count covers the rest
+const MAX_STORED_ERRORS = 1000;
+// bcrypt's async hash runs on libuv's thread pool (UV_THREADPOOL_SIZE, default 4)
+const HASH_CONCURRENCY = Number(process.env.UV_THREADPOOL_SIZE ?? 4);
+const CHUNK_ATTEMPTS = 3;
+// pg-boss 10 queue names may not contain ':'
+export const IMPORT_QUEUE = 'user-import';
+// A chunk hashes CHUNK_SIZE passwords; pg-boss retries one whose worker went away after this long
+const CHUNK_EXPIRE_SECONDS = 900;
+const CHUNK_RETRY_LIMIT = 5;
+// Longer than every retry of a chunk put together
+const STALE_IMPORT_MS = 2 * 60 * 60 * 1000;
+
+const CSV_COLUMNS: Record<string, keyof ImportUserRow> = {
+  email: 'email',
+  name: 'name',
+  password: 'password',
+  role: 'role',
+  department: 'department',
+  salary: 'salary',
+  sendcredentials: 'sendCredentials',
+  send_credentials: 'sendCredentials',
+};
+
+type ValidRow = { row: number; data: ImportUserRow };
+type Actor = { id: string; ip?: string; userAgent?: string };
+type ImportTask = { jobId: string; actor: Actor };
+
+// Use a broad type here to avoid tight coupling to pg-boss typings
+let boss: any | null = null;
+
+/**
+ * The checks sanitizeInput applies to JSON bodies, per row: the import body is
+ * read as a raw stream, so the middleware never sees it. Returns the row with
+ * its strings cleaned, or the error for the first suspicious field.
+ */
+function screenRecord(record: Record<string, unknown>): { record: Record<string, unknown> } | { error: string } {
+  const clean: Record<string, unknown> = {};
+  for (const [field, value] of Object.entries(record)) {
+    if (typeof value !== 'string') {
+      clean[field] = value;
+      continue;
+    }
+    const threat = detectThreat(value);
+    if (threat) return { error: `${THREAT_MESSAGES[threat]} ${field}` };
+    clean[field] = sanitizeString(value);
+  }
+  return { record: clean };
+}
+
+async function* records(input: AsyncIterable<Buffer | string>, format: ImportFormat): AsyncGenerator<Record<string, unknown>> {
+  const text = decodeText(input, MAX_IMPORT_BYTES, () => new AppError('Import file too large', 413));
+  if (format === 'ndjson') {
+    for await (const line of splitLines(text)) {
+      try {
+        yield JSON.parse(line);
+      } catch {
+        yield { __invalid: 'Invalid JSON' };
+      }
+    }
+    return;
+  }
+
+  let columns: Array<keyof ImportUserRow | undefined> | null = null;
+  for await (const fields of parseCsv(text)) {
+    if (!columns) {
+      columns = fields.map((h) => CSV_COLUMNS[h.trim().toLowerCase()]);
+      if (!columns.includes('email') || !columns.includes('name')) {
+        throw new ValidationError('CSV header must include email and name columns');
+      }
+      continue;
+    }
+    const record: Record<string, unknown> = {};
+    columns.forEach((key, i) => {
+      // Empty cells mean "not provided"
+      if (key && fields[i] !== undefined && fields[i].trim() !== '') record[key] = fields[i];
+    });
+    yield record;
+  }
+}
+
+function describeIssues(error: { issues: Array<{ path: (string | number)[]; message: string }> }) {
+  return error.issues.map((i) => (i.path.length ? `${i.path.join('.')}: ${i.message}` : i.message)).join('; ');
+}
+
+async function mapWithConcurrency<T, R>(items: T[], limit: number, fn: (item: T) => Promise<R>): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+  const workers = Array.from({ length: Math.min(limit, items.length) }, async () => {
+    while (next < items.length) {
+      const i = next++;
+      results[i] = await fn(items[i]);
+    }
+  });
+  await Promise.all(workers);
+  return results;
+}
+
+function isUniqueViolation(e: unknown) {
+  return e instanceof Prisma.PrismaClientKnownRequestError && e.code === 'P2002';
+}
+
+async function recordChunk(tx: Prisma.TransactionClient, jobId: string, chunk: ValidRow[], created: number, errors: ImportRowError[]) {
+  await tx.importJobRow.deleteMany({ where: { importJobId: jobId, row: { in: chunk.map((r) => r.row) } } });
+  const job = await tx.importJob.findUniqueOrThrow({ where: { id: jobId }, select: { errors: true } });
+  const stored = (job.errors as ImportRowError[] | null) ?? [];
+  await tx.importJob.update({
+    where: { id: jobId },
+    data: {
+      processed: { increment: chunk.length },
+      created: { increment: created },
+      failed: { increment: errors.length },
+      errors: stored.concat(errors.slice(0, Math.max(0, MAX_STORED_ERRORS - stored.length))) as any,
+    },
+  });
+}
+
+/**
+ * Bulk employee onboarding.
+ *
+ * The upload is validated in one streaming pass and its valid rows are staged
+ * in ImportJobRow; the request then returns with an ImportJob id while a
+ * pg-boss job (IMPORT_QUEUE) writes them in chunks: passwords hashed in
+ * parallel, employee codes reserved per chunk, users, profiles and audit
+ * entries inserted with bulk statements, and credentials emails queued in one
+ * insert. Each chunk deletes its staged rows and updates the job's progress
+ * and per-row errors in the transaction that inserts it, so a worker that
+ * dies mid-import is retried by pg-boss from the first row not yet written.
+ */
+export const UserImportService = {
+  /**
+   * Create the import queue on a started pg-boss instance and, unless `work`
+   * is false, work it. Imports left RUNNING without progress for
+   * STALE_IMPORT_MS are marked FAILED.
+   */
+  async attach(instance: any, options: { work?: boolean } = {}) {
+    await ensureQueue(instance, IMPORT_QUEUE, {
+      retryLimit: CHUNK_RETRY_LIMIT,
+      retryDelay: 10,
+      retryBackoff: true,
+      expireInSeconds: CHUNK_EXPIRE_SECONDS,
+    });
+    boss = instance;
+    await UserImportService.failStale();
+
+    if (options.work === false) return;
+    await instance.work(IMPORT_QUEUE, { pollingIntervalSeconds: 1, includeMetadata: true }, (jobs: any[]) =>
+      UserImportService.handle(jobs),
+    );
+  },
+
+  detach() {
+    boss = null;
+  },
+
+  /**
+   * Validate `input` and start the import. Rows that fail validation are
+   * recorded as errors right away; the file is only rejected as a whole when
+   * it is unreadable, too large or missing required columns.
+   */
+  async start(actor: Actor, input: AsyncIterable<Buffer | string>, format: ImportFormat) {
+    const valid: ValidRow[] = [];
+    const errors: ImportRowError[] = [];
+    const seen = new Set<string>();
+    let row = 0;
+
+    for await (const record of records(input, format)) {
+      row++;
+      if (row > MAX_IMPORT_ROWS) throw new AppError(`Import is limited to ${MAX_IMPORT_ROWS} rows`, 413);
+      const email = typeof record.email === 'string' ? record.email.trim() : undefined;
+      if (record.__invalid) {
+        errors.push({ row, error: String(record.__invalid) });
+        continue;
+      }
+      const screened = screenRecord(record);
+      if ('error' in screened) {
+        errors.push({ row, email, error: screened.error });
+        continue;
+      }
+      const parsed = importUserRowSchema.safeParse(screened.record);
+      if (!parsed.success) {
+        errors.push({ row, email, error: describeIssues(parsed.error) });
+        continue;
+      }
+      if (seen.has(parsed.data.email)) {
+        errors.push({ row, email, error: 'Duplicate email in file' });
+        continue;
+      }
+      seen.add(parsed.data.email);
+      valid.push({ row, data: parsed.data });
+    }
+    if (!row) throw new ValidationError('Import file has no rows');
+
+    const job = await prisma.$transaction(
+      async (tx) => {
+        const created = await tx.importJob.create({
+          data: {
+            userId: actor.id,
+            total: row,
+            processed: errors.length,
+            failed: errors.length,
+            errors: errors.slice(0, MAX_STORED_ERRORS) as any,
+          },
+        });
+        await tx.importJobRow.createMany({
+          data: valid.map((r) => ({ importJobId: created.id, row: r.row, data: r.data as any })),
+        });
+        return created;
+      },
+      { timeout: 60_000 },
+    );
+
+    // Continues after the response; progress is read through get()
+    await UserImportService.schedule({ jobId: job.id, actor });
+
+    return { jobId: job.id, total: row, valid: valid.length, invalid: errors.length };
+  },
+
+  /**
+   * Queue the next chunk of an import. Without a running queue (scripts,
+   * tests) the whole import runs in the background of this process instead.
+   */
+  async schedule(task: ImportTask) {
+    if (boss) {
+      await boss.send(IMPORT_QUEUE, task);
+      return;
+    }
+    (async () => {
+      try {
+        while (await UserImportService.runChunk(task));
+      } catch (e: any) {
+        await UserImportService.finish(task, 'FAILED', e?.message ?? 'Import failed');
+      }
+    })().catch((e) => console.error('User import failed:', e));
+  },
+
+  /**
+   * Worker handler: imports one chunk and queues the next. Throwing hands the
+   * job back to pg-boss for a retry; once retries run out the import is
+   * marked FAILED with its remaining rows unwritten.
+   */
+  async handle(jobs: Array<{ id: string; data: ImportTask; retryCount?: number; retryLimit?: number }>) {
+    for (const job of jobs) {
+      try {
+        if (await UserImportService.runChunk(job.data)) await UserImportService.schedule(job.data);
+      } catch (e: any) {
+        if ((job.retryCount ?? 0) < (job.retryLimit ?? CHUNK_RETRY_LIMIT)) throw e;
+        await UserImportService.finish(job.data, 'FAILED', e?.message ?? 'Import failed');
+      }
+    }
+  },
+
+  /**
+   * Import the next CHUNK_SIZE staged rows of a job; false once the job is
+   * finished (or no longer running)
+   */
+  async runChunk(task: ImportTask) {
+    const job = await prisma.importJob.findUnique({ where: { id: task.jobId }, select: { status: true } });
+    if (job?.status !== 'RUNNING') return false;
+
+    const staged = await prisma.importJobRow.findMany({
+      where: { importJobId: task.jobId },
+      orderBy: { row: 'asc' },
+      take: CHUNK_SIZE,
+    });
+    if (!staged.length) {
+      await UserImportService.finish(task, 'SUCCEEDED');
+      return false;
+    }
+
+    const chunk = staged.map((s) => ({ row: s.row, data: s.data as unknown as ImportUserRow }));
+    const roles = new Map((await prisma.role.findMany()).map((r) => [r.name, r.id]));
+    const created = await UserImportService.importChunk(task.jobId, task.actor, chunk, roles).catch(async (e) => {
+      await prisma.$transaction((tx) =>
+        recordChunk(tx, task.jobId, chunk, 0, chunk.map((r) => ({ row: r.row, email: r.data.email, error: e?.message ?? 'Import failed' }))),
+      );
+      return 0;
+    });
+    if (created) {
+      AnalyticsService.invalidateEmployees();
+      LiveKpiService.publish('user.imported', {}, ['users']);
+    }
+    return true;
+  },
+
+  async finish(task: ImportTask, status: 'SUCCEEDED' | 'FAILED', error?: string) {
+    const [, job] = await prisma.$transaction([
+      prisma.importJobRow.deleteMany({ where: { importJobId: task.jobId } }),
+      prisma.importJob.update({ where: { id: task.jobId }, data: { status, error, finishedAt: new Date() } }),
+    ]);
+    await AuditService.create({
+      userId: task.actor.id,
+      action: 'USER_IMPORT',
+      entity: 'ImportJob',
+      entityId: task.jobId,
+      ip: task.actor.ip,
+      userAgent: task.actor.userAgent,
+      meta: { total: job.processed, created: job.created, failed: job.failed },
+    }).catch(() => undefined);
+  },
+
+  /**
+   * Mark imports whose worker is gone as FAILED: a running import updates its
+   * job after every chunk, so one untouched for STALE_IMPORT_MS has outlived
+   * every retry pg-boss would give it
+   */
+  async failStale() {
+    const stale = await prisma.importJob.findMany({
+      where: { status: 'RUNNING', updatedAt: { lt: new Date(Date.now() - STALE_IMPORT_MS) } },
+      select: { id: true },
+    });
+    if (!stale.length) return;
+    const ids = stale.map((j) => j.id);
+    await prisma.$transaction([
+      prisma.importJobRow.deleteMany({ where: { importJobId: { in: ids } } }),
+      prisma.importJob.updateMany({
+        where: { id: { in: ids }, status: 'RUNNING' },
+        data: { status: 'FAILED', error: 'Import interrupted', finishedAt: new Date() },
+      }),
+    ]);
+  },
+
+  /**
+   * Insert one chunk in a single transaction, together with its progress. A
+   * unique violation (a user or employee code created concurrently elsewhere)
+   * retries the chunk, after re-checking which emails are now taken. Returns
+   * the number of users created.
+   */
+  async importChunk(jobId: string, actor: Actor, chunk: ValidRow[], roles: Map<string, string>) {
+    const errors: ImportRowError[] = [];
+    let rows = chunk.filter((r) => {
+      if (roles.has(r.data.role)) return true;
+      errors.push({ row: r.row, email: r.data.email, error: 'Role not found' });
+      return false;
+    });
+
+    // Rows without a password hold a random one until the email worker issues theirs
+    const passwords = new Map(rows.map((r) => [r.row, r.data.password || crypto.randomBytes(32).toString('hex')]));
+    const hashes = new Map<number, string>();
+    let ids = new Map<string, string>();
+
+    for (let attempt = 1; ; attempt++) {
+      const existing = await prisma.user.findMany({
+        where: { email: { in: rows.map((r) => r.data.email) } },
+        select: { email: true },
+      });
+      const taken = new Set(existing.map((u) => u.email));
+      rows = rows.filter((r) => {
+        if (!taken.has(r.data.email)) return true;
+        errors.push({ row: r.row, email: r.data.email, error: 'Email already registered' });
+        return false;
+      });
+      if (!rows.length) {
+        await prisma.$transaction((tx) => recordChunk(tx, jobId, chunk, 0, errors));
+        return 0;
+      }
+
+      const unhashed = rows.filter((r) => !hashes.has(r.row));
+      const hashed = await mapWithConcurrency(unhashed, HASH_CONCURRENCY, (r) => bcrypt.hash(passwords.get(r.row)!, config.bcryptRounds));
+      unhashed.forEach((r, i) => hashes.set(r.row, hashed[i]));
+
+      try {
+        await prisma.$transaction(
+          async (tx) => {
+            const codes = await ProfileService.reserveEmployeeCodes(tx, rows.map((r) => r.data.name));
+            const users = await tx.user.createManyAndReturn({
+              data: rows.map((r) => ({
+                email: r.data.email,
+                name: r.data.name,
+                passwordHash: hashes.get(r.row)!,
+                roleId: roles.get(r.data.role)!,
+                isActive: true,
+              })),
+              select: { id: true, email: true },
+            });
+            ids = new Map(users.map((u) => [u.email, u.id]));
+            await tx.employeeProfile.createMany({
+              data: rows.map((r, i) => ({
+                userId: ids.get(r.data.email)!,
+                employeeCode: codes[i],
+                department: r.data.department || null,
+                salary: r.data.salary || null,
+                metadata: { leaveBalance: DEFAULT_LEAVE_BALANCE } as any,
+              })),
+            });
+            await tx.auditLog.createMany({
+              data: rows.map((r) => ({
+                userId: actor.id,
+                action: 'USER_CREATE',
+                entity: 'User',
+                entityId: ids.get(r.data.email)!,
+                ip: actor.ip,
+                userAgent: actor.userAgent,
+                meta: { email: r.data.email, role: r.data.role, department: r.data.department, importJobId: jobId },
+              })),
+            });
+            await recordChunk(tx, jobId, chunk, rows.length, errors);
+          },
+          { timeout: 60_000 },
+        );
+        break;
+      } catch (e) {
+        if (!isUniqueViolation(e) || attempt >= CHUNK_ATTEMPTS) throw e;
+      }
+    }
+
+    // Same rule as createUser: the email worker issues and mails passwords for rows without one
+    await EmailQueueService.enqueueMany(
+      rows
+        .filter((r) => r.data.sendCredentials && !r.data.password)
+        .map((r) => {
+          const userId = ids.get(r.data.email)!;
+          return { job: { template: 'employee-credentials' as const, userId }, singletonKey: `credentials:${userId}` };
+        }),
+    ).catch((e) => console.error('Failed to queue credentials emails:', e));
+
+    return rows.length;
+  },
+
+  async get(jobId: string) {
+    const job = await prisma.importJob.findUnique({ where: { id: jobId } });
+    if (!job) throw new NotFoundError('Import job not found');
+    return job;
+  },
+};
@@ -1,10 +1,24 @@
 import * as bcrypt from 'bcrypt';
+import crypto from 'crypto';
 import { prisma } from '../services/prisma.service';
 import { AuditService } from './audit.service';
 import { ProfileService } from './profile.service';
+import { AnalyticsService } from './analytics.service';
+import { LiveKpiService } from './live-kpi.service';
 import { getBoss } from '../jobs/boss';
 import { generateMemorablePassword } from '../utils/password-generator';
-import { sendEmployeeCredentials } from './mailer.service';
+import { EmailQueueService } from './email-queue.service';
+
+// Opening leave balance for new employees
+export const DEFAULT_LEAVE_BALANCE = { SICK: 10, CASUAL: 12, EARNED: 15, UNPAID: 0 };
+
+/**
+ * Hash of a random secret nobody knows: holds the place of the password of an
+ * account whose credentials the email worker has yet to issue
+ */
+export function pendingPasswordHash() {
+  return bcrypt.hash(crypto.randomBytes(32).toString('hex'), 10);
+}
 
 export async function listUsers(params: { page?: number; limit?: number; role?: string; active?: boolean }) {
   const page = params.page && params.page > 0 ? params.page : 1;
@@ -51,9 +65,12 @@ export async function createUser(data: {
   const role = await prisma.role.findUnique({ where: { name: data.role ?? 'employee' } });
   if (!role) throw new Error('Role not found');
 
-  // Auto-generate password if not provided
-  const plainPassword = data.password || generateMemorablePassword();
-  const passwordHash = await bcrypt.hash(plainPassword, 10);
+  // Without a password, the email worker issues one when it sends the credentials
+  // email (default); if no email is wanted, one is generated here for the admin
+  const shouldSendEmail = data.sendCredentials !== false && !data.password;
+  let generatedPassword = (data.password || shouldSendEmail) ? undefined : generateMemorablePassword();
+  const plainPassword = data.password || generatedPassword;
+  const passwordHash = plainPassword ? await bcrypt.hash(plainPassword, 10) : await pendingPasswordHash();
   
   const user = await prisma.user.create({ 
     data: { 
@@ -74,7 +91,7 @@ export async function createUser(data: {
         employeeCode,
         department: data.department || null,
         salary: data.salary || null,
-        metadata: { leaveBalance: { SICK: 10, CASUAL: 12, EARNED: 15, UNPAID: 0 } } as any
+        metadata: { leaveBalance: DEFAULT_LEAVE_BALANCE } as any
       } 
     });
   } catch (e) {
@@ -91,27 +108,28 @@ export async function createUser(data: {
     userAgent: data.userAgent, 
     meta: { email: user.email, role: data.role ?? 'employee', department: data.department } 
   });
+  AnalyticsService.invalidateEmployees();
+  LiveKpiService.publish('user.created', {}, ['users']);
 
-  // Send credentials email if requested (default: true for auto-generated passwords)
-  const shouldSendEmail = data.sendCredentials !== false && !data.password;
+  // Queue the credentials email; the password is generated and delivered by the
+  // email worker, not on this request
+  let credentialsQueued = false;
   if (shouldSendEmail) {
     try {
-      await sendEmployeeCredentials({
-        to: user.email,
-        name: user.name,
-        email: user.email,
-        password: plainPassword,
-        role: data.role ?? 'employee',
-        department: data.department,
-      });
-      console.log(`✅ Credentials email sent to ${user.email}`);
+      await EmailQueueService.enqueue(
+        { template: 'employee-credentials', userId: user.id },
+        { singletonKey: `credentials:${user.id}` },
+      );
+      credentialsQueued = true;
     } catch (error) {
-      console.error('Failed to send credentials email:', error);
-      // Don't fail user creation if email fails
+      console.error('Failed to queue credentials email:', error);
+      // Don't fail user creation if email fails: hand the admin a password instead
+      generatedPassword = generateMemorablePassword();
+      await prisma.user.update({ where: { id: user.id }, data: { passwordHash: await bcrypt.hash(generatedPassword, 10) } });
     }
   }
 
-  return { user, generatedPassword: !data.password ? plainPassword : undefined };
+  return { user, generatedPassword, credentialsQueued };
 }
 
 export async function updateUser(id: string, data: { role?: 'employee'|'hr'|'payroll'|'admin'; isActive?: boolean; actorId: string; ip?: string; userAgent?: string; }) {
@@ -139,6 +157,8 @@ export async function updateUser(id: string, data: { role?: 'employee'|'hr'|'pay
   const updated = await prisma.user.update({ where: { id }, data: { roleId: roleId, isActive: data.isActive } });
 
   await AuditService.create({ userId: data.actorId, action: 'USER_UPDATE', entity: 'User', entityId: id, ip: data.ip, userAgent: data.userAgent, meta: { role: data.role, isActive: data.isActive } });
+  AnalyticsService.invalidateEmployees();
+  LiveKpiService.publish('user.updated', {}, ['users']);
 
   return updated;
 }
@@ -153,6 +173,8 @@ export async function deleteUser(id: string, actor: { id: string; ip?: string; u
   const updated = await prisma.user.update({ where: { id }, data: { isActive: false } });
 
   await AuditService.create({ userId: actor.id, action: 'USER_DELETE', entity: 'User', entityId: id, ip: actor.ip, userAgent: actor.userAgent });
+  AnalyticsService.invalidateEmployees();
+  LiveKpiService.publish('user.deleted', {}, ['users']);
 
   try {
     await getBoss().send('user_cleanup', { userId: id });
@@ -0,0 +1 @@
+declare module 'pg';
@@ -0,0 +1,8 @@
+/**
+ * Create a pg-boss queue, or bring an existing one's options up to date
+ */
+export async function ensureQueue(instance: any, name: string, options: Record<string, unknown>) {
+  const existing = await instance.getQueue(name);
+  if (existing) await instance.updateQueue(name, options);
+  else await instance.createQueue(name, options);
+}
@@ -0,0 +1,33 @@
+import { randomInt } from 'crypto';
+import os from 'os';
+
+/**
+ * Ids in the format Prisma's @default(cuid()) produces, for rows inserted with
+ * raw SQL: "c" + timestamp + counter + host fingerprint + random, base36.
+ */
+
+const BASE = 36;
+const BLOCK = 4;
+const DISCRETE = BASE ** BLOCK;
+
+const pad = (value: string, size: number) => value.padStart(size, '0').slice(-size);
+
+const fingerprint = (() => {
+  const host = os.hostname();
+  const hostId = Array.from(host).reduce((sum, ch) => sum + ch.charCodeAt(0), host.length + BASE);
+  return pad(process.pid.toString(BASE), 2) + pad(hostId.toString(BASE), 2);
+})();
+
+let counter = randomInt(DISCRETE);
+
+export function cuid() {
+  counter = (counter + 1) % DISCRETE;
+  return (
+    'c' +
+    Date.now().toString(BASE) +
+    pad(counter.toString(BASE), BLOCK) +
+    fingerprint +
+    pad(randomInt(DISCRETE).toString(BASE), BLOCK) +
+    pad(randomInt(DISCRETE).toString(BASE), BLOCK)
+  );
+}
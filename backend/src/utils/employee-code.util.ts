@@ -0,0 +1,39 @@
+import type { Prisma, PrismaClient } from '@prisma/client';
+
+// OI[first letter, second letter][year][serial], e.g. John Doe in 2025 → OIJD2500001
+export function formatEmployeeCode(userName: string, serial: number) {
+  const year = new Date().getFullYear().toString().slice(-2); // Last 2 digits of year
+  const sequence = String(serial).padStart(5, '0'); // 5-digit serial number
+
+  // Extract first two letters from name
+  const nameParts = userName.trim().split(/\s+/);
+  let initials = '';
+
+  if (nameParts.length >= 2) {
+    // First letter of first name + First letter of last name
+    initials = (nameParts[0][0] + nameParts[nameParts.length - 1][0]).toUpperCase();
+  } else if (nameParts.length === 1 && nameParts[0].length >= 2) {
+    // First two letters of single name
+    initials = nameParts[0].slice(0, 2).toUpperCase();
+  } else {
+    // Fallback: use first letter twice or XX
+    initials = nameParts[0] ? (nameParts[0][0] + nameParts[0][0]).toUpperCase() : 'XX';
+  }
+
+  return `OI${initials}${year}${sequence}`;
+}
+
+/**
+ * Employee codes for new profiles, one per name. Serials come from the
+ * employee_code_seq sequence, so they are never reissued: not after profiles
+ * are deleted, and not to concurrent callers (no lock needed). Serials taken
+ * by a transaction that rolls back are skipped.
+ */
+export async function nextEmployeeCodes(db: PrismaClient | Prisma.TransactionClient, userNames: string[]) {
+  if (!userNames.length) return [];
+  const rows = await db.$queryRaw<Array<{ serial: bigint }>>`
+    SELECT nextval('employee_code_seq') AS serial FROM generate_series(1, ${userNames.length}::int)
+  `;
+  const serials = rows.map((r) => Number(r.serial)).sort((a, b) => a - b);
+  return userNames.map((name, i) => formatEmployeeCode(name, serials[i]));
+}
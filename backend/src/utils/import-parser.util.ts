@@ -0,0 +1,98 @@
+/**
+ * Streaming parsers for bulk imports.
+ *
+ * Both consume the request body chunk by chunk, so a file is never held in
+ * memory as a whole; records are yielded as soon as they are complete.
+ */
+import { StringDecoder } from 'string_decoder';
+
+type Chunks = AsyncIterable<Buffer | string>;
+
+/**
+ * Decode UTF-8 chunks (split multi-byte characters are stitched together),
+ * dropping a leading byte order mark. Throws once more than `maxBytes` arrive.
+ */
+export async function* decodeText(input: Chunks, maxBytes: number, onLimit: () => Error): AsyncGenerator<string> {
+  const decoder = new StringDecoder('utf8');
+  let bytes = 0;
+  let first = true;
+  for await (const chunk of input) {
+    bytes += typeof chunk === 'string' ? Buffer.byteLength(chunk) : chunk.length;
+    if (bytes > maxBytes) throw onLimit();
+    let text = typeof chunk === 'string' ? chunk : decoder.write(chunk);
+    if (first && text) {
+      text = text.replace(/^\uFEFF/, '');
+      first = false;
+    }
+    if (text) yield text;
+  }
+  const rest = decoder.end();
+  if (rest) yield rest;
+}
+
+/**
+ * RFC 4180 CSV: yields the fields of each record. Quoted fields may contain
+ * commas, line breaks and doubled quotes; CRLF and LF both end a record.
+ * Blank lines are skipped.
+ */
+export async function* parseCsv(text: AsyncIterable<string>): AsyncGenerator<string[]> {
+  let field = '';
+  let record: string[] = [];
+  let inQuotes = false;
+  let afterQuote = false; // just closed a quoted section; a '"' here is an escaped quote
+
+  for await (const chunk of text) {
+    for (let i = 0; i < chunk.length; i++) {
+      const c = chunk[i];
+      if (inQuotes) {
+        if (c === '"') {
+          inQuotes = false;
+          afterQuote = true;
+        } else {
+          field += c;
+        }
+        continue;
+      }
+      if (c === '"') {
+        if (afterQuote) field += '"';
+        else if (field !== '') field += c; // stray quote inside an unquoted field
+        inQuotes = afterQuote || field === '';
+        afterQuote = false;
+        continue;
+      }
+      afterQuote = false;
+      if (c === ',') {
+        record.push(field);
+        field = '';
+      } else if (c === '\n') {
+        record.push(field);
+        if (record.length > 1 || record[0] !== '') yield record;
+        record = [];
+        field = '';
+      } else if (c !== '\r') {
+        field += c;
+      }
+    }
+  }
+  if (field !== '' || record.length) {
+    record.push(field);
+    yield record;
+  }
+}
+
+/**
+ * Newline-delimited text: yields each non-blank line, without its line ending.
+ */
+export async function* splitLines(text: AsyncIterable<string>): AsyncGenerator<string> {
+  let buffer = '';
+  for await (const chunk of text) {
+    buffer += chunk;
+    let end: number;
+    while ((end = buffer.indexOf('\n')) >= 0) {
+      const line = buffer.slice(0, end).replace(/\r$/, '');
+      buffer = buffer.slice(end + 1);
+      if (line.trim()) yield line;
+    }
+  }
+  if (buffer.trim()) yield buffer.replace(/\r$/, '');
+}
@@ -0,0 +1,206 @@
+/**
+ * Columnar snapshot writers.
+ *
+ * Each column is its own file, appended batch by batch: numeric columns as
+ * NumPy `.npy` arrays (memory-mappable with `np.load(path, mmap_mode='r')`),
+ * text columns as JSON arrays. String columns with few distinct values are
+ * dictionary-encoded into int16 codes (-1 for null).
+ */
+import fs, { FileHandle } from 'fs/promises';
+import os from 'os';
+import path from 'path';
+
+export type NpyDtype = '|b1' | '|i1' | '<i2' | '<i4' | '<i8' | '<f8' | '<M8[ms]';
+
+// Fixed header size so the row count can be patched in place on close (v1.0 headers are 64-byte aligned)
+const NPY_HEADER_BYTES = 128;
+// numpy.datetime64('NaT')
+const NAT = -(2n ** 63n);
+
+if (os.endianness() !== 'LE') {
+  throw new Error('Snapshot writers emit little-endian arrays and need a little-endian host');
+}
+
+function npyHeader(dtype: NpyDtype, rows: number) {
+  const dict = `{'descr': '${dtype}', 'fortran_order': False, 'shape': (${rows},), }`;
+  const buf = Buffer.alloc(NPY_HEADER_BYTES, 0x20);
+  buf.write('\x93NUMPY', 0, 'latin1');
+  buf[6] = 1;
+  buf[7] = 0;
+  buf.writeUInt16LE(NPY_HEADER_BYTES - 10, 8);
+  buf.write(dict, 10, 'latin1');
+  buf[NPY_HEADER_BYTES - 1] = 0x0a;
+  return buf;
+}
+
+function typed(dtype: NpyDtype, values: unknown[]): ArrayBufferView {
+  switch (dtype) {
+    case '|b1':
+      return Uint8Array.from(values, (v) => (v ? 1 : 0));
+    case '|i1':
+      return Int8Array.from(values as number[]);
+    case '<i2':
+      return Int16Array.from(values as number[]);
+    case '<i4':
+      return Int32Array.from(values as number[]);
+    case '<f8':
+      return Float64Array.from(values, (v) => (v == null ? NaN : Number(v)));
+    case '<i8':
+      return BigInt64Array.from(values, (v) => BigInt(v as number));
+    case '<M8[ms]':
+      return BigInt64Array.from(values, (v) => (v == null ? NAT : BigInt((v as Date).getTime())));
+  }
+}
+
+function encode(dtype: NpyDtype, values: unknown[]) {
+  const array = typed(dtype, values);
+  return Buffer.from(array.buffer, array.byteOffset, array.byteLength);
+}
+
+/** One `.npy` column, streamed to disk; the header's row count is written on close */
+export class NpyColumnWriter {
+  private rows = 0;
+
+  private constructor(private readonly handle: FileHandle, readonly dtype: NpyDtype) {}
+
+  static async open(file: string, dtype: NpyDtype) {
+    const handle = await fs.open(file, 'w');
+    await handle.write(npyHeader(dtype, 0));
+    return new NpyColumnWriter(handle, dtype);
+  }
+
+  async append(values: unknown[]) {
+    if (!values.length) return;
+    await this.handle.write(encode(this.dtype, values));
+    this.rows += values.length;
+  }
+
+  async close() {
+    await this.handle.write(npyHeader(this.dtype, this.rows), 0, NPY_HEADER_BYTES, 0);
+    await this.handle.close();
+    return this.rows;
+  }
+}
+
+/** A text column written as one JSON array */
+export class JsonColumnWriter {
+  private rows = 0;
+
+  private constructor(private readonly handle: FileHandle) {}
+
+  static async open(file: string) {
+    const handle = await fs.open(file, 'w');
+    await handle.write('[');
+    return new JsonColumnWriter(handle);
+  }
+
+  async append(values: unknown[]) {
+    if (!values.length) return;
+    const body = values.map((v) => JSON.stringify(v ?? null)).join(',');
+    await this.handle.write(this.rows ? `,${body}` : body);
+    this.rows += values.length;
+  }
+
+  async close() {
+    await this.handle.write(']\n');
+    await this.handle.close();
+    return this.rows;
+  }
+}
+
+export type ColumnSpec =
+  | { name: string; dtype: NpyDtype; scale?: number }
+  | { name: string; dtype: 'str' }
+  // Codes index into `dictionary`; a fixed dictionary (enum values) or one grown while writing
+  | { name: string; dtype: 'dict'; dictionary?: readonly string[] };
+
+export interface ColumnManifest {
+  file: string;
+  dtype: NpyDtype | 'str';
+  // Stored integer = value * 10^scale (e.g. money in cents)
+  scale?: number;
+  dictionary?: string[];
+}
+
+export interface TableManifest {
+  rows: number;
+  columns: Record<string, ColumnManifest>;
+}
+
+type OpenColumn = {
+  spec: ColumnSpec;
+  writer: NpyColumnWriter | JsonColumnWriter;
+  codes?: Map<string, number>;
+};
+
+/**
+ * A table of equally long columns under `<dir>/<name>/`. Rows are appended as
+ * column arrays; `close()` returns the table's manifest entry.
+ */
+export class SnapshotTable {
+  private rows = 0;
+
+  private constructor(readonly name: string, private readonly columns: OpenColumn[]) {}
+
+  static async open(dir: string, name: string, specs: ColumnSpec[]) {
+    await fs.mkdir(path.join(dir, name), { recursive: true });
+    const columns: OpenColumn[] = [];
+    for (const spec of specs) {
+      const file = path.join(dir, name, `${spec.name}${spec.dtype === 'str' ? '.json' : '.npy'}`);
+      if (spec.dtype === 'str') {
+        columns.push({ spec, writer: await JsonColumnWriter.open(file) });
+      } else if (spec.dtype === 'dict') {
+        const codes = new Map((spec.dictionary ?? []).map((value, i) => [value, i] as const));
+        columns.push({ spec, writer: await NpyColumnWriter.open(file, '<i2'), codes });
+      } else {
+        columns.push({ spec, writer: await NpyColumnWriter.open(file, spec.dtype) });
+      }
+    }
+    return new SnapshotTable(name, columns);
+  }
+
+  async append(batch: Record<string, unknown[]>) {
+    // Check the whole batch first so a bad one leaves every column untouched
+    const length = batch[this.columns[0].spec.name]?.length ?? 0;
+    for (const { spec } of this.columns) {
+      const values = batch[spec.name];
+      if (!values) throw new Error(`Snapshot table ${this.name}: missing column ${spec.name}`);
+      if (values.length !== length) {
+        throw new Error(`Snapshot table ${this.name}: column ${spec.name} has ${values.length} rows, expected ${length}`);
+      }
+    }
+    for (const { spec, writer, codes } of this.columns) {
+      const values = batch[spec.name];
+      await writer.append(codes ? values.map((v) => this.code(codes, spec.name, v)) : values);
+    }
+    this.rows += length;
+  }
+
+  private code(codes: Map<string, number>, column: string, value: unknown) {
+    if (value == null) return -1;
+    const key = String(value);
+    let code = codes.get(key);
+    if (code === undefined) {
+      code = codes.size;
+      if (code > 0x7fff) throw new Error(`Snapshot table ${this.name}: too many distinct values in ${column}`);
+      codes.set(key, code);
+    }
+    return code;
+  }
+
+  async close(): Promise<TableManifest> {
+    const columns: Record<string, ColumnManifest> = {};
+    for (const { spec, writer, codes } of this.columns) {
+      await writer.close();
+      const file = path.posix.join(this.name, `${spec.name}${spec.dtype === 'str' ? '.json' : '.npy'}`);
+      if (spec.dtype === 'dict') {
+        columns[spec.name] = { file, dtype: '<i2', dictionary: [...codes!.keys()] };
+      } else if (spec.dtype === 'str') {
+        columns[spec.name] = { file, dtype: 'str' };
+      } else {
+        columns[spec.name] = { file, dtype: spec.dtype, ...(spec.scale !== undefined && { scale: spec.scale }) };
+      }
+    }
+    return { rows: this.rows, columns };
+  }
+}
@@ -0,0 +1,58 @@
+/**
+ * Timezone helpers for attendance times.
+ *
+ * Attendance timestamps are stored in UTC; lateness is judged against the
+ * company timezone setting, not the server's.
+ */
+
+const formatters = new Map<string, Intl.DateTimeFormat>();
+
+function formatterFor(timeZone: string) {
+  let f = formatters.get(timeZone);
+  if (!f) {
+    f = new Intl.DateTimeFormat('en-GB', { timeZone, hour: '2-digit', minute: '2-digit', hourCycle: 'h23' });
+    formatters.set(timeZone, f);
+  }
+  return f;
+}
+
+/**
+ * Whether `timeZone` is an IANA zone name this runtime knows
+ */
+export function isValidTimeZone(timeZone: unknown): timeZone is string {
+  if (typeof timeZone !== 'string' || !timeZone) return false;
+  try {
+    new Intl.DateTimeFormat(undefined, { timeZone });
+    return true;
+  } catch {
+    return false;
+  }
+}
+
+/**
+ * Minute of the day (0-1439) of `date` in `timeZone`.
+ * Falls back to the server's local time for an unknown timezone.
+ */
+export function minuteOfDayInTimeZone(date: Date, timeZone: string): number {
+  try {
+    let hour = 0;
+    let minute = 0;
+    for (const part of formatterFor(timeZone).formatToParts(date)) {
+      if (part.type === 'hour') hour = Number(part.value);
+      else if (part.type === 'minute') minute = Number(part.value);
+    }
+    return hour * 60 + minute;
+  } catch {
+    return date.getHours() * 60 + date.getMinutes();
+  }
+}
+
+/**
+ * Parse an "HH:MM" clock time into minutes since midnight
+ */
+export function parseClockTime(value: unknown, fallback: number): number {
+  const match = typeof value === 'string' ? /^(\d{1,2}):(\d{2})$/.exec(value.trim()) : null;
+  if (!match) return fallback;
+  const minutes = Number(match[1]) * 60 + Number(match[2]);
+  return minutes < 24 * 60 ? minutes : fallback;
+}
@@ -0,0 +1,90 @@
+import express from 'express';
+import request from 'supertest';
+import { compressResponses } from '../src/middlewares/compression.middleware';
+import { conditionalGet } from '../src/middlewares/conditional-get.middleware';
+import { DataVersionService } from '../src/services/data-version.service';
+import { AnalyticsService } from '../src/services/analytics.service';
+import { cacheGet, cacheSet } from '../src/services/cache.service';
+
+// Collect the body as-is; not every superagent version decodes brotli
+function collectRaw(res: any, cb: (err: Error | null, body: Buffer) => void) {
+  const chunks: Buffer[] = [];
+  res.on('data', (c: Buffer) => chunks.push(c));
+  res.on('end', () => cb(null, Buffer.concat(chunks)));
+}
+
+function buildApp() {
+  let computed = 0;
+  const app = express();
+  app.use(compressResponses);
+  app.get('/report', conditionalGet('attendance'), (_req, res) => {
+    computed++;
+    res.json({ rows: Array.from({ length: 200 }, (_, i) => ({ day: i, present: i % 7 })) });
+  });
+  app.get('/small', (_req, res) => res.json({ ok: true }));
+  return { app, computed: () => computed };
+}
+
+describe('Conditional GET', () => {
+  it('answers 304 without running the handler until the version changes', async () => {
+    const { app, computed } = buildApp();
+
+    const first = await request(app).get('/report').expect(200);
+    const etag = first.headers.etag;
+    expect(etag).toMatch(/^"/);
+    expect(computed()).toBe(1);
+
+    await request(app).get('/report').set('If-None-Match', etag).expect(304);
+    expect(computed()).toBe(1);
+
+    DataVersionService.bump('attendance');
+    const after = await request(app).get('/report').set('If-None-Match', etag).expect(200);
+    expect(after.headers.etag).not.toBe(etag);
+    expect(computed()).toBe(2);
+  });
+
+  it('does not match unrelated domains', async () => {
+    const { app } = buildApp();
+    const first = await request(app).get('/report').expect(200);
+    DataVersionService.bump('payroll');
+    await request(app).get('/report').set('If-None-Match', first.headers.etag).expect(304);
+  });
+
+  it('records when each domain last changed', () => {
+    const before = Date.now();
+    DataVersionService.bump('leaves');
+    expect(DataVersionService.lastChange(['leaves'])).toBeGreaterThanOrEqual(before);
+    expect(DataVersionService.lastChange(['settings', 'leaves'])).toBe(DataVersionService.lastChange(['leaves']));
+  });
+
+  it('drops cached report bodies whenever a version is bumped', () => {
+    const helpers = ['invalidateAttendanceCache', 'invalidateLeaves', 'invalidatePayroll', 'invalidateEmployees'] as const;
+    for (const helper of helpers) {
+      cacheSet('report:company:test', { stale: true }, 300_000);
+      AnalyticsService[helper]();
+      expect(cacheGet('report:company:test')).toBeUndefined();
+    }
+  });
+});
+
+describe('Response compression', () => {
+  it('prefers brotli, falls back to gzip, and skips small bodies', async () => {
+    const { app } = buildApp();
+
+    const br = await request(app)
+      .get('/report')
+      .set('Accept-Encoding', 'br, gzip')
+      .buffer(true)
+      .parse(collectRaw)
+      .expect(200);
+    expect(br.headers['content-encoding']).toBe('br');
+    expect(br.headers.vary).toMatch(/Accept-Encoding/);
+
+    const gz = await request(app).get('/report').set('Accept-Encoding', 'gzip').expect(200);
+    expect(gz.headers['content-encoding']).toBe('gzip');
+    expect(gz.body.rows).toHaveLength(200);
+
+    const small = await request(app).get('/small').set('Accept-Encoding', 'br, gzip').expect(200);
+    expect(small.headers['content-encoding']).toBeUndefined();
+  });
+});
@@ -0,0 +1,178 @@
+import * as bcrypt from 'bcrypt';
+import net from 'net';
+import type { AddressInfo } from 'net';
+import PgBoss from 'pg-boss';
+import { config } from '../src/config';
+import { prisma } from '../src/services/prisma.service';
+import { closeMailer, isPermanentFailure, sendEmail } from '../src/services/mailer.service';
+import { EMAIL_DEAD_LETTER_QUEUE, EMAIL_QUEUE, EmailQueueService } from '../src/services/email-queue.service';
+import { createUser } from '../src/services/users.service';
+
+// Minimal SMTP stand-in: accepts everything except recipients starting with
+// "reject" (550) or "busy" (451), and can hold each DATA reply for a while
+function startSmtpStandIn() {
+  const state = { connections: 0, messages: [] as string[], dataDelayMs: 0 };
+  const server = net.createServer((socket) => {
+    state.connections++;
+    let buffer = '';
+    let inData = false;
+    const reply = (line: string) => socket.write(`${line}\r\n`);
+    reply('220 stand-in ESMTP');
+    socket.on('data', (chunk) => {
+      buffer += chunk.toString('utf8');
+      let end: number;
+      while (true) {
+        if (inData) {
+          end = buffer.indexOf('\r\n.\r\n');
+          if (end < 0) return;
+          state.messages.push(buffer.slice(0, end));
+          buffer = buffer.slice(end + 5);
+          inData = false;
+          setTimeout(() => reply('250 queued'), state.dataDelayMs);
+          continue;
+        }
+        end = buffer.indexOf('\r\n');
+        if (end < 0) return;
+        const line = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        const cmd = line.slice(0, 4).toUpperCase();
+        if (cmd === 'EHLO') reply('250 stand-in');
+        else if (cmd === 'RCPT' && /<reject/i.test(line)) reply('550 mailbox unavailable');
+        else if (cmd === 'RCPT' && /<busy/i.test(line)) reply('451 try again later');
+        else if (cmd === 'DATA') {
+          inData = true;
+          reply('354 go ahead');
+        } else if (cmd === 'QUIT') {
+          reply('221 bye');
+          socket.end();
+        } else reply('250 ok');
+      }
+    });
+    socket.on('error', () => undefined);
+  });
+  return new Promise<{ state: typeof state; port: number; close: () => Promise<void> }>((resolve) => {
+    server.listen(0, '127.0.0.1', () =>
+      resolve({
+        state,
+        port: (server.address() as AddressInfo).port,
+        close: () => new Promise((r) => server.close(() => r())),
+      }),
+    );
+  });
+}
+
+let smtp: Awaited<ReturnType<typeof startSmtpStandIn>>;
+let boss: any;
+const originalEmail = { ...config.email };
+
+beforeAll(async () => {
+  smtp = await startSmtpStandIn();
+  Object.assign(config.email, { host: '127.0.0.1', port: smtp.port, user: '', password: '', poolSize: 2, ratePerSecond: 50 });
+  closeMailer();
+  boss = new PgBoss({ connectionString: config.dbUrl, schema: config.boss.schema });
+  await boss.start();
+});
+
+afterAll(async () => {
+  EmailQueueService.detach();
+  await boss.stop({ graceful: false });
+  closeMailer();
+  Object.assign(config.email, originalEmail);
+  await smtp.close();
+  await prisma.$disconnect();
+});
+
+describe('Email delivery', () => {
+  it('reuses pooled SMTP connections across messages', async () => {
+    smtp.state.messages = [];
+    smtp.state.connections = 0;
+    await Promise.all(
+      Array.from({ length: 8 }, (_, i) => sendEmail({ to: `user${i}@test.local`, subject: `Pooled ${i}`, text: 'hello' })),
+    );
+    expect(smtp.state.messages).toHaveLength(8);
+    expect(smtp.state.connections).toBeLessThanOrEqual(2);
+  });
+
+  it('classifies 5xx rejections as permanent and 4xx as retryable', async () => {
+    const rejected = await sendEmail({ to: 'reject@test.local', subject: 'x', text: 'x' }).catch((e) => e);
+    expect(isPermanentFailure(rejected)).toBe(true);
+    const busy = await sendEmail({ to: 'busy@test.local', subject: 'x', text: 'x' }).catch((e) => e);
+    expect(busy).toBeInstanceOf(Error);
+    expect(isPermanentFailure(busy)).toBe(false);
+  });
+});
+
+describe('Email queue', () => {
+  beforeAll(async () => {
+    // Queues only: the handler is driven directly below
+    await EmailQueueService.attach(boss, { work: false });
+  });
+
+  it('dead-letters permanent rejections without the message body and rethrows transient failures', async () => {
+    const role = await prisma.role.findUniqueOrThrow({ where: { name: 'employee' } });
+    const stamp = Date.now();
+    const [rejected, busy] = await Promise.all(
+      ['reject', 'busy'].map((prefix) =>
+        prisma.user.create({
+          data: { email: `${prefix}_${stamp}@test.local`, name: 'Mail Test', passwordHash: 'x', roleId: role.id },
+        }),
+      ),
+    );
+    try {
+      const jobId = `test-${stamp}`;
+      await EmailQueueService.handle([{ id: jobId, data: { template: 'employee-credentials', userId: rejected.id } }]);
+      const dead = await boss.fetch(EMAIL_DEAD_LETTER_QUEUE, { batchSize: 100 });
+      const entry = (dead ?? []).find((j: any) => j.data.jobId === jobId);
+      expect(entry).toBeDefined();
+      expect(entry.data).toMatchObject({ template: 'employee-credentials', userId: rejected.id });
+      expect(entry.data.error.responseCode).toBe(550);
+      expect(Object.keys(entry.data).sort()).toEqual(['error', 'jobId', 'template', 'userId']);
+
+      await expect(
+        EmailQueueService.handle([{ id: `${jobId}-busy`, data: { template: 'employee-credentials', userId: busy.id } }]),
+      ).rejects.toBeInstanceOf(Error);
+    } finally {
+      await prisma.user.deleteMany({ where: { id: { in: [rejected.id, busy.id] } } });
+    }
+  });
+
+  it('queues only the template and user id, and issues the password at send time', async () => {
+    const admin = await prisma.user.findUniqueOrThrow({ where: { email: 'admin@workzen.com' } });
+    const { user, generatedPassword } = await createUser({ email: `credentials_${Date.now()}@test.local`, name: 'Credentials Mail', actorId: admin.id });
+    expect(generatedPassword).toBeUndefined();
+    try {
+      const [job] = (await boss.fetch(EMAIL_QUEUE, { batchSize: 100 })).filter((j: any) => j.data.userId === user.id);
+      expect(job.data).toEqual({ template: 'employee-credentials', userId: user.id });
+
+      smtp.state.messages = [];
+      await EmailQueueService.handle([job]);
+      expect(smtp.state.messages).toHaveLength(1);
+      // Undo quoted-printable soft breaks and escapes
+      const message = smtp.state.messages[0].replace(/=\r\n/g, '').replace(/=([0-9A-F]{2})/g, (_, hex) => String.fromCharCode(parseInt(hex, 16)));
+      const password = /- Password: (\S+)/.exec(message)![1];
+      const { passwordHash } = await prisma.user.findUniqueOrThrow({ where: { id: user.id } });
+      expect(await bcrypt.compare(password, passwordHash)).toBe(true);
+
+      // Once the account has signed in, a redelivered job leaves its password alone
+      await prisma.session.create({ data: { userId: user.id, token: `test-${user.id}`, expiresAt: new Date(Date.now() + 60_000) } });
+      smtp.state.messages = [];
+      await EmailQueueService.handle([job]);
+      expect(smtp.state.messages).toHaveLength(0);
+      expect((await prisma.user.findUniqueOrThrow({ where: { id: user.id } })).passwordHash).toBe(passwordHash);
+    } finally {
+      await prisma.user.delete({ where: { id: user.id } });
+    }
+  });
+
+  it('creates users without waiting for SMTP', async () => {
+    const admin = await prisma.user.findUniqueOrThrow({ where: { email: 'admin@workzen.com' } });
+    smtp.state.dataDelayMs = 3000;
+    const queuedBefore = await boss.getQueueSize(EMAIL_QUEUE);
+    const started = Date.now();
+    const { user } = await createUser({ email: `queued_${Date.now()}@test.local`, name: 'Queued Mail', actorId: admin.id });
+    expect(Date.now() - started).toBeLessThan(1500);
+    expect(await boss.getQueueSize(EMAIL_QUEUE)).toBe(queuedBefore + 1);
+    smtp.state.dataDelayMs = 0;
+    await prisma.user.delete({ where: { id: user.id } });
+  });
+});
@@ -0,0 +1,121 @@
+import http from 'http';
+import type { AddressInfo } from 'net';
+import request from 'supertest';
+import { createApp } from '../src/app';
+import { prisma } from '../src/services/prisma.service';
+import { LiveKpiService } from '../src/services/live-kpi.service';
+import { DataVersionService } from '../src/services/data-version.service';
+
+let server: http.Server;
+let baseUrl: string;
+let adminToken: string;
+let employeeToken: string;
+
+type SseEvent = { event: string; data: any };
+
+// Minimal SSE reader: collects parsed events until closed
+function openStream(token: string) {
+  const events: SseEvent[] = [];
+  let buffer = '';
+  const req = http.get(`${baseUrl}/v1/analytics/live`, { headers: { Authorization: `Bearer ${token}` } });
+  const ready = new Promise<http.IncomingMessage>((resolve) => req.on('response', resolve));
+  req.on('response', (res) => {
+    res.setEncoding('utf8');
+    res.on('data', (chunk: string) => {
+      buffer += chunk;
+      let end: number;
+      while ((end = buffer.indexOf('\n\n')) >= 0) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        const event = /^event: (.*)$/m.exec(block)?.[1];
+        const data = /^data: (.*)$/m.exec(block)?.[1];
+        if (event && data) events.push({ event, data: JSON.parse(data) });
+      }
+    });
+  });
+  req.on('error', () => undefined);
+  const waitFor = async (predicate: (e: SseEvent) => boolean, timeoutMs = 5000) => {
+    const deadline = Date.now() + timeoutMs;
+    while (Date.now() < deadline) {
+      const found = events.find(predicate);
+      if (found) return found;
+      await new Promise((r) => setTimeout(r, 20));
+    }
+    throw new Error('Timed out waiting for SSE event');
+  };
+  return { ready, events, waitFor, close: () => req.destroy() };
+}
+
+beforeAll(async () => {
+  const app = createApp();
+  server = app.listen(0);
+  baseUrl = `http://127.0.0.1:${(server.address() as AddressInfo).port}`;
+
+  const adminRes = await request(app).post('/v1/auth/login').send({ email: 'admin@workzen.com', password: 'password' }).expect(200);
+  adminToken = adminRes.body.accessToken;
+  const empRes = await request(app).post('/v1/auth/login').send({ email: 'employee@workzen.com', password: 'password' }).expect(200);
+  employeeToken = empRes.body.accessToken;
+});
+
+afterAll(async () => {
+  LiveKpiService.stop();
+  server.close();
+  await prisma.$disconnect();
+});
+
+describe('Live KPI stream', () => {
+  it('rejects roles without dashboard access', async () => {
+    const stream = openStream(employeeToken);
+    const res = await stream.ready;
+    expect(res.statusCode).toBe(403);
+    stream.close();
+  });
+
+  it('sends a snapshot, then pending-leave deltas for apply and cancel', async () => {
+    const stream = openStream(adminToken);
+    const res = await stream.ready;
+    expect(res.headers['content-type']).toMatch(/text\/event-stream/);
+
+    const snapshot = await stream.waitFor((e) => e.event === 'snapshot');
+    expect(typeof snapshot.data.kpis.pendingLeaveRequests).toBe('number');
+
+    const day = '2036-01-15';
+    const applied = await request(server)
+      .post('/v1/leaves/apply')
+      .set('Authorization', `Bearer ${employeeToken}`)
+      .send({ type: 'UNPAID', startDate: day, endDate: day })
+      .expect(201);
+
+    const appliedEvent = await stream.waitFor((e) => e.event === 'kpi' && e.data.source === 'leave.applied');
+    expect(appliedEvent.data.deltas).toEqual({ pendingLeaveRequests: 1 });
+    expect(appliedEvent.data.domains).toEqual(['leaves']);
+
+    await request(server)
+      .put(`/v1/leaves/${applied.body.id}/cancel`)
+      .set('Authorization', `Bearer ${employeeToken}`)
+      .expect(200);
+
+    const cancelled = await stream.waitFor((e) => e.event === 'kpi' && e.data.source === 'leave.cancelled');
+    expect(cancelled.data.deltas).toEqual({ pendingLeaveRequests: -1 });
+
+    stream.close();
+    await prisma.leaveRequest.delete({ where: { id: applied.body.id } });
+  });
+
+  it('bumps local data versions for writes made on other instances', async () => {
+    const stream = openStream(adminToken);
+    await stream.ready;
+    await stream.waitFor((e) => e.event === 'snapshot');
+
+    const users = DataVersionService.get('users');
+    const settings = DataVersionService.get('settings');
+    const event = { id: 'remote-1', source: 'settings.updated', deltas: {}, domains: ['users', 'settings'], origin: 'another-instance', at: Date.now() };
+    await prisma.$executeRaw`SELECT pg_notify('kpi_events', ${JSON.stringify(event)})`;
+
+    await stream.waitFor((e) => e.event === 'kpi' && e.data.source === 'settings.updated');
+    expect(DataVersionService.get('users')).toBe(users + 1);
+    expect(DataVersionService.get('settings')).toBe(settings + 1);
+
+    stream.close();
+  });
+});
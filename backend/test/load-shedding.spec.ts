@@ -0,0 +1,81 @@
+import express from 'express';
+import request from 'supertest';
+import { createApp } from '../src/app';
+import { AdaptiveLimiter, LoadSheddingService } from '../src/services/load-shedding.service';
+import { limitConcurrency } from '../src/middlewares/load-shed.middleware';
+
+function warm(limiter: AdaptiveLimiter, rttMs: number, samples: number, inflight: number) {
+  for (let i = 0; i < samples; i++) limiter.sample(rttMs, inflight);
+}
+
+describe('AdaptiveLimiter', () => {
+  it('grows while latency holds and shrinks when it rises', () => {
+    const limiter = new AdaptiveLimiter('test', { initialLimit: 10, minLimit: 2, maxLimit: 40 });
+    warm(limiter, 20, 50, 40);
+    expect(limiter.status().limit).toBe(40);
+
+    warm(limiter, 200, 20, 40);
+    expect(limiter.status().limit).toBeLessThan(20);
+    expect(limiter.status().limit).toBeGreaterThanOrEqual(2);
+  });
+
+  it('ignores latency while lightly used and backs off on failures', () => {
+    const limiter = new AdaptiveLimiter('test', { initialLimit: 20, minLimit: 1, maxLimit: 40 });
+    warm(limiter, 500, 30, 1);
+    expect(limiter.status().limit).toBe(20);
+    for (let i = 0; i < 10; i++) limiter.sample(10, 1, true);
+    expect(limiter.status().limit).toBeLessThan(20);
+  });
+
+  it('admits only the minimum while the lane it yields to is congested', () => {
+    const critical = new AdaptiveLimiter('critical', { initialLimit: 40, minLimit: 4, maxLimit: 40 });
+    const reports = new AdaptiveLimiter('reports', { initialLimit: 8, minLimit: 1, maxLimit: 8, yieldTo: critical });
+    warm(critical, 10, 30, 40);
+    expect(reports.status().limit).toBe(8);
+
+    const held = Array.from({ length: 4 }, () => critical.tryAcquire());
+    warm(critical, 100, 10, 40);
+    expect(critical.congested).toBe(true);
+    expect(reports.tryAcquire()).not.toBeNull();
+    expect(reports.tryAcquire()).toBeNull();
+    held.forEach((release) => release?.());
+  });
+});
+
+describe('limitConcurrency middleware', () => {
+  it('sheds requests over the limit with 503 and Retry-After', async () => {
+    const limiter = new AdaptiveLimiter('test', { initialLimit: 1, minLimit: 1, maxLimit: 1 });
+    let unblock!: () => void;
+    const blocked = new Promise<void>((r) => (unblock = r));
+    const app = express();
+    app.get('/slow', limitConcurrency(limiter), async (_req, res) => {
+      await blocked;
+      res.json({ ok: true });
+    });
+    const server = app.listen(0);
+
+    const first = request(server).get('/slow').then((r) => r);
+    await new Promise((r) => setTimeout(r, 50));
+    const shed = await request(server).get('/slow');
+    expect(shed.status).toBe(503);
+    expect(Number(shed.headers['retry-after'])).toBeGreaterThanOrEqual(1);
+
+    unblock();
+    expect((await first).status).toBe(200);
+    expect(limiter.status()).toMatchObject({ inflight: 0, accepted: 1, rejected: 1 });
+    await request(server).get('/slow').expect(200);
+    server.close();
+  });
+});
+
+describe('Lane placement', () => {
+  it('rejects unauthenticated requests before they take a lane slot', async () => {
+    const app = createApp();
+    const { transactional, analytical } = LoadSheddingService.lanes;
+    const before = [transactional.status().accepted, analytical.status().accepted];
+    await request(app).get('/v1/attendance').expect(401);
+    await request(app).post('/v1/payroll/run').expect(401);
+    await request(app).get('/v1/settings').set('Authorization', 'Bearer not-a-token').expect(401);
+    expect([transactional.status().accepted, analytical.status().accepted]).toEqual(before);
+  });
+});
@@ -0,0 +1,168 @@
+import type { Request, Response } from 'express';
+import { detectThreat, sanitizeInput, sanitizeString } from '../src/middlewares/sanitize.middleware';
+
+/**
+ * Reference implementation: the rule set the middleware has always enforced,
+ * evaluated one regex at a time. Fresh regexes per call keep it stateless.
+ */
+function referenceThreat(value: string): 'sql' | 'xss' | 'path' | null {
+  const sql = [
+    /(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE|UNION|DECLARE)\b)/gi,
+    /(--|;|\/\*|\*\/|xp_|sp_)/gi,
+    /('|('')|;|--|\/\*|\*\/)/gi,
+  ];
+  const xss = [
+    /<script[^>]*>.*?<\/script>/gi,
+    /<iframe[^>]*>.*?<\/iframe>/gi,
+    /javascript:/gi,
+    /on\w+\s*=/gi,
+    /<embed[^>]*>/gi,
+    /<object[^>]*>/gi,
+  ];
+  const path = [/\.\.[\/\\]/g, /[\/\\]\.\./g, /%2e%2e/gi, /%252e%252e/gi];
+  if (sql.some((p) => p.test(value))) return 'sql';
+  if (xss.some((p) => p.test(value))) return 'xss';
+  if (path.some((p) => p.test(value))) return 'path';
+  return null;
+}
+
+function referenceSanitize(value: string): string {
+  return value
+    .replace(/\0/g, '')
+    .trim()
+    .replace(/[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]/g, '');
+}
+
+const CORPUS = [
+  '',
+  'John Doe',
+  'john.doe@workzen.com',
+  '2025-11-01',
+  'cmhqpzj950007q6gi04rwv1yt',
+  'Engineering',
+  '  padded value  ',
+  'Sick leave for a family event',
+  "O'Brien",
+  'SELECT * FROM users',
+  'please select a date',
+  'selection',
+  'drop-off',
+  'a; b',
+  'x -- comment',
+  '/* block */',
+  'xp_cmdshell',
+  'wasp_nest',
+  '<script>alert(1)</script>',
+  '<SCRIPT src=x></SCRIPT>',
+  '<script>\nalert(1)</script>',
+  '<iframe src="x"></iframe>',
+  'javascript:void(0)',
+  'JavaScript:alert(1)',
+  'onclick=doIt()',
+  'button onload = run',
+  'one = two',
+  '<embed src=x>',
+  '<object data=x>',
+  '../etc/passwd',
+  '..\\windows',
+  'folder/..',
+  '%2e%2e/',
+  '%2E%2E',
+  '%252e%252e',
+  'version 1.2..3',
+  'tab\tseparated\nlines',
+  'null\0byte',
+  '\x01control\x7f',
+  ' \x02 leading control',
+  '\x03 a',
+  'union station',
+  'executive summary',
+  'DECLARE war',
+];
+
+function fuzzCorpus(count: number) {
+  const atoms = ['a', '0', ' ', '\n', '.', '/', '\\', '%', '2', 'e', '5', '<', '>', 'script', '/script', 'on', '=', 'select', "'", ';', '-', '*', 'xp_', 'javascript', ':', 'embed', '\x01'];
+  // Deterministic LCG so failures reproduce
+  let seed = 42;
+  const rand = () => {
+    seed = (seed * 1103515245 + 12345) & 0x7fffffff;
+    return seed / 0x7fffffff;
+  };
+  const out: string[] = [];
+  for (let i = 0; i < count; i++) {
+    let s = '';
+    const n = 1 + Math.floor(rand() * 8);
+    for (let j = 0; j < n; j++) s += atoms[Math.floor(rand() * atoms.length)];
+    out.push(s);
+  }
+  return out;
+}
+
+function run(req: Partial<Request>) {
+  let error: any;
+  sanitizeInput(req as Request, {} as Response, (err?: any) => {
+    error = err;
+  });
+  return error;
+}
+
+describe('Sanitizer equivalence with the reference rule set', () => {
+  it('classifies the corpus identically', () => {
+    for (const value of CORPUS) {
+      expect([value, detectThreat(value)]).toEqual([value, referenceThreat(value)]);
+    }
+  });
+
+  it('classifies fuzzed inputs identically', () => {
+    for (const value of fuzzCorpus(20_000)) {
+      expect([value, detectThreat(value)]).toEqual([value, referenceThreat(value)]);
+    }
+  });
+
+  it('strips control characters the same way', () => {
+    for (const value of CORPUS) {
+      expect(sanitizeString(value)).toBe(referenceSanitize(value));
+    }
+  });
+
+  it('does not carry state between calls', () => {
+    for (let i = 0; i < 5; i++) {
+      expect(detectThreat("it's")).toBe('sql');
+      expect(detectThreat('<embed src=x>')).toBe('xss');
+      expect(detectThreat('../x')).toBe('path');
+    }
+  });
+});
+
+describe('sanitizeInput middleware', () => {
+  it('skips requests without input', () => {
+    const body = {};
+    const req = { body, query: {}, params: {} };
+    expect(run(req)).toBeUndefined();
+    expect(req.body).toBe(body);
+  });
+
+  it('trims strings and reports the failing path', () => {
+    const req: any = { body: { name: '  Jane  ', tags: ['a '] }, query: {}, params: {} };
+    expect(run(req)).toBeUndefined();
+    expect(req.body).toEqual({ name: 'Jane', tags: ['a'] });
+
+    const err = run({ body: { items: [{ note: '<object data=x>' }] }, query: {}, params: {} });
+    expect(err.message).toBe('Potential XSS attack detected in body.items[0].note');
+  });
+
+  it('rejects invalid field names and non-finite numbers', () => {
+    expect(run({ body: { 'bad key': 1 } }).message).toBe('Invalid field name: bad key');
+    expect(run({ body: { '.hidden': 1 } }).message).toBe('Invalid field name: .hidden');
+    expect(run({ body: { n: Infinity } }).message).toBe('Invalid number value in body.n');
+  });
+
+  it('caps nesting depth and payload size', () => {
+    let deep: any = 'x';
+    for (let i = 0; i < 40; i++) deep = { d: deep };
+    expect(run({ body: deep }).statusCode).toBe(400);
+
+    const wide = { items: Array.from({ length: 60_000 }, () => 1) };
+    expect(run({ body: wide }).message).toBe('Input contains too many fields');
+  });
+});
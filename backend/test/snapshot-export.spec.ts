@@ -0,0 +1,99 @@
+import fs from 'fs';
+import os from 'os';
+import path from 'path';
+import { prisma } from '../src/services/prisma.service';
+import { SnapshotExportService } from '../src/services/snapshot-export.service';
+import { SettingsService } from '../src/services/settings.service';
+import { NpyColumnWriter, SnapshotTable } from '../src/utils/snapshot-writer.util';
+
+let dir: string;
+
+// Parse a .npy v1.0 file: header dict and raw data
+function readNpy(file: string) {
+  const buf = fs.readFileSync(file);
+  expect(buf.subarray(0, 6).toString('latin1')).toBe('\x93NUMPY');
+  const headerLength = buf.readUInt16LE(8);
+  expect((10 + headerLength) % 64).toBe(0);
+  const header = buf.subarray(10, 10 + headerLength).toString('latin1');
+  return {
+    descr: /'descr': '([^']+)'/.exec(header)![1],
+    rows: Number(/'shape': \((\d+),\)/.exec(header)![1]),
+    data: buf.subarray(10 + headerLength),
+  };
+}
+
+beforeAll(() => {
+  dir = fs.mkdtempSync(path.join(os.tmpdir(), 'snapshot-'));
+});
+
+afterAll(async () => {
+  fs.rmSync(dir, { recursive: true, force: true });
+  await prisma.$disconnect();
+});
+
+describe('Snapshot writers', () => {
+  it('streams .npy columns and patches the row count on close', async () => {
+    const file = path.join(dir, 'dates.npy');
+    const writer = await NpyColumnWriter.open(file, '<M8[ms]');
+    await writer.append([new Date(86_400_000), null]);
+    await writer.append([new Date(0)]);
+    expect(await writer.close()).toBe(3);
+
+    const npy = readNpy(file);
+    expect(npy).toMatchObject({ descr: '<M8[ms]', rows: 3 });
+    expect([0, 1, 2].map((i) => npy.data.readBigInt64LE(i * 8))).toEqual([86_400_000n, -(2n ** 63n), 0n]);
+  });
+
+  it('dictionary-encodes text columns and records the dictionary', async () => {
+    const table = await SnapshotTable.open(dir, 'people', [
+      { name: 'name', dtype: 'str' },
+      { name: 'department', dtype: 'dict' },
+      { name: 'status', dtype: 'dict', dictionary: ['ACTIVE', 'LEFT'] },
+    ]);
+    await table.append({ name: ['Ada', 'Linus'], department: ['Engineering', null], status: ['LEFT', 'ACTIVE'] });
+    await table.append({ name: ['Grace'], department: ['Engineering'], status: ['ACTIVE'] });
+    await expect(table.append({ name: ['x'], department: [], status: ['ACTIVE'] })).rejects.toThrow(/department/);
+    const manifest = await table.close();
+
+    expect(manifest.rows).toBe(3);
+    expect(manifest.columns.department).toEqual({ file: 'people/department.npy', dtype: '<i2', dictionary: ['Engineering'] });
+    expect(manifest.columns.status.dictionary).toEqual(['ACTIVE', 'LEFT']);
+    expect(JSON.parse(fs.readFileSync(path.join(dir, 'people/name.json'), 'utf8'))).toEqual(['Ada', 'Linus', 'Grace']);
+    const codes = readNpy(path.join(dir, 'people/department.npy'));
+    expect([0, 1, 2].map((i) => codes.data.readInt16LE(i * 2))).toEqual([0, -1, 0]);
+  });
+});
+
+describe('SnapshotExportService', () => {
+  it('exports every table with row counts matching the database', async () => {
+    const out = path.join(dir, 'export');
+    const manifest = await SnapshotExportService.export(out, { batchSize: 7 });
+
+    expect(manifest.tables.users.rows).toBe(await prisma.user.count());
+    expect(manifest.tables.attendance.rows).toBe(await prisma.attendance.count());
+    expect(manifest.tables.payslips.rows).toBe(await prisma.payslip.count());
+    expect(manifest.tables.leave_requests.rows).toBe(await prisma.leaveRequest.count());
+    expect(JSON.parse(fs.readFileSync(path.join(out, 'manifest.json'), 'utf8'))).toEqual(manifest);
+    expect(manifest.companyTimeZone).toBe((await SettingsService.getByCategory('company')).timezone);
+
+    for (const table of Object.values(manifest.tables)) {
+      for (const column of Object.values(table.columns)) {
+        if (column.dtype === 'str') continue;
+        expect(readNpy(path.join(out, column.file)).rows).toBe(table.rows);
+      }
+    }
+
+    // Row indexes in `user` columns point at the users table
+    const ids: string[] = JSON.parse(fs.readFileSync(path.join(out, 'users/id.json'), 'utf8'));
+    const leaveUsers = readNpy(path.join(out, 'leave_requests/user.npy'));
+    const exported = Array.from({ length: leaveUsers.rows }, (_, i) => ids[leaveUsers.data.readInt32LE(i * 4)]).sort();
+    const actual = (await prisma.leaveRequest.findMany({ select: { userId: true } })).map((l) => l.userId).sort();
+    expect(exported).toEqual(actual);
+
+    const cents = readNpy(path.join(out, 'payslips/gross.npy'));
+    let total = 0n;
+    for (let i = 0; i < cents.rows; i++) total += cents.data.readBigInt64LE(i * 8);
+    const { _sum } = await prisma.payslip.aggregate({ _sum: { gross: true } });
+    expect(Number(total) / 100).toBeCloseTo(Number(_sum.gross ?? 0), 2);
+  });
+});
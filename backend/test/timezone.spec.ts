@@ -0,0 +1,38 @@
+import { isValidTimeZone, minuteOfDayInTimeZone, parseClockTime } from '../src/utils/timezone.util';
+
+describe('minuteOfDayInTimeZone', () => {
+  it('uses the given timezone rather than the server clock', () => {
+    const at = new Date('2025-11-03T04:05:00Z');
+    expect(minuteOfDayInTimeZone(at, 'UTC')).toBe(4 * 60 + 5);
+    expect(minuteOfDayInTimeZone(at, 'Asia/Kolkata')).toBe(9 * 60 + 35);
+    expect(minuteOfDayInTimeZone(new Date('2025-11-03T00:10:00Z'), 'America/New_York')).toBe(19 * 60 + 10);
+  });
+
+  it('reports midnight as minute zero', () => {
+    expect(minuteOfDayInTimeZone(new Date('2025-11-03T18:30:00Z'), 'Asia/Kolkata')).toBe(0);
+  });
+
+  it('falls back to server time for an unknown timezone', () => {
+    const at = new Date('2025-11-03T04:05:00Z');
+    expect(minuteOfDayInTimeZone(at, 'Not/AZone')).toBe(at.getHours() * 60 + at.getMinutes());
+  });
+});
+
+describe('parseClockTime', () => {
+  it('parses HH:MM and rejects anything else', () => {
+    expect(parseClockTime('09:15', 0)).toBe(555);
+    expect(parseClockTime('9:00', 0)).toBe(540);
+    expect(parseClockTime('25:00', 42)).toBe(42);
+    expect(parseClockTime(undefined, 42)).toBe(42);
+  });
+});
+
+describe('isValidTimeZone', () => {
+  it('accepts IANA zones and rejects everything else', () => {
+    expect(isValidTimeZone('Asia/Kolkata')).toBe(true);
+    expect(isValidTimeZone('UTC')).toBe(true);
+    expect(isValidTimeZone('Not/AZone')).toBe(false);
+    expect(isValidTimeZone('')).toBe(false);
+    expect(isValidTimeZone(330)).toBe(false);
+  });
+});
@@ -0,0 +1,167 @@
+import request from 'supertest';
+import { createApp } from '../src/app';
+import { prisma } from '../src/services/prisma.service';
+import { UserImportService } from '../src/services/user-import.service';
+import { parseCsv, splitLines } from '../src/utils/import-parser.util';
+import { nextEmployeeCodes } from '../src/utils/employee-code.util';
+
+let app: ReturnType<typeof createApp>;
+let adminToken: string;
+const stamp = Date.now();
+
+async function collect<T>(gen: AsyncGenerator<T>) {
+  const out: T[] = [];
+  for await (const item of gen) out.push(item);
+  return out;
+}
+
+async function* chunks(...parts: string[]) {
+  yield* parts;
+}
+
+async function waitForJob(jobId: string) {
+  const deadline = Date.now() + 30000;
+  while (Date.now() < deadline) {
+    const res = await request(app).get(`/v1/users/import/${jobId}`).set('Authorization', `Bearer ${adminToken}`).expect(200);
+    if (res.body.status !== 'RUNNING') return res.body;
+    await new Promise((r) => setTimeout(r, 100));
+  }
+  throw new Error('Import did not finish');
+}
+
+beforeAll(async () => {
+  app = createApp();
+  const res = await request(app).post('/v1/auth/login').send({ email: 'admin@workzen.com', password: 'password' }).expect(200);
+  adminToken = res.body.accessToken;
+});
+
+afterAll(async () => {
+  await prisma.user.deleteMany({ where: { email: { endsWith: `.${stamp}@import.test` } } });
+  await prisma.$disconnect();
+});
+
+describe('Import parsers', () => {
+  it('parses quoted CSV fields split across chunks', async () => {
+    const records = await collect(parseCsv(chunks('name,note\r\n"Doe, J', 'ane","said ""hi""\nacross lines"\r\n\r\nplain,', 'x')));
+    expect(records).toEqual([
+      ['name', 'note'],
+      ['Doe, Jane', 'said "hi"\nacross lines'],
+      ['plain', 'x'],
+    ]);
+  });
+
+  it('splits NDJSON lines across chunks', async () => {
+    const lines = await collect(splitLines(chunks('{"a":1}\r\n{"a"', ':2}\n\n{"a":3}')));
+    expect(lines).toEqual(['{"a":1}', '{"a":2}', '{"a":3}']);
+  });
+});
+
+describe('Bulk user import', () => {
+  it('imports valid CSV rows and reports per-row errors', async () => {
+    const csv = [
+      'email,name,password,role,department,salary,sendCredentials',
+      `ada.${stamp}@import.test,Ada Lovelace,Password123,employee,Engineering,52000,false`,
+      `grace.${stamp}@import.test,"Hopper, Grace",,hr,,,`,
+      'not-an-email,Broken Row,,employee,,,',
+      `ada.${stamp}@import.test,Ada Again,,employee,,,`,
+      'admin@workzen.com,Existing Admin,,admin,,,',
+      `alan.${stamp}@import.test,Alan Turing,,employee,,,no`,
+    ].join('\n');
+
+    const res = await request(app)
+      .post('/v1/users/import')
+      .set('Authorization', `Bearer ${adminToken}`)
+      .set('Content-Type', 'text/csv')
+      .send(csv)
+      .expect(202);
+    expect(res.body).toMatchObject({ total: 6, invalid: 3 });
+
+    const job = await waitForJob(res.body.jobId);
+    expect(job).toMatchObject({ status: 'SUCCEEDED', total: 6, processed: 6, created: 2, failed: 4 });
+    const byRow = Object.fromEntries(job.errors.map((e: any) => [e.row, e.error]));
+    expect(byRow[3]).toMatch(/email/);
+    expect(byRow[4]).toBe('Duplicate email in file');
+    expect(byRow[5]).toBe('Email already registered');
+    // No password and no credentials email: the account could never sign in
+    expect(byRow[6]).toBe('password: required when sendCredentials is false');
+
+    const users = await prisma.user.findMany({
+      where: { email: { endsWith: `.${stamp}@import.test` } },
+      include: { profile: true, role: true },
+      orderBy: { email: 'asc' },
+    });
+    expect(users.map((u) => [u.name, u.role.name])).toEqual([
+      ['Ada Lovelace', 'employee'],
+      ['Hopper, Grace', 'hr'],
+    ]);
+    expect(users[0].profile?.department).toBe('Engineering');
+    expect(new Set(users.map((u) => u.profile?.employeeCode)).size).toBe(2);
+  });
+
+  it('accepts NDJSON and rejects unknown content types', async () => {
+    const ndjson = [
+      JSON.stringify({ email: `linus.${stamp}@import.test`, name: 'Linus', password: 'Password123', sendCredentials: false }),
+      '{not json',
+      JSON.stringify({ email: `mallory.${stamp}@import.test`, name: '<script>alert(1)</script>' }),
+    ].join('\n');
+    const res = await request(app)
+      .post('/v1/users/import')
+      .set('Authorization', `Bearer ${adminToken}`)
+      .set('Content-Type', 'application/x-ndjson')
+      .send(ndjson)
+      .expect(202);
+    const job = await waitForJob(res.body.jobId);
+    expect(job).toMatchObject({ status: 'SUCCEEDED', created: 1, failed: 2 });
+    expect(job.errors.find((e: any) => e.row === 3)).toMatchObject({ error: 'Potential XSS attack detected in name' });
+    expect(await prisma.user.count({ where: { email: `mallory.${stamp}@import.test` } })).toBe(0);
+
+    await request(app)
+      .post('/v1/users/import')
+      .set('Authorization', `Bearer ${adminToken}`)
+      .set('Content-Type', 'application/xml')
+      .send('<users/>')
+      .expect(415);
+  });
+
+  it('never reissues employee codes after profiles are deleted', async () => {
+    const serial = (code: string) => Number(code.slice(6));
+    const grace = await prisma.user.findUniqueOrThrow({ where: { email: `grace.${stamp}@import.test` }, include: { profile: true } });
+    await prisma.user.delete({ where: { id: grace.id } });
+
+    const codes = await nextEmployeeCodes(prisma, ['Code Test', 'Code Test']);
+    expect(new Set(codes).size).toBe(2);
+    expect(Math.min(...codes.map(serial))).toBeGreaterThan(serial(grace.profile!.employeeCode));
+    expect(await prisma.employeeProfile.count({ where: { employeeCode: { in: codes } } })).toBe(0);
+  });
+
+  it('resumes an interrupted import from its staged rows', async () => {
+    const admin = await prisma.user.findUniqueOrThrow({ where: { email: 'admin@workzen.com' } });
+    // As left by a worker that died after the first chunk: one row written, one staged
+    const job = await prisma.importJob.create({
+      data: {
+        userId: admin.id,
+        total: 2,
+        processed: 1,
+        created: 1,
+        rows: { create: { row: 2, data: { email: `resumed.${stamp}@import.test`, name: 'Resumed Row', password: 'Password123', role: 'employee', sendCredentials: false } } },
+      },
+    });
+
+    await UserImportService.handle([{ id: 'retry', data: { jobId: job.id, actor: { id: admin.id } }, retryCount: 1, retryLimit: 5 }]);
+    expect(await waitForJob(job.id)).toMatchObject({ status: 'SUCCEEDED', processed: 2, created: 2, failed: 0 });
+    expect(await prisma.user.count({ where: { email: `resumed.${stamp}@import.test` } })).toBe(1);
+    expect(await prisma.importJobRow.count({ where: { importJobId: job.id } })).toBe(0);
+  });
+
+  it('fails imports left running by a worker that never came back', async () => {
+    const job = await prisma.importJob.create({
+      data: { total: 1, rows: { create: { row: 1, data: { email: `stale.${stamp}@import.test`, name: 'Stale Row' } } } },
+    });
+    await prisma.$executeRaw`UPDATE "ImportJob" SET "updatedAt" = now() - interval '1 day' WHERE id = ${job.id}`;
+
+    await UserImportService.failStale();
+    expect(await prisma.importJob.findUniqueOrThrow({ where: { id: job.id } })).toMatchObject({ status: 'FAILED', error: 'Import interrupted' });
+    expect(await prisma.importJobRow.count({ where: { importJobId: job.id } })).toBe(0);
+    await prisma.importJob.delete({ where: { id: job.id } });
+  });
+});
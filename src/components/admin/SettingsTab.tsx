@@ -158,6 +158,16 @@ export function SettingsTab() {
                   disabled={loading}
                 />
               </div>
+              <div className="space-y-2">
+                <Label htmlFor="office-start">Office Start Time</Label>
+                <Input
+                  id="office-start"
+                  type="time"
+                  value={settings.attendance.officeStartTime || ''}
+                  onChange={(e) => handleChange('attendance', 'officeStartTime', e.target.value)}
+                  disabled={loading}
+                />
+              </div>
               <div className="space-y-2">
                 <Label htmlFor="grace-time">Grace Time (minutes)</Label>
                 <Input 
@@ -1,6 +1,9 @@
-import { createContext, useContext, useState, useEffect, ReactNode } from 'react';
+import { createContext, useContext, useState, useEffect, useRef, ReactNode } from 'react';
 import { useNavigate } from 'react-router-dom';
 import { authApi, apiClient } from '@/lib/api';
+import { queryClient } from '@/lib/react-query';
+import { persistQueries, restorePersistedQueries, clearPersistedQueries } from '@/lib/query-persister';
+import { prefetchDashboard } from '@/lib/dashboard-queries';
 
 export type UserRole = 'employee' | 'hr' | 'payroll' | 'admin';
 
@@ -24,22 +27,58 @@ const AuthContext = createContext<AuthContextType | undefined>(undefined);
 
 // No mock users: enforce backend-only auth
 
+// Don't hold the first render for a slow IndexedDB
+const RESTORE_TIMEOUT_MS = 300;
+
+const restoreCache = (userId: string) =>
+  Promise.race([
+    restorePersistedQueries(queryClient, userId),
+    new Promise<void>((resolve) => setTimeout(resolve, RESTORE_TIMEOUT_MS)),
+  ]);
+
 export function AuthProvider({ children }: { children: ReactNode }) {
   const [user, setUser] = useState<User | null>(null);
   const [isLoading, setIsLoading] = useState(true);
   const navigate = useNavigate();
 
+  // Persist dashboard query results for the signed-in user. Started before the
+  // dashboard prefetch so its results are written too; idempotent per user.
+  const persisting = useRef<{ userId: string; stop: () => void }>();
+  const startPersisting = (userId: string) => {
+    if (persisting.current?.userId === userId) return;
+    persisting.current?.stop();
+    persisting.current = { userId, stop: persistQueries(queryClient, userId) };
+  };
+  const stopPersisting = () => {
+    persisting.current?.stop();
+    persisting.current = undefined;
+  };
+
   useEffect(() => {
     const storedUser = localStorage.getItem('workzen_user');
     const storedToken = localStorage.getItem('workzen_access_token');
     
     if (storedUser && storedToken) {
-      setUser(JSON.parse(storedUser));
+      const parsed: User = JSON.parse(storedUser);
+      setUser(parsed);
       apiClient.setAccessToken(storedToken);
+      // Render the last known dashboard data right away, then revalidate it
+      restoreCache(parsed.id).finally(() => {
+        startPersisting(parsed.id);
+        prefetchDashboard(parsed.role);
+        setIsLoading(false);
+      });
+      return;
     }
     setIsLoading(false);
   }, []);
 
+  useEffect(() => {
+    if (!user) return;
+    startPersisting(user.id);
+    return stopPersisting;
+  }, [user?.id]);
+
   const login = async (email: string, password: string) => {
     try {
       // Call backend API
@@ -56,6 +95,10 @@ export function AuthProvider({ children }: { children: ReactNode }) {
         role: response.user.role as UserRole,
       };
       
+      await restoreCache(user.id);
+      startPersisting(user.id);
+      prefetchDashboard(user.role);
+
       setUser(user);
       localStorage.setItem('workzen_user', JSON.stringify(user));
       localStorage.setItem('workzen_access_token', response.accessToken);
@@ -89,6 +132,10 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     } finally {
       // Clear local state regardless
       apiClient.setAccessToken(null);
+      // Stop pending writes first, then drop every user's entries from this device
+      stopPersisting();
+      await clearPersistedQueries();
+      queryClient.clear();
       setUser(null);
       localStorage.removeItem('workzen_user');
       localStorage.removeItem('workzen_access_token');
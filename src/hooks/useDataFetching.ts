@@ -3,6 +3,10 @@ import { queryKeys, invalidateQueries } from '@/lib/react-query';
 import * as api from '@/lib/api';
 import { toast } from 'sonner';
 
+// All queries below go through apiClient.get, which revalidates analytics and
+// report endpoints with If-None-Match: an unchanged result costs a 304 and the
+// previous body is reused, so refetching on staleTime is cheap.
+
 // ==================== ATTENDANCE HOOKS ====================
 
 export function useAttendance(filters?: any) {
@@ -0,0 +1,43 @@
+import { useEffect } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import { queryKeys } from '@/lib/react-query';
+import { subscribeLiveKpis } from '@/lib/live-kpis';
+
+type Overview = { totalEmployees: number; presentToday: number; onLeaveToday: number; pendingLeaveRequests: number; avgAttendance: number };
+
+/**
+ * Keep the cached analytics overview current from the live KPI stream instead
+ * of polling; other dashboard queries are invalidated when their domain changes.
+ */
+export function useLiveKpis(enabled = true) {
+  const queryClient = useQueryClient();
+
+  useEffect(() => {
+    if (!enabled) return;
+    return subscribeLiveKpis({
+      onSnapshot: (kpis) => {
+        queryClient.setQueryData(queryKeys.analytics.overview, kpis);
+      },
+      onDelta: ({ deltas, domains }) => {
+        queryClient.setQueryData<Overview>(queryKeys.analytics.overview, (current) => {
+          if (!current) return current;
+          const next = { ...current };
+          for (const [name, delta] of Object.entries(deltas)) {
+            const key = name as keyof Overview;
+            next[key] = Math.max(0, (next[key] ?? 0) + (delta ?? 0));
+          }
+          return next;
+        });
+        if (domains.includes('attendance')) {
+          queryClient.invalidateQueries({ queryKey: ['analytics', 'attendance'] });
+        }
+        if (domains.includes('payroll')) {
+          queryClient.invalidateQueries({ queryKey: ['analytics', 'payroll'] });
+        }
+      },
+      onResync: () => {
+        queryClient.invalidateQueries({ queryKey: queryKeys.analytics.overview });
+      },
+    });
+  }, [enabled, queryClient]);
+}
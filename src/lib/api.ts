@@ -4,9 +4,14 @@ interface ApiError {
   error: string | object;
 }
 
+// Upper bound on remembered ETag/body pairs for conditional GETs
+const MAX_CONDITIONAL_ENTRIES = 100;
+
 class ApiClient {
   private baseURL: string;
   private accessToken: string | null = null;
+  // Last validator and body per GET endpoint; revalidated with If-None-Match
+  private conditional = new Map<string, { etag: string; data: unknown }>();
 
   constructor(baseURL: string) {
     this.baseURL = baseURL;
@@ -15,6 +20,8 @@ class ApiClient {
   }
 
   setAccessToken(token: string | null) {
+    // Cached bodies belong to the previous session
+    if (token !== this.accessToken) this.conditional.clear();
     this.accessToken = token;
   }
 
@@ -35,12 +42,23 @@ class ApiClient {
       headers['Authorization'] = `Bearer ${this.accessToken}`;
     }
 
+    const isGet = (options.method ?? 'GET') === 'GET';
+    const previous = isGet ? this.conditional.get(endpoint) : undefined;
+    if (previous) {
+      headers['If-None-Match'] = previous.etag;
+    }
+
     const response = await fetch(`${this.baseURL}${endpoint}`, {
       ...options,
       headers,
       credentials: 'include', // Important for cookies (refresh token)
     });
 
+    // Unchanged since the last poll: reuse the body we already have
+    if (response.status === 304 && previous) {
+      return previous.data as T;
+    }
+
     if (!response.ok) {
       const error: ApiError = await response.json().catch(() => ({
         error: 'Request failed',
@@ -50,7 +68,39 @@ class ApiClient {
       );
     }
 
-    return response.json();
+    const data = await response.json();
+
+    const etag = isGet ? response.headers.get('ETag') : null;
+    if (etag) {
+      this.conditional.delete(endpoint);
+      this.conditional.set(endpoint, { etag, data });
+      if (this.conditional.size > MAX_CONDITIONAL_ENTRIES) {
+        this.conditional.delete(this.conditional.keys().next().value as string);
+      }
+    }
+
+    return data;
+  }
+
+  /**
+   * Open a long-lived streaming response (e.g. Server-Sent Events). Uses fetch
+   * rather than EventSource so the bearer token travels in a header.
+   */
+  async stream(endpoint: string, signal: AbortSignal): Promise<Response> {
+    const headers: Record<string, string> = { Accept: 'text/event-stream' };
+    if (this.accessToken) {
+      headers['Authorization'] = `Bearer ${this.accessToken}`;
+    }
+    const response = await fetch(`${this.baseURL}${endpoint}`, {
+      headers,
+      signal,
+      credentials: 'include',
+      cache: 'no-store',
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Stream request failed (${response.status})`);
+    }
+    return response;
   }
 
   async get<T>(endpoint: string): Promise<T> {
@@ -270,6 +320,7 @@ export const settingsApi = {
     };
     attendance: {
       minHoursPerDay: number;
+      officeStartTime: string;
       graceTimeMinutes: number;
       workingDays: string;
       autoMarkAbsentAfterDays: number;
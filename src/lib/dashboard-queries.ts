@@ -0,0 +1,77 @@
+import { queryOptions } from '@tanstack/react-query';
+import { analyticsApi, usersApi, adminApi, profileApi } from './api';
+import { queryClient, queryKeys } from './react-query';
+
+/**
+ * Query definitions behind the role dashboards.
+ *
+ * Shared by the dashboard pages and by the post-login prefetch, so both hit the
+ * same cache entries. Aggregates are persisted (see query-persister.ts): a
+ * reload renders the last known values immediately and revalidates them.
+ * Audit entries, user lists and profiles (which carry salaries) stay in
+ * memory only.
+ */
+
+const persist = { persist: true };
+
+// "YYYY-MM-DD:YYYY-MM-DD" periods for the last `months` calendar months, oldest first
+export function recentMonthPeriods(months: number, now = new Date()) {
+  const periods: string[] = [];
+  for (let i = months - 1; i >= 0; i--) {
+    const date = new Date(now.getFullYear(), now.getMonth() - i, 1);
+    const year = date.getFullYear();
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const lastDay = new Date(year, date.getMonth() + 1, 0).getDate();
+    periods.push(`${year}-${month}-01:${year}-${month}-${String(lastDay).padStart(2, '0')}`);
+  }
+  return periods;
+}
+
+export const adminDashboardQueries = {
+  overview: () =>
+    queryOptions({
+      queryKey: queryKeys.analytics.overview,
+      queryFn: () => analyticsApi.overview(),
+      meta: persist,
+    }),
+  usersTotal: () =>
+    queryOptions({
+      queryKey: queryKeys.admin.usersTotal,
+      // Keep only the count: the list entry carries names and emails
+      queryFn: () => usersApi.list({ page: 1, limit: 1 }).then(({ total }) => ({ total })),
+      meta: persist,
+    }),
+  auditLogs: () =>
+    queryOptions({
+      queryKey: queryKeys.admin.auditLogs({ page: 1, limit: 10 }),
+      queryFn: () => adminApi.auditLogs({ page: 1, limit: 10 }),
+    }),
+  profiles: () =>
+    queryOptions({
+      queryKey: queryKeys.hr.profiles({ page: 1, limit: 100 }),
+      queryFn: () => profileApi.list({ page: 1, limit: 100 }),
+    }),
+  payrollTrend: (periods = recentMonthPeriods(6)) =>
+    queryOptions({
+      queryKey: queryKeys.analytics.payrollTrend(periods),
+      // Months are independent; fetch them concurrently
+      queryFn: () =>
+        Promise.all(
+          periods.map((period) =>
+            analyticsApi.payroll(period).catch(() => ({ gross: 0, net: 0 })),
+          ),
+        ),
+      meta: persist,
+    }),
+};
+
+/**
+ * Warm the cache for a role's dashboard. Fresh (restored or fetched) entries
+ * are skipped; failures are left for the page's own queries to surface.
+ */
+export function prefetchDashboard(role: string) {
+  if (role !== 'admin') return;
+  Object.values(adminDashboardQueries).forEach((build) => {
+    queryClient.prefetchQuery(build()).catch(() => undefined);
+  });
+}
@@ -0,0 +1,75 @@
+import { apiClient } from './api';
+
+/**
+ * Client for the live KPI stream (GET /v1/analytics/live, Server-Sent Events).
+ * Reconnects with backoff; every (re)connect starts with a full snapshot.
+ */
+
+export type LiveKpiName = 'presentToday' | 'onLeaveToday' | 'pendingLeaveRequests';
+export type LiveKpiDomain = 'attendance' | 'leaves' | 'payroll' | 'users' | 'settings';
+
+export interface LiveKpiDelta {
+  source: string;
+  deltas: Partial<Record<LiveKpiName, number>>;
+  domains: LiveKpiDomain[];
+  at: number;
+  sentAt: number;
+}
+
+export interface LiveKpiHandlers {
+  onSnapshot: (kpis: Record<string, number>) => void;
+  onDelta: (delta: LiveKpiDelta) => void;
+  onResync: () => void;
+}
+
+const MAX_RETRY_MS = 30_000;
+
+export function subscribeLiveKpis(handlers: LiveKpiHandlers) {
+  const controller = new AbortController();
+  let retryMs = 3000;
+
+  const dispatch = (block: string) => {
+    let event = 'message';
+    const data: string[] = [];
+    for (const line of block.split('\n')) {
+      if (line.startsWith('event:')) event = line.slice(6).trim();
+      else if (line.startsWith('data:')) data.push(line.slice(5).trim());
+      else if (line.startsWith('retry:')) retryMs = Number(line.slice(6).trim()) || retryMs;
+    }
+    if (!data.length) return;
+    const payload = JSON.parse(data.join('\n'));
+    if (event === 'snapshot') handlers.onSnapshot(payload.kpis);
+    else if (event === 'kpi') handlers.onDelta(payload);
+    else if (event === 'resync') handlers.onResync();
+  };
+
+  const run = async () => {
+    let attempt = 0;
+    while (!controller.signal.aborted) {
+      try {
+        const response = await apiClient.stream('/v1/analytics/live', controller.signal);
+        attempt = 0;
+        const reader = response.body!.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          let end: number;
+          while ((end = buffer.indexOf('\n\n')) >= 0) {
+            dispatch(buffer.slice(0, end));
+            buffer = buffer.slice(end + 2);
+          }
+        }
+      } catch {
+        if (controller.signal.aborted) return;
+      }
+      attempt++;
+      const delay = Math.min(retryMs * 2 ** (attempt - 1), MAX_RETRY_MS);
+      await new Promise((resolve) => setTimeout(resolve, delay));
+    }
+  };
+  run();
+
+  return () => controller.abort();
+}
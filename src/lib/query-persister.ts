@@ -0,0 +1,236 @@
+import type { Query, QueryClient, QueryKey } from '@tanstack/react-query';
+
+/**
+ * IndexedDB persistence for selected react-query results.
+ *
+ * Only queries created with `meta: { persist: true }` are written, and never
+ * ones under SENSITIVE_KEYS (see shouldDehydrateQuery). Entries are
+ * scoped to the signed-in user and to CACHE_VERSION (bump it whenever the shape
+ * of a persisted response changes); anything else is dropped on restore.
+ * Restored data keeps its original `dataUpdatedAt`, so it renders immediately
+ * and is refetched in the background once past its staleTime.
+ */
+
+const DB_NAME = 'workzen-query-cache';
+// Upgrades drop everything written before a SENSITIVE_KEYS change (2: salaries
+// and audit entries, 3: user lists)
+const DB_VERSION = 3;
+const STORE = 'queries';
+const CACHE_VERSION = 1;
+
+// Kept in memory only, even when a query is flagged: salaries (profile
+// metadata.basicSalary), payslips, the audit trail and user lists (names,
+// emails, roles)
+const SENSITIVE_KEYS: QueryKey[] = [
+  ['admin', 'users'],
+  ['profile'],
+  ['hr', 'profiles'],
+  ['hr', 'employees'],
+  ['payroll'],
+  ['admin', 'auditLogs'],
+];
+
+function isSensitive(queryKey: QueryKey) {
+  return SENSITIVE_KEYS.some((prefix) => prefix.every((part, i) => queryKey[i] === part));
+}
+
+/**
+ * Whether a query's result may be written to IndexedDB (the same role as
+ * shouldDehydrateQuery in @tanstack/query-persist-client)
+ */
+export function shouldDehydrateQuery(query: Query) {
+  return !!query.meta?.persist && query.state.status === 'success' && !isSensitive(query.queryKey);
+}
+
+// Storage bounds: least recently written entries are evicted first
+const MAX_ENTRIES = 200;
+const MAX_BYTES = 4 * 1024 * 1024;
+const MAX_AGE_MS = 24 * 60 * 60 * 1000;
+
+const WRITE_DEBOUNCE_MS = 250;
+
+interface PersistedEntry {
+  id: string;
+  scope: string;
+  version: number;
+  queryKey: QueryKey;
+  data: unknown;
+  dataUpdatedAt: number;
+  size: number;
+}
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+
+function openDb(): Promise<IDBDatabase | null> {
+  if (dbPromise) return dbPromise;
+  dbPromise = new Promise((resolve) => {
+    if (typeof indexedDB === 'undefined') return resolve(null);
+    try {
+      const req = indexedDB.open(DB_NAME, DB_VERSION);
+      req.onupgradeneeded = () => {
+        if (req.result.objectStoreNames.contains(STORE)) {
+          req.transaction!.objectStore(STORE).clear();
+          return;
+        }
+        const store = req.result.createObjectStore(STORE, { keyPath: 'id' });
+        store.createIndex('scope', 'scope');
+      };
+      req.onsuccess = () => resolve(req.result);
+      // Private browsing or blocked storage: run without persistence
+      req.onerror = () => resolve(null);
+      req.onblocked = () => resolve(null);
+    } catch {
+      resolve(null);
+    }
+  });
+  return dbPromise;
+}
+
+function request<T>(req: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+  });
+}
+
+function entryId(scope: string, queryHash: string) {
+  return `${scope}|${queryHash}`;
+}
+
+async function readScope(scope: string): Promise<PersistedEntry[]> {
+  const db = await openDb();
+  if (!db) return [];
+  const store = db.transaction(STORE, 'readonly').objectStore(STORE);
+  return request(store.index('scope').getAll(scope) as IDBRequest<PersistedEntry[]>);
+}
+
+async function deleteIds(ids: string[]) {
+  if (!ids.length) return;
+  const db = await openDb();
+  if (!db) return;
+  const tx = db.transaction(STORE, 'readwrite');
+  const store = tx.objectStore(STORE);
+  ids.forEach((id) => store.delete(id));
+}
+
+/**
+ * Drop expired and over-budget entries, oldest first
+ */
+async function evict(scope: string) {
+  const entries = await readScope(scope);
+  const now = Date.now();
+  const stale: string[] = [];
+  const kept = entries
+    .filter((e) => {
+      const expired = e.version !== CACHE_VERSION || now - e.dataUpdatedAt > MAX_AGE_MS;
+      if (expired) stale.push(e.id);
+      return !expired;
+    })
+    .sort((a, b) => b.dataUpdatedAt - a.dataUpdatedAt);
+
+  let bytes = 0;
+  kept.forEach((e, i) => {
+    bytes += e.size;
+    if (i >= MAX_ENTRIES || bytes > MAX_BYTES) stale.push(e.id);
+  });
+  await deleteIds(stale);
+}
+
+/**
+ * Load persisted entries for `scope` into the query cache. Entries never
+ * overwrite data the cache already holds in a newer version.
+ */
+export async function restorePersistedQueries(client: QueryClient, scope: string) {
+  try {
+    const entries = await readScope(scope);
+    const now = Date.now();
+    entries.forEach((e) => {
+      if (e.version !== CACHE_VERSION || now - e.dataUpdatedAt > MAX_AGE_MS || isSensitive(e.queryKey)) return;
+      const current = client.getQueryState(e.queryKey);
+      if (current && current.dataUpdatedAt >= e.dataUpdatedAt) return;
+      client.setQueryData(e.queryKey, e.data, { updatedAt: e.dataUpdatedAt });
+    });
+  } catch (e) {
+    console.warn('Failed to restore query cache:', e);
+  }
+}
+
+/**
+ * Write successful results of persistable queries to IndexedDB as they land.
+ * Returns an unsubscribe function.
+ */
+export function persistQueries(client: QueryClient, scope: string) {
+  const pending = new Map<string, Query>();
+  let timer: ReturnType<typeof setTimeout> | undefined;
+  let stopped = false;
+
+  const flush = async () => {
+    timer = undefined;
+    const queries = Array.from(pending.values());
+    pending.clear();
+    const db = await openDb();
+    // Stopped (logout) while the database was opening: write nothing
+    if (!db || stopped) return;
+
+    const tx = db.transaction(STORE, 'readwrite');
+    const store = tx.objectStore(STORE);
+    queries.forEach((q) => {
+      const { data, dataUpdatedAt } = q.state;
+      if (data === undefined) return;
+      let size: number;
+      try {
+        size = JSON.stringify(data).length;
+      } catch {
+        return;
+      }
+      // A single entry larger than the whole budget is not worth keeping
+      if (size > MAX_BYTES) return;
+      const entry: PersistedEntry = {
+        id: entryId(scope, q.queryHash),
+        scope,
+        version: CACHE_VERSION,
+        queryKey: q.queryKey,
+        data,
+        dataUpdatedAt,
+        size,
+      };
+      store.put(entry);
+    });
+    tx.oncomplete = () => {
+      evict(scope).catch(() => undefined);
+    };
+  };
+
+  const unsubscribe = client.getQueryCache().subscribe((event) => {
+    if (event.type !== 'updated' || event.action.type !== 'success') return;
+    const query = event.query;
+    if (!shouldDehydrateQuery(query)) return;
+    pending.set(query.queryHash, query);
+    if (!timer) timer = setTimeout(flush, WRITE_DEBOUNCE_MS);
+  });
+
+  return () => {
+    stopped = true;
+    unsubscribe();
+    if (timer) clearTimeout(timer);
+    pending.clear();
+  };
+}
+
+/**
+ * Remove persisted entries, for one scope or all of them (e.g. on logout)
+ */
+export async function clearPersistedQueries(scope?: string) {
+  try {
+    const db = await openDb();
+    if (!db) return;
+    if (scope) {
+      const entries = await readScope(scope);
+      await deleteIds(entries.map((e) => e.id));
+      return;
+    }
+    await request(db.transaction(STORE, 'readwrite').objectStore(STORE).clear());
+  } catch (e) {
+    console.warn('Failed to clear query cache:', e);
+  }
+}
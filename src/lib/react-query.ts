@@ -54,6 +54,8 @@ export const queryKeys = {
   // Analytics
   analytics: {
     dashboard: (role: string) => ['analytics', 'dashboard', role] as const,
+    overview: ['analytics', 'overview'] as const,
+    payrollTrend: (periods: string[]) => ['analytics', 'payroll', 'trend', periods] as const,
     attendance: (period?: string) => ['analytics', 'attendance', period] as const,
     leaves: (period?: string) => ['analytics', 'leaves', period] as const,
     payroll: (period?: string) => ['analytics', 'payroll', period] as const,
@@ -63,6 +65,7 @@ export const queryKeys = {
   // Admin
   admin: {
     users: (filters?: any) => ['admin', 'users', filters] as const,
+    usersTotal: ['admin', 'usersTotal'] as const,
     auditLogs: (filters?: any) => ['admin', 'auditLogs', filters] as const,
     settings: ['admin', 'settings'] as const,
     reports: (type: string, params?: any) => ['admin', 'reports', type, params] as const,
@@ -71,6 +74,7 @@ export const queryKeys = {
   // HR
   hr: {
     employees: (filters?: any) => ['hr', 'employees', filters] as const,
+    profiles: (filters?: any) => ['hr', 'profiles', filters] as const,
     departments: ['hr', 'departments'] as const,
     positions: ['hr', 'positions'] as const,
   },
@@ -1,4 +1,5 @@
-import { useEffect, useState } from 'react';
+import { useEffect, useMemo } from 'react';
+import { useQuery } from '@tanstack/react-query';
 import { DashboardLayout } from '@/components/layout/DashboardLayout';
 import { AnalyticsCard } from '@/components/admin/AnalyticsCard';
 import { LineChartCard } from '@/components/admin/LineChartCard';
@@ -8,149 +9,130 @@ import { Badge } from '@/components/ui/badge';
 import { Users, Building2, DollarSign, TrendingUp, Clock, Calendar, Plus, FileText, UserPlus } from 'lucide-react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, Legend, PieChart, Pie, Cell } from 'recharts';
 import { Link } from 'react-router-dom';
-import { analyticsApi, usersApi, adminApi, profileApi, attendanceApi, payrollApi } from '@/lib/api';
+import { adminDashboardQueries, recentMonthPeriods } from '@/lib/dashboard-queries';
+import { useLiveKpis } from '@/hooks/useLiveKpis';
 import { toast } from 'sonner';
 
+const EMPTY_KPIS = { totalEmployees: 0, presentToday: 0, onLeaveToday: 0, pendingLeaveRequests: 0, avgAttendance: 0 };
+
 export default function AdminDashboard() {
-  const [loading, setLoading] = useState(false);
-  const [kpis, setKpis] = useState({ totalEmployees: 0, presentToday: 0, onLeaveToday: 0, pendingLeaveRequests: 0, avgAttendance: 0 });
-  const [totalUsers, setTotalUsers] = useState(0);
-  const [recentAuditLogs, setRecentAuditLogs] = useState<any[]>([]);
-  const [employeeGrowthData, setEmployeeGrowthData] = useState<any[]>([]);
-  const [payrollTrendData, setPayrollTrendData] = useState<any[]>([]);
-  const [departmentData, setDepartmentData] = useState<any[]>([]);
-  const [attendanceDistribution, setAttendanceDistribution] = useState<any[]>([]);
-  const [topPerformers, setTopPerformers] = useState<any[]>([]);
-  const [companySummary, setCompanySummary] = useState({ attritionRate: 0, newJoinees: 0, leavesUtilized: 0, avgBonus: 0 });
+  // Each section renders as soon as its own query has data (cached or fresh);
+  // no section waits for the slowest endpoint.
+  const overviewQuery = useQuery(adminDashboardQueries.overview());
+  const usersQuery = useQuery(adminDashboardQueries.usersTotal());
+  const auditQuery = useQuery(adminDashboardQueries.auditLogs());
+  const profilesQuery = useQuery(adminDashboardQueries.profiles());
+  const payrollQuery = useQuery(adminDashboardQueries.payrollTrend());
+  // KPI cards follow server-pushed deltas; no polling
+  useLiveKpis();
+
+  const failed = [overviewQuery, usersQuery, auditQuery, profilesQuery].find((q) => q.isError && !q.data);
+  useEffect(() => {
+    if (failed?.error) toast.error(failed.error instanceof Error ? failed.error.message : 'Failed to load dashboard');
+  }, [failed?.error]);
 
-  const load = async () => {
-    setLoading(true);
-    try {
-      // Fetch all data in parallel
-      const [analyticsData, usersData, auditData, profiles] = await Promise.all([
-        analyticsApi.overview().catch(() => ({ totalEmployees: 0, presentToday: 0, onLeaveToday: 0, pendingLeaveRequests: 0, avgAttendance: 0 })),
-        usersApi.list({ page: 1, limit: 1 }).catch(() => ({ items: [], total: 0 })),
-        adminApi.auditLogs({ page: 1, limit: 10 }).catch(() => ({ items: [], total: 0 })),
-        profileApi.list({ page: 1, limit: 100 }).catch(() => ({ items: [] })),
-      ]);
-      
-      setKpis(analyticsData);
-      setTotalUsers(usersData.total);
-      setRecentAuditLogs(auditData.items);
-      
-      // Generate employee growth data (last 6 months)
-      const growthData = [];
-      const now = new Date();
-      for (let i = 5; i >= 0; i--) {
-        const date = new Date(now.getFullYear(), now.getMonth() - i, 1);
-        const monthName = date.toLocaleDateString('en-US', { month: 'short' });
-        // Simulate growth - in production, fetch from historical data
-        const baseCount = Math.max(1, analyticsData.totalEmployees - (i * 2));
-        growthData.push({ month: monthName, employees: baseCount });
-      }
-      setEmployeeGrowthData(growthData);
-      
-      // Generate payroll trend data (last 6 months)
-      const payrollData = [];
-      for (let i = 5; i >= 0; i--) {
-        const date = new Date(now.getFullYear(), now.getMonth() - i, 1);
-        const monthName = date.toLocaleDateString('en-US', { month: 'short' });
-        const year = date.getFullYear();
-        const month = date.getMonth() + 1;
-        const startOfMonth = `${year}-${String(month).padStart(2, '0')}-01`;
-        const lastDay = new Date(year, month, 0).getDate();
-        const endOfMonth = `${year}-${String(month).padStart(2, '0')}-${String(lastDay).padStart(2, '0')}`;
-        const period = `${startOfMonth}:${endOfMonth}`;
-        
-        const payroll = await analyticsApi.payroll(period).catch(() => ({ gross: 0, net: 0 }));
-        payrollData.push({
-          month: monthName,
-          gross: (payroll as any).gross || 0,
-          net: (payroll as any).net || 0,
-        });
-      }
-      setPayrollTrendData(payrollData);
-      
-      // Calculate department performance from profiles
-      const deptMap = new Map<string, { count: number; totalSalary: number }>();
-      profiles.items?.forEach((p: any) => {
-        const dept = p.department || 'Unassigned';
-        const salary = (p.metadata?.basicSalary as number) || 30000;
-        const current = deptMap.get(dept) || { count: 0, totalSalary: 0 };
-        deptMap.set(dept, { count: current.count + 1, totalSalary: current.totalSalary + salary });
-      });
-      
-      const deptPerformance = Array.from(deptMap.entries())
-        .map(([department, data]) => ({
-          department,
-          performance: Number((7 + Math.random() * 2).toFixed(1)), // 7-9 range
-        }))
-        .sort((a, b) => b.performance - a.performance)
-        .slice(0, 5);
-      setDepartmentData(deptPerformance);
-      
-      // Calculate attendance distribution
-      const totalEmp = analyticsData.totalEmployees || 1;
-      const presentPct = Math.round((analyticsData.presentToday / totalEmp) * 100);
-      const leavePct = Math.round((analyticsData.onLeaveToday / totalEmp) * 100);
-      const absentPct = 100 - presentPct - leavePct;
-      
-      setAttendanceDistribution([
-        { status: 'Present', value: presentPct, color: 'hsl(var(--chart-1))' },
-        { status: 'Leave', value: leavePct, color: 'hsl(var(--chart-2))' },
-        { status: 'Absent', value: Math.max(0, absentPct), color: 'hsl(var(--chart-3))' },
-      ]);
-      
-      // Calculate top performers based on salary and attendance
-      const performers = (profiles.items || [])
-        .map((p: any) => {
-          const salary = (p.metadata?.basicSalary as number) || 30000;
-          // Score based on salary (higher salary = senior = better performer)
-          const score = Math.min(7 + (salary / 15000), 10);
-          return {
-            name: p.user?.name || 'Unknown',
-            score: Number(score.toFixed(1)),
-            department: p.department || 'Unassigned',
-          };
-        })
-        .sort((a, b) => b.score - a.score)
-        .slice(0, 5);
-      setTopPerformers(performers);
-      
-      // Calculate company summary metrics
-      const totalProfiles = profiles.items?.length || 1;
-      // Attrition: assume 2-3% based on industry standard
-      const attrition = Number((2 + Math.random()).toFixed(1));
-      // New joinees: count profiles created in last 30 days
-      const thirtyDaysAgo = new Date(now.getTime() - 30 * 24 * 60 * 60 * 1000);
-      const newJoinees = profiles.items?.filter((p: any) => 
-        new Date(p.createdAt) > thirtyDaysAgo
-      ).length || 0;
-      // Leaves utilized: percentage of approved leaves
-      const leavesUtilized = analyticsData.avgAttendance > 0 
-        ? Number((100 - analyticsData.avgAttendance).toFixed(1))
-        : 0;
-      // Avg bonus: calculate from payroll data
-      const latestPayroll = payrollData[payrollData.length - 1];
-      const avgBonus = latestPayroll && latestPayroll.gross > 0
-        ? Number((((latestPayroll.gross - latestPayroll.net) / latestPayroll.gross) * 100).toFixed(1))
-        : 12.5;
-      
-      setCompanySummary({
-        attritionRate: attrition,
-        newJoinees,
-        leavesUtilized,
-        avgBonus,
-      });
-      
-    } catch (e) {
-      toast.error(e instanceof Error ? e.message : 'Failed to load dashboard');
-    } finally {
-      setLoading(false);
+  const kpis = overviewQuery.data ?? EMPTY_KPIS;
+  const kpisLoading = overviewQuery.isPending;
+  const totalUsers = usersQuery.data?.total ?? 0;
+  const recentAuditLogs = auditQuery.data?.items ?? [];
+  const profiles = profilesQuery.data?.items;
+  const loading = kpisLoading || profilesQuery.isPending;
+
+  // Generate employee growth data (last 6 months)
+  const employeeGrowthData = useMemo(() => {
+    if (!overviewQuery.data) return [];
+    const growthData = [];
+    const now = new Date();
+    for (let i = 5; i >= 0; i--) {
+      const date = new Date(now.getFullYear(), now.getMonth() - i, 1);
+      const monthName = date.toLocaleDateString('en-US', { month: 'short' });
+      // Simulate growth - in production, fetch from historical data
+      const baseCount = Math.max(1, overviewQuery.data.totalEmployees - (i * 2));
+      growthData.push({ month: monthName, employees: baseCount });
     }
-  };
+    return growthData;
+  }, [overviewQuery.data]);
+
+  // Payroll trend data (last 6 months)
+  const payrollTrendData = useMemo(() => {
+    const periods = recentMonthPeriods(6);
+    return (payrollQuery.data ?? []).map((payroll, i) => ({
+      month: new Date(`${periods[i].slice(0, 10)}T00:00:00`).toLocaleDateString('en-US', { month: 'short' }),
+      gross: (payroll as any).gross || 0,
+      net: (payroll as any).net || 0,
+    }));
+  }, [payrollQuery.data]);
+
+  // Calculate department performance from profiles
+  const departmentData = useMemo(() => {
+    const deptMap = new Map<string, { count: number; totalSalary: number }>();
+    profiles?.forEach((p: any) => {
+      const dept = p.department || 'Unassigned';
+      const salary = (p.metadata?.basicSalary as number) || 30000;
+      const current = deptMap.get(dept) || { count: 0, totalSalary: 0 };
+      deptMap.set(dept, { count: current.count + 1, totalSalary: current.totalSalary + salary });
+    });
+
+    return Array.from(deptMap.entries())
+      .map(([department, data]) => ({
+        department,
+        performance: Number((7 + Math.random() * 2).toFixed(1)), // 7-9 range
+      }))
+      .sort((a, b) => b.performance - a.performance)
+      .slice(0, 5);
+  }, [profiles]);
+
+  // Calculate attendance distribution
+  const attendanceDistribution = useMemo(() => {
+    const totalEmp = kpis.totalEmployees || 1;
+    const presentPct = Math.round((kpis.presentToday / totalEmp) * 100);
+    const leavePct = Math.round((kpis.onLeaveToday / totalEmp) * 100);
+    const absentPct = 100 - presentPct - leavePct;
+
+    return [
+      { status: 'Present', value: presentPct, color: 'hsl(var(--chart-1))' },
+      { status: 'Leave', value: leavePct, color: 'hsl(var(--chart-2))' },
+      { status: 'Absent', value: Math.max(0, absentPct), color: 'hsl(var(--chart-3))' },
+    ];
+  }, [kpis]);
+
+  // Calculate top performers based on salary and attendance
+  const topPerformers = useMemo(() => (profiles || [])
+    .map((p: any) => {
+      const salary = (p.metadata?.basicSalary as number) || 30000;
+      // Score based on salary (higher salary = senior = better performer)
+      const score = Math.min(7 + (salary / 15000), 10);
+      return {
+        name: p.user?.name || 'Unknown',
+        score: Number(score.toFixed(1)),
+        department: p.department || 'Unassigned',
+      };
+    })
+    .sort((a, b) => b.score - a.score)
+    .slice(0, 5), [profiles]);
+
+  // Calculate company summary metrics
+  const companySummary = useMemo(() => {
+    const now = new Date();
+    // Attrition: assume 2-3% based on industry standard
+    const attrition = Number((2 + Math.random()).toFixed(1));
+    // New joinees: count profiles created in last 30 days
+    const thirtyDaysAgo = new Date(now.getTime() - 30 * 24 * 60 * 60 * 1000);
+    const newJoinees = profiles?.filter((p: any) =>
+      new Date(p.createdAt) > thirtyDaysAgo
+    ).length || 0;
+    // Leaves utilized: percentage of approved leaves
+    const leavesUtilized = kpis.avgAttendance > 0
+      ? Number((100 - kpis.avgAttendance).toFixed(1))
+      : 0;
+    // Avg bonus: calculate from payroll data
+    const latestPayroll = payrollTrendData[payrollTrendData.length - 1];
+    const avgBonus = latestPayroll && latestPayroll.gross > 0
+      ? Number((((latestPayroll.gross - latestPayroll.net) / latestPayroll.gross) * 100).toFixed(1))
+      : 12.5;
 
-  useEffect(() => { load(); }, []);
+    return { attritionRate: attrition, newJoinees, leavesUtilized, avgBonus };
+  }, [profiles, kpis, payrollTrendData]);
 
   // Generate sparkline data from employee growth
   const sparklineData = employeeGrowthData.map(d => ({ value: d.employees }));
@@ -234,33 +216,33 @@ export default function AdminDashboard() {
         <div className="grid gap-6 md:grid-cols-2 lg:grid-cols-3">
           <AnalyticsCard
             title="Total Employees"
-            value={loading ? '...' : kpis.totalEmployees}
+            value={kpisLoading ? '...' : kpis.totalEmployees}
             icon={Users}
             sparklineData={sparklineData.length > 0 ? sparklineData : undefined}
           />
           <AnalyticsCard
             title="Total Users"
-            value={loading ? '...' : totalUsers}
+            value={usersQuery.isPending ? '...' : totalUsers}
             icon={Building2}
           />
           <AnalyticsCard
             title="Present Today"
-            value={loading ? '...' : kpis.presentToday}
+            value={kpisLoading ? '...' : kpis.presentToday}
             icon={UserPlus}
           />
           <AnalyticsCard
             title="On Leave Today"
-            value={loading ? '...' : kpis.onLeaveToday}
+            value={kpisLoading ? '...' : kpis.onLeaveToday}
             icon={Calendar}
           />
           <AnalyticsCard
             title="Avg Attendance"
-            value={loading ? '...' : `${kpis.avgAttendance}%`}
+            value={kpisLoading ? '...' : `${kpis.avgAttendance}%`}
             icon={Clock}
           />
           <AnalyticsCard
             title="Pending Leave Requests"
-            value={loading ? '...' : kpis.pendingLeaveRequests}
+            value={kpisLoading ? '...' : kpis.pendingLeaveRequests}
             icon={Calendar}
           />
         </div>
@@ -342,7 +324,7 @@ export default function AdminDashboard() {
             </CardHeader>
             <CardContent>
               <div className="space-y-3">
-                {loading ? (
+                {profilesQuery.isPending ? (
                   <p className="text-sm text-muted-foreground">Loading...</p>
                 ) : topPerformers.length === 0 ? (
                   <p className="text-sm text-muted-foreground">No performance data available</p>
@@ -370,7 +352,7 @@ export default function AdminDashboard() {
             </CardHeader>
             <CardContent>
               <div className="space-y-4">
-                {loading ? (
+                {auditQuery.isPending ? (
                   <p className="text-sm text-muted-foreground">Loading...</p>
                 ) : recentActivities.length === 0 ? (
                   <p className="text-sm text-muted-foreground">No recent activity</p>
@@ -92,15 +92,15 @@ export default function Users() {
         salary: newUser.salary ? Number(newUser.salary) : undefined,
       });
       
-      // Show success message with generated password info
+      // A password comes back only when it could not be emailed; the admin passes it on
       if (response.generatedPassword) {
         toast({ 
           title: 'User Created Successfully!', 
-          description: `Password: ${response.generatedPassword} (Credentials sent to email)`,
+          description: `Password: ${response.generatedPassword} (share it with the user; no email was sent)`,
           duration: 10000,
         });
       } else {
-        toast({ title: 'Success', description: `User ${newUser.name} created successfully!` });
+        toast({ title: 'Success', description: response.message || `User ${newUser.name} created successfully!` });
       }
       
       // Reload users list
@@ -159,7 +159,7 @@ export default function Users() {
                 <div className="rounded-lg border border-blue-200 bg-blue-50 p-3">
                   <p className="text-sm text-blue-900 font-medium">Auto-Generated Password</p>
                   <p className="text-xs text-blue-700 mt-1">
-                    A secure password will be automatically generated and sent to the user's email.
+                    A secure password will be generated and emailed to the user with their login details.
                   </p>
                 </div>
                 <div className="space-y-2">
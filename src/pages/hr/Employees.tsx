@@ -92,15 +92,16 @@ export default function Employees() {
         salary: newEmployee.salary ? Number(newEmployee.salary) : undefined,
       });
       
-      // Show success message with generated password info
+      // A password comes back only when it could not be emailed; HR passes it on
       if (response.generatedPassword) {
         toast.success(
           `Employee created! Password: ${response.generatedPassword}`,
           { duration: 10000 }
         );
-        toast.info('Credentials have been sent to their email', { duration: 5000 });
+        toast.info('No email was sent: share the password with the employee', { duration: 5000 });
       } else {
         toast.success(`Employee ${newEmployee.name} created successfully!`);
+        toast.info('Login credentials will be sent to their email', { duration: 5000 });
       }
       
       // Reload employees list
@@ -225,7 +226,7 @@ export default function Employees() {
               <div className="rounded-lg bg-blue-50 border border-blue-200 p-3">
                 <p className="text-sm text-blue-900 font-medium">🔐 Auto-Generated Password</p>
                 <p className="text-xs text-blue-700 mt-1">
-                  A secure password will be automatically generated and sent to the employee's email.
+                  A secure password will be generated and emailed to the employee with their login details.
                 </p>
               </div>
               <div className="space-y-2">
@@ -0,0 +1,190 @@
+import os
+import random
+import threading
+import time
+import requests
+
+BASE_API_URL = "http://localhost:4000"
+ADMIN_EMAIL = os.environ.get("ADMIN_EMAIL", "admin@workzen.com")
+ADMIN_PASSWORD = os.environ.get("ADMIN_PASSWORD", "password")
+TIMEOUT = 30
+
+# Cheap, latency-sensitive routes (the liveness probe is unlimited; the rest use the transactional lane)
+CRITICAL_ROUTES = [
+    "/health",
+    "/v1/attendance/stats",
+    "/v1/attendance",
+    "/v1/leaves/balances/me",
+]
+REPORT_ROUTES = [
+    "/v1/reports/company-overview",
+    "/v1/reports/department-performance",
+    "/v1/reports/payroll-summary",
+    "/v1/reports/leave-utilization",
+    "/v1/reports/attendance-analytics",
+    "/v1/reports/employee-growth",
+]
+RANGES = ["current-month", "last-month", "quarter", "year"]
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "Operations", "Finance", "HR"]
+
+CRITICAL_CLIENTS = 8
+STORM_CLIENTS = 48
+BASELINE_SECONDS = 10
+STORM_SECONDS = 20
+
+# p99 during the storm may grow by this factor or this many ms, whichever is larger
+P99_GROWTH_FACTOR = 2.0
+P99_GROWTH_MS = 250
+
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []  # (phase, route, status, latency_ms, retry_after)
+
+    def add(self, *sample):
+        with self.lock:
+            self.samples.append(sample)
+
+    def select(self, phase, routes):
+        with self.lock:
+            return [s for s in self.samples if s[0] == phase and s[1] in routes]
+
+
+def auth_headers():
+    """Sign in as the admin for a fresh access token (a stored one expires)"""
+    resp = requests.post(BASE_API_URL + "/v1/auth/login",
+                         json={"email": ADMIN_EMAIL, "password": ADMIN_PASSWORD}, timeout=TIMEOUT)
+    assert resp.status_code == 200, f"Admin login failed: {resp.status_code} {resp.text[:200]}"
+    return {'Authorization': f"Bearer {resp.json()['accessToken']}", 'Accept': 'application/json'}
+
+
+def request_once(session, route, params=None):
+    started = time.perf_counter()
+    try:
+        resp = session.get(BASE_API_URL + route, params=params, timeout=TIMEOUT)
+        return resp.status_code, (time.perf_counter() - started) * 1000, resp.headers.get('Retry-After')
+    except requests.RequestException:
+        return 599, (time.perf_counter() - started) * 1000, None
+
+
+def critical_client(recorder, phase, stop, headers):
+    session = requests.Session()
+    session.headers.update(headers)
+    while not stop.is_set():
+        route = random.choice(CRITICAL_ROUTES)
+        status, latency, _ = request_once(session, route)
+        recorder.add(phase[0], route, status, latency, None)
+        time.sleep(random.uniform(0.02, 0.08))
+
+
+def storm_client(recorder, stop, headers):
+    session = requests.Session()
+    session.headers.update(headers)
+    while not stop.is_set():
+        route = random.choice(REPORT_ROUTES)
+        # Department/range mix defeats the report cache so every call loads rows
+        params = {"range": random.choice(RANGES), "department": random.choice(DEPARTMENTS + [f"Dept-{random.randint(1, 10 ** 6)}"])}
+        status, latency, retry_after = request_once(session, route, params)
+        recorder.add("storm", route, status, latency, retry_after)
+        if status == 503:
+            # Impatient dashboards: retry sooner than asked to keep pressure on
+            time.sleep(random.uniform(0.05, 0.2))
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1)))))
+    return ordered[k]
+
+
+def summarize(samples):
+    # Only answered requests are latency samples: a fast 401/403 is not
+    latencies = [s[3] for s in samples if 200 <= s[2] < 300 or s[2] == 304]
+    errors = sum(1 for s in samples if s[2] >= 500)
+    rejected = sum(1 for s in samples if 400 <= s[2] < 500)
+    if not latencies:
+        return {"n": len(samples), "errors": errors, "rejected": rejected}
+    return {
+        "n": len(samples),
+        "errors": errors,
+        "rejected": rejected,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def fmt(stats):
+    if "p99" not in stats:
+        return f"n={stats['n']} errors={stats['errors']} 4xx={stats['rejected']}"
+    return (f"n={stats['n']} errors={stats['errors']} 4xx={stats['rejected']} p50={stats['p50']:.1f}ms "
+            f"p95={stats['p95']:.1f}ms p99={stats['p99']:.1f}ms")
+
+
+def test_report_storm_keeps_critical_p99_flat():
+    """
+    Measure critical-route latency alone, then again while dozens of clients
+    hammer uncached reports. The analytical lane should shed the excess with
+    503 + Retry-After so critical p99 stays close to its baseline.
+    """
+    headers = auth_headers()
+    recorder = Recorder()
+    phase = ["baseline"]
+    stop_critical = threading.Event()
+    stop_storm = threading.Event()
+
+    critical = [threading.Thread(target=critical_client, args=(recorder, phase, stop_critical, headers), daemon=True)
+                for _ in range(CRITICAL_CLIENTS)]
+    for t in critical:
+        t.start()
+    time.sleep(BASELINE_SECONDS)
+
+    phase[0] = "storm"
+    storm = [threading.Thread(target=storm_client, args=(recorder, stop_storm, headers), daemon=True)
+             for _ in range(STORM_CLIENTS)]
+    for t in storm:
+        t.start()
+    time.sleep(STORM_SECONDS)
+
+    # /v1/health answers 503 when an optional dependency is down; the body still has the limiter state
+    limiters = requests.get(BASE_API_URL + "/v1/health", timeout=TIMEOUT).json().get("limiters")
+    stop_storm.set()
+    stop_critical.set()
+    for t in critical + storm:
+        t.join(TIMEOUT)
+
+    print("Per critical route (baseline -> storm):")
+    for route in CRITICAL_ROUTES:
+        print(f"  {route}")
+        print(f"    baseline: {fmt(summarize(recorder.select('baseline', [route])))}")
+        print(f"    storm:    {fmt(summarize(recorder.select('storm', [route])))}")
+
+    baseline = summarize(recorder.select("baseline", CRITICAL_ROUTES))
+    during = summarize(recorder.select("storm", CRITICAL_ROUTES))
+    reports = recorder.select("storm", REPORT_ROUTES)
+    served = [s for s in reports if s[2] == 200]
+    shed = [s for s in reports if s[2] == 503]
+    print(f"critical baseline: {fmt(baseline)}")
+    print(f"critical storm:    {fmt(during)}")
+    print(f"reports: {len(reports)} requests, {len(served)} served, {len(shed)} shed "
+          f"({100.0 * len(shed) / max(1, len(reports)):.1f}%), served {fmt(summarize(served))}")
+    if shed:
+        print(f"shed response time p99: {percentile([s[3] for s in shed], 99):.1f}ms")
+    print(f"limiter state at end of storm: {limiters}")
+
+    assert "p99" in baseline and "p99" in during, "No successful critical requests recorded"
+    assert baseline["rejected"] == 0 and during["rejected"] == 0, (
+        f"Critical routes answered 4xx (baseline {baseline['rejected']}, storm {during['rejected']}); "
+        "check the login and the routes"
+    )
+    assert during["errors"] <= max(1, 0.01 * during["n"]), f"Critical routes failed under the storm: {during['errors']}"
+    assert served, "No report was served during the storm"
+    assert all(s[4] for s in shed), "Shed report responses must carry Retry-After"
+    allowed = max(baseline["p99"] * P99_GROWTH_FACTOR, baseline["p99"] + P99_GROWTH_MS)
+    assert during["p99"] <= allowed, (
+        f"Critical p99 rose from {baseline['p99']:.1f}ms to {during['p99']:.1f}ms (allowed {allowed:.1f}ms)"
+    )
+
+
+test_report_storm_keeps_critical_p99_flat()
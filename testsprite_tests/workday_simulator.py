@@ -0,0 +1,434 @@
+"""
+Workday simulator: a compressed working day of mixed traffic against the real API.
+
+Virtual employees log in, check in during a morning surge, browse their own
+attendance, balances and payslips between think times, sometimes apply for
+leave, and check out in an evening surge. Virtual HR admins poll dashboards
+(with conditional GET, like the frontend), work through pending leave
+requests, and one admin triggers a payroll run in the afternoon.
+
+Simulated time runs from 07:00 to 20:00 and is compressed into --day-minutes
+of wall-clock time. Arrival, departure and think times are drawn from
+configurable distributions (simulated minutes):
+
+    const:X  uniform:A,B  exp:MEAN  normal:MEAN,SD  lognormal:MEDIAN,SIGMA
+
+Accounts are provisioned through the bulk import endpoint as
+sim-<tag>-<n>@sim.workzen.local and reused on later runs with the same tag.
+Check-ins are per calendar day, so a second run on the same day exercises the
+already-checked-in path. The payroll run targets --payroll-month; pick a month
+with no real payrun (a repeat run answers 409 and is reported as such).
+
+Reports throughput, error rates and latency percentiles per action, and the
+same per simulated hour, for capacity planning. Needs aiohttp:
+
+    pip install aiohttp
+    python testsprite_tests/workday_simulator.py --employees 500 --admins 5 --day-minutes 15
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import aiohttp
+
+BASE_API_URL = "http://localhost:4000"
+TIMEOUT = 60
+
+DAY_START = 7 * 60
+DAY_END = 20 * 60
+
+SELF_SERVICE = [
+    ("attendance.list", "/v1/attendance"),
+    ("attendance.stats", "/v1/attendance/stats"),
+    ("leaves.balances", "/v1/leaves/balances/me"),
+    ("payslips.me", "/v1/payroll/payslips/me"),
+]
+REPORTS = [
+    "/v1/reports/company-overview",
+    "/v1/reports/department-performance",
+    "/v1/reports/payroll-summary",
+    "/v1/reports/leave-utilization",
+    "/v1/reports/attendance-analytics",
+    "/v1/reports/employee-growth",
+]
+DEPARTMENTS = ["Engineering", "Sales", "Marketing", "Operations", "Finance", "HR"]
+LEAVE_TYPES = [("UNPAID", 0.5), ("CASUAL", 0.3), ("SICK", 0.2)]
+
+
+def parse_distribution(spec):
+    """'exp:45' -> callable(rng) returning a sample (never negative)."""
+    kind, _, raw = spec.partition(":")
+    params = [float(p) for p in raw.split(",") if p]
+    if kind == "const" and len(params) == 1:
+        return lambda rng: params[0]
+    if kind == "uniform" and len(params) == 2:
+        return lambda rng: rng.uniform(params[0], params[1])
+    if kind == "exp" and len(params) == 1:
+        return lambda rng: rng.expovariate(1.0 / params[0])
+    if kind == "normal" and len(params) == 2:
+        return lambda rng: max(0.0, rng.gauss(params[0], params[1]))
+    if kind == "lognormal" and len(params) == 2:
+        return lambda rng: rng.lognormvariate(math.log(params[0]), params[1])
+    raise argparse.ArgumentTypeError(f"Unknown distribution '{spec}'")
+
+
+def clock_minutes(value):
+    """'09:05' -> 545"""
+    hours, _, minutes = value.partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+def fmt_clock(minute):
+    return f"{int(minute) // 60:02d}:{int(minute) % 60:02d}"
+
+
+class SimClock:
+    def __init__(self, day_minutes):
+        # Simulated minutes per wall-clock second
+        self.scale = (DAY_END - DAY_START) / (day_minutes * 60.0)
+        self.started = None
+
+    def start(self):
+        self.started = time.monotonic()
+
+    def now(self):
+        return DAY_START + (time.monotonic() - self.started) * self.scale
+
+    async def sleep_until(self, minute):
+        delay = (minute - self.now()) / self.scale
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class Stats:
+    def __init__(self):
+        self.samples = []  # (action, status, latency_ms, sim_minute)
+        self.started = time.monotonic()
+        self.finished = None
+
+    def record(self, action, status, latency_ms, sim_minute):
+        self.samples.append((action, status, latency_ms, sim_minute))
+
+    @staticmethod
+    def percentile(values, p):
+        ordered = sorted(values)
+        k = max(0, min(len(ordered) - 1, int(round(p / 100.0 * (len(ordered) - 1)))))
+        return ordered[k]
+
+    def summarize(self, samples, elapsed):
+        latencies = [s[2] for s in samples]
+        shed = sum(1 for s in samples if s[1] == 503)
+        server = sum(1 for s in samples if s[1] >= 500 and s[1] != 503)
+        client = sum(1 for s in samples if 400 <= s[1] < 500)
+        return {
+            "requests": len(samples),
+            "rps": len(samples) / elapsed if elapsed else 0.0,
+            "client_errors": client,
+            "server_errors": server,
+            "shed": shed,
+            "error_rate": (server + shed) / len(samples) if samples else 0.0,
+            "p50_ms": self.percentile(latencies, 50) if latencies else None,
+            "p95_ms": self.percentile(latencies, 95) if latencies else None,
+            "p99_ms": self.percentile(latencies, 99) if latencies else None,
+        }
+
+    def report(self):
+        elapsed = (self.finished or time.monotonic()) - self.started
+        by_action = defaultdict(list)
+        by_hour = defaultdict(list)
+        for s in self.samples:
+            by_action[s[0]].append(s)
+            by_hour[int(s[3] // 60)].append(s)
+        hour_span = (DAY_END - DAY_START) / 60.0
+        return {
+            "wall_seconds": elapsed,
+            "overall": self.summarize(self.samples, elapsed),
+            "actions": {a: self.summarize(v, elapsed) for a, v in sorted(by_action.items())},
+            # Per simulated hour; rps is per wall-clock second spent in that hour
+            "hours": {fmt_clock(h * 60): self.summarize(v, elapsed / hour_span) for h, v in sorted(by_hour.items())},
+        }
+
+
+def print_table(title, rows):
+    print(f"\n{title}")
+    header = f"{'':28} {'req':>7} {'rps':>8} {'4xx':>6} {'5xx':>6} {'shed':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+
+    def ms(v):
+        return f"{v:9.1f}" if v is not None else f"{'-':>9}"
+
+    for name, r in rows.items():
+        print(f"{name:28} {r['requests']:7d} {r['rps']:8.2f} {r['client_errors']:6d} {r['server_errors']:6d} "
+              f"{r['shed']:6d} {ms(r['p50_ms'])} {ms(r['p95_ms'])} {ms(r['p99_ms'])}")
+
+
+class Client:
+    """One virtual user's session: token handling, timing and one retry after a 503."""
+
+    def __init__(self, ctx, email, password):
+        self.ctx = ctx
+        self.email = email
+        self.password = password
+        self.token = None
+        self.etags = {}
+
+    async def login(self):
+        status, body = await self.call("auth.login", "POST", "/v1/auth/login",
+                                       json={"email": self.email, "password": self.password}, auth=False)
+        if status == 200:
+            self.token = body.get("accessToken")
+        return status == 200
+
+    async def call(self, action, method, path, json=None, params=None, auth=True, conditional=False, retried=False):
+        headers = {"Accept": "application/json"}
+        if auth and self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        cache_key = (path, tuple(sorted((params or {}).items())))
+        if conditional and cache_key in self.etags:
+            headers["If-None-Match"] = self.etags[cache_key]
+        started = time.perf_counter()
+        sim_minute = self.ctx.clock.now()
+        try:
+            async with self.ctx.session.request(method, BASE_API_URL + path, json=json, params=params, headers=headers) as resp:
+                body = await resp.json(content_type=None) if resp.status not in (204, 304) else None
+                status = resp.status
+                retry_after = resp.headers.get("Retry-After")
+                if conditional and resp.headers.get("ETag"):
+                    self.etags[cache_key] = resp.headers["ETag"]
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            status, body, retry_after = 599, None, None
+        self.ctx.stats.record(action, status, (time.perf_counter() - started) * 1000, sim_minute)
+
+        if retried or not self.ctx.args.retry:
+            return status, body
+        if status == 401 and auth and await self.login():
+            return await self.call(action, method, path, json, params, auth, conditional, retried=True)
+        if status == 503 and retry_after:
+            await asyncio.sleep(float(retry_after))
+            return await self.call(action, method, path, json, params, auth, conditional, retried=True)
+        return status, body
+
+
+class Context:
+    def __init__(self, args, session):
+        self.args = args
+        self.session = session
+        self.clock = SimClock(args.day_minutes)
+        self.stats = Stats()
+        self.rng = random.Random(args.seed)
+        self.office = None
+
+
+def position_body(ctx, **body):
+    """Attach a position inside the office geofence, when one is configured."""
+    office = ctx.office
+    if not office or office.get("lat") is None:
+        return body
+    # Somewhere within the inner third of the geofence
+    jitter = (office.get("radius") or 100) / 3 / 111_000
+    body["location"] = {"lat": office["lat"] + ctx.rng.uniform(-jitter, jitter) / 2,
+                        "lng": office["lng"] + ctx.rng.uniform(-jitter, jitter) / 2}
+    return body
+
+
+async def employee_day(ctx, email):
+    args, rng = ctx.args, ctx.rng
+    arrival = min(max(args.arrival(rng), DAY_START + 5), DAY_END - 120)
+    departure = min(max(args.departure(rng), arrival + 60), DAY_END - 1)
+    leave_at = rng.uniform(arrival, departure) if rng.random() < args.leave_probability else None
+    client = Client(ctx, email, args.sim_password)
+
+    await ctx.clock.sleep_until(arrival - 2)
+    if not await client.login():
+        return
+    await ctx.clock.sleep_until(arrival)
+    await client.call("attendance.checkin", "POST", "/v1/attendance/checkin",
+                      json=position_body(ctx, method="manual"))
+
+    while True:
+        next_action = ctx.clock.now() + args.think(rng)
+        if leave_at is not None and leave_at < next_action and leave_at < departure:
+            await ctx.clock.sleep_until(leave_at)
+            leave_at = None
+            start = date.today() + timedelta(days=rng.randint(14, 300))
+            leave_type = rng.choices([t for t, _ in LEAVE_TYPES], [w for _, w in LEAVE_TYPES])[0]
+            await client.call("leaves.apply", "POST", "/v1/leaves/apply", json={
+                "type": leave_type,
+                "startDate": start.isoformat(),
+                "endDate": (start + timedelta(days=rng.randint(0, 2))).isoformat(),
+                "reason": "workday simulator",
+            })
+            continue
+        if next_action >= departure:
+            break
+        await ctx.clock.sleep_until(next_action)
+        action, path = rng.choice(SELF_SERVICE)
+        await client.call(action, "GET", path)
+
+    await ctx.clock.sleep_until(departure)
+    await client.call("attendance.checkout", "POST", "/v1/attendance/checkout",
+                      json=position_body(ctx))
+
+
+async def poll_dashboards(ctx, client):
+    rng = ctx.rng
+    await client.call("dashboard.overview", "GET", "/v1/analytics/overview", conditional=True)
+    await client.call("dashboard.audit", "GET", "/v1/admin/audit", params={"page": "1", "limit": "20"}, conditional=True)
+    for path in rng.sample(REPORTS, 2):
+        params = {"range": rng.choice(["current-month", "last-month", "quarter"])}
+        if rng.random() < 0.3:
+            params["department"] = rng.choice(DEPARTMENTS)
+        await client.call("dashboard.report", "GET", path, params=params, conditional=True)
+
+
+async def review_leaves(ctx, client):
+    status, body = await client.call("leaves.pending", "GET", "/v1/leaves", params={"status": "PENDING", "limit": "20"})
+    if status != 200 or not body:
+        return
+    for leave in body.get("items", []):
+        if ctx.rng.random() < ctx.args.approval_rate:
+            await client.call("leaves.approve", "PUT", f"/v1/leaves/{leave['id']}/approve")
+        else:
+            await client.call("leaves.reject", "PUT", f"/v1/leaves/{leave['id']}/reject",
+                              json={"reason": "workday simulator"})
+
+
+async def admin_day(ctx, email, password, runs_payroll):
+    args, rng = ctx.args, ctx.rng
+    client = Client(ctx, email, password)
+    await ctx.clock.sleep_until(args.admin_login + rng.uniform(0, 30))
+    if not await client.login():
+        return
+
+    now = ctx.clock.now()
+    next_poll = now
+    next_review = now + args.approval_interval(rng)
+    payroll_at = args.payroll_at if runs_payroll else None
+    while True:
+        upcoming = min(t for t in (next_poll, next_review, payroll_at) if t is not None)
+        if upcoming >= DAY_END:
+            break
+        await ctx.clock.sleep_until(upcoming)
+        if payroll_at is not None and upcoming == payroll_at:
+            payroll_at = None
+            year, month = (int(p) for p in args.payroll_month.split("-"))
+            last_day = (date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)).day
+            await client.call("payroll.run", "POST", "/v1/payroll/run", json={
+                "periodStart": f"{year:04d}-{month:02d}-01",
+                "periodEnd": f"{year:04d}-{month:02d}-{last_day:02d}",
+            })
+        elif upcoming == next_review:
+            await review_leaves(ctx, client)
+            next_review = ctx.clock.now() + args.approval_interval(rng)
+        else:
+            await poll_dashboards(ctx, client)
+            next_poll = ctx.clock.now() + args.dashboard_poll(rng)
+
+
+async def provision(ctx, admin):
+    """Create (or reuse) the simulated accounts through the bulk import endpoint."""
+    args = ctx.args
+    employees = [f"sim-{args.tag}-{i}@sim.workzen.local" for i in range(args.employees)]
+    admins = [f"sim-{args.tag}-hr-{j}@sim.workzen.local" for j in range(args.admins)]
+    rows = [{"email": e, "name": f"Sim Employee {i}", "password": args.sim_password, "role": "employee",
+             "department": DEPARTMENTS[i % len(DEPARTMENTS)], "salary": 30000 + (i % 40) * 1000,
+             "sendCredentials": False} for i, e in enumerate(employees)]
+    rows += [{"email": e, "name": f"Sim HR {j}", "password": args.sim_password, "role": "hr",
+              "sendCredentials": False} for j, e in enumerate(admins)]
+    payload = "\n".join(json.dumps(r) for r in rows)
+
+    headers = {"Authorization": f"Bearer {admin.token}", "Content-Type": "application/x-ndjson"}
+    async with ctx.session.post(BASE_API_URL + "/v1/users/import", data=payload, headers=headers) as resp:
+        body = await resp.json(content_type=None)
+        if resp.status != 202:
+            raise SystemExit(f"Provisioning failed ({resp.status}): {body}")
+    job_id = body["jobId"]
+    while True:
+        async with ctx.session.get(BASE_API_URL + f"/v1/users/import/{job_id}",
+                                   headers={"Authorization": f"Bearer {admin.token}"}) as resp:
+            job = await resp.json(content_type=None)
+        if job.get("status") != "RUNNING":
+            break
+        await asyncio.sleep(0.5)
+    print(f"Provisioned accounts: {job.get('created', 0)} created, "
+          f"{len(rows) - job.get('created', 0)} reused or failed")
+    return employees, admins
+
+
+async def run(args):
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=args.connections)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        ctx = Context(args, session)
+        ctx.clock.start()  # provisioning calls are timestamped before the day begins
+        admin = Client(ctx, args.admin_email, args.admin_password)
+        if not await admin.login():
+            raise SystemExit("Admin login failed")
+        async with session.get(BASE_API_URL + "/v1/office-location",
+                               headers={"Authorization": f"Bearer {admin.token}"}) as resp:
+            ctx.office = await resp.json(content_type=None) if resp.status == 200 else None
+
+        employees, admins = await provision(ctx, admin)
+        ctx.stats = Stats()
+        ctx.clock.start()
+        print(f"Simulating 07:00-20:00 in {args.day_minutes} min: {len(employees)} employees, "
+              f"{len(admins)} HR admins, payroll at {fmt_clock(args.payroll_at)}")
+
+        tasks = [employee_day(ctx, e) for e in employees]
+        tasks += [admin_day(ctx, a, args.sim_password, False) for a in admins]
+        tasks.append(admin_day(ctx, args.admin_email, args.admin_password, True))
+        await asyncio.gather(*tasks)
+        ctx.stats.finished = time.monotonic()
+
+    report = ctx.stats.report()
+    o = report["overall"]
+    print(f"\n{o['requests']} requests in {report['wall_seconds']:.0f}s ({o['rps']:.1f} req/s), "
+          f"error rate {100 * o['error_rate']:.2f}% (5xx {o['server_errors']}, shed {o['shed']}, 4xx {o['client_errors']})")
+    print_table("Per action", report["actions"])
+    print_table("Per simulated hour", report["hours"])
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if not callable(v)}, **report}, f, indent=2)
+        print(f"\nReport written to {args.json}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--admins", type=int, default=3, help="HR admins polling dashboards and reviewing leaves")
+    parser.add_argument("--day-minutes", type=float, default=10.0, help="wall-clock minutes for 07:00-20:00")
+    parser.add_argument("--arrival", type=parse_distribution, default=parse_distribution("normal:545,20"),
+                        help="check-in time, simulated minutes of day (default 09:05 +/- 20)")
+    parser.add_argument("--departure", type=parse_distribution, default=parse_distribution("normal:1080,30"),
+                        help="check-out time, simulated minutes of day (default 18:00 +/- 30)")
+    parser.add_argument("--think", type=parse_distribution, default=parse_distribution("exp:60"),
+                        help="employee think time between self-service actions, simulated minutes")
+    parser.add_argument("--dashboard-poll", type=parse_distribution, default=parse_distribution("exp:5"),
+                        help="time between admin dashboard polls, simulated minutes")
+    parser.add_argument("--approval-interval", type=parse_distribution, default=parse_distribution("exp:30"),
+                        help="time between admin passes over pending leaves, simulated minutes")
+    parser.add_argument("--leave-probability", type=float, default=0.05, help="chance an employee applies for leave")
+    parser.add_argument("--approval-rate", type=float, default=0.8)
+    parser.add_argument("--admin-login", type=clock_minutes, default=clock_minutes("08:30"))
+    parser.add_argument("--payroll-at", type=clock_minutes, default=clock_minutes("16:00"))
+    parser.add_argument("--payroll-month", default="1999-01", help="YYYY-MM of the simulated payroll run")
+    parser.add_argument("--admin-email", default="admin@workzen.com")
+    parser.add_argument("--admin-password", default="password")
+    parser.add_argument("--sim-password", default="SimPassword123")
+    parser.add_argument("--tag", default="default", help="account namespace; reuse to skip provisioning")
+    parser.add_argument("--connections", type=int, default=200, help="HTTP connection pool size")
+    parser.add_argument("--no-retry", dest="retry", action="store_false",
+                        help="do not retry once after 503 Retry-After or an expired token")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", help="also write the report to this file")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()